@@ -0,0 +1,120 @@
+# Benchmarks NEO6M.py against the NEO-6M emulator(see neo6m_emulator.py) on a host
+#
+#   python3 code/host/benchmark_neo6m.py
+#   python3 code/host/benchmark_neo6m.py --baudrate 9600 --noise 0.05 --drop 0.001 --bad-checksum 0.01
+#
+# Throughput: periodic NAV messages of 'SOLUTIONS_PER_STEP' navigation solutions are generated by the emulator,
+# then dispatched with '.process_messages'. Only the time spent in the driver is measured.
+# Latency: polls are timed in real time, including the transfer time of the poll and response at the baudrate.
+
+import os
+import sys
+import time
+import argparse
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOST_DIR)
+sys.path.insert(1, os.path.join(HOST_DIR, "..", "lib"))
+
+import machine  # Host stand-in, see machine.py
+import ubx
+import NEO6M
+import logger
+import device_config
+import neo6m_emulator
+
+UART_ID = 0
+SOLUTIONS_PER_STEP = 10
+
+STREAMED_MESSAGES = [
+    ubx.UBXMessageTypes.NAV_POSLLH,
+    ubx.UBXMessageTypes.NAV_STATUS,
+    ubx.UBXMessageTypes.NAV_TIMEUTC,
+    ubx.UBXMessageTypes.NAV_SOL,
+]
+
+
+def create_gps_module(emulator: neo6m_emulator.NEO6MEmulator, baudrate: int) -> NEO6M.NEO6M:
+    machine.attach_uart(UART_ID, emulator)
+    config = device_config.DeviceModuleUART("GPS", "NEO6M", UART_ID, 0, 1, -1, baudrate)
+    return NEO6M.NEO6M(config, logger.Logger(logger.Logger.LOG_ERROR))
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def benchmark_throughput(arguments: argparse.Namespace) -> None:
+    emulator = neo6m_emulator.NEO6MEmulator(time_scale=None, seed=arguments.seed)
+    gps_module = create_gps_module(emulator, arguments.baudrate)
+    gps_module.start_streaming(STREAMED_MESSAGES, background_period_ms=None)
+
+    # Faults are only injected into the benchmarked stream, startup and config have to succeed
+    emulator.noise_probability = arguments.noise
+    emulator.drop_probability = arguments.drop
+    emulator.bad_checksum_probability = arguments.bad_checksum
+    sent_frames = emulator.sent_frames
+    sent_bytes = emulator.sent_bytes
+    number_of_messages = 0
+    number_of_fixes = 0
+    time_taken_s = 0.0
+    while time_taken_s < arguments.duration:
+        emulator.step(SOLUTIONS_PER_STEP)
+        start_time = time.perf_counter()
+        number_of_messages += gps_module.process_messages()
+        if gps_module.get_latest_fix() is not None:
+            number_of_fixes += 1
+        time_taken_s += time.perf_counter() - start_time
+    sent_frames = emulator.sent_frames - sent_frames
+    sent_bytes = emulator.sent_bytes - sent_bytes
+
+    parser = gps_module._parser
+    print(f"Throughput, {', '.join(message_type.hex() for message_type in STREAMED_MESSAGES)}:")
+    print(f"  Sent frames: {sent_frames}, Dispatched messages: {number_of_messages}, Lost frames: {sent_frames - number_of_messages}")
+    print(f"  {number_of_messages / time_taken_s:.0f} frames/s, {sent_bytes / time_taken_s / 1_000:.1f} kB/s, Steps with a fix record: {number_of_fixes}")
+    print(f"  Injected noise bytes: {emulator.noise_bytes}, dropped bytes: {emulator.dropped_bytes}, bad checksums: {emulator.corrupted_frames}")
+    print(f"  Parser skipped bytes: {parser.skipped_bytes}, checksum errors: {parser.checksum_errors}, oversized frames: {parser.oversized_frames}")
+
+
+def benchmark_latency(arguments: argparse.Namespace) -> None:
+    emulator = neo6m_emulator.NEO6MEmulator(time_scale=1.0)
+    gps_module = create_gps_module(emulator, arguments.baudrate)
+
+    polls = (
+        ("NAV-POSLLH", gps_module.poll_nav_posllh),
+        ("NAV-STATUS", gps_module.poll_nav_status),
+        ("Fix(NAV-SOL + NAV-POSLLH)", gps_module.poll_fix),
+        ("CFG-PRT", gps_module.poll_config_uart),
+    )
+    print(f"Poll latency at {arguments.baudrate} baud, {arguments.polls} polls each:")
+    for name, poll in polls:
+        latencies_ms = []
+        for _ in range(arguments.polls):
+            start_time = time.perf_counter()
+            poll()
+            latencies_ms.append((time.perf_counter() - start_time) * 1_000)
+        latencies_ms.sort()
+        print(
+            f"  {name}: min {latencies_ms[0]:.2f} ms, median {percentile(latencies_ms, 0.5):.2f} ms, "
+            f"p95 {percentile(latencies_ms, 0.95):.2f} ms, max {latencies_ms[-1]:.2f} ms"
+        )
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Benchmark the NEO-6M driver against the emulator")
+    argument_parser.add_argument("--baudrate", type=int, default=115200, help="Baudrate configured by the driver. Default: 115200")
+    argument_parser.add_argument("--duration", type=float, default=3.0, help="Duration of the throughput benchmark in seconds. Default: 3")
+    argument_parser.add_argument("--polls", type=int, default=20, help="Number of polls per message in the latency benchmark. Default: 20")
+    argument_parser.add_argument("--noise", type=float, default=0.0, help="Probability of noise bytes before a frame. Default: 0")
+    argument_parser.add_argument("--drop", type=float, default=0.0, help="Probability of a byte being dropped. Default: 0")
+    argument_parser.add_argument("--bad-checksum", type=float, default=0.0, help="Probability of a frame having a bad checksum. Default: 0")
+    argument_parser.add_argument("--seed", type=int, default=0, help="Seed of the fault injection. Default: 0")
+    arguments = argument_parser.parse_args()
+
+    benchmark_throughput(arguments)
+    if arguments.polls > 0:
+        benchmark_latency(arguments)
+
+
+if __name__ == "__main__":
+    main()
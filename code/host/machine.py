@@ -0,0 +1,109 @@
+# Host(CPython) stand-in for MicroPython's 'machine' module
+# Lets the drivers in ../lib run on a Linux box against a replayed UART log(see replay.py) or an emulator.
+# Importing it also adds MicroPython's 'time.ticks_*' and 'time.sleep_*' functions to CPython's 'time' module.
+
+import time
+
+# MicroPython time functions, ticks don't wrap around on the host
+if not hasattr(time, "ticks_ms"):
+    time.ticks_ms = lambda: time.monotonic_ns() // 1_000_000
+    time.ticks_us = lambda: time.monotonic_ns() // 1_000
+    time.ticks_diff = lambda end, start: end - start
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.sleep_ms = lambda ms: time.sleep(ms / 1_000)
+    time.sleep_us = lambda us: time.sleep(us / 1_000_000)
+
+PWRON_RESET = 1
+WDT_RESET = 3
+
+_uart_transports = {}
+
+
+def attach_uart(uart_id: int, transport) -> None:
+    """Connects UART 'uart_id' to a transport, e.g replay.ReplayUART
+
+    A transport implements 'any', 'readinto' and 'write' like machine.UART.
+    If it has an 'open' method, it is called with the baudrate whenever the UART is (re)initialized.
+    """
+    _uart_transports[uart_id] = transport
+
+
+def reset_cause() -> int:
+    return PWRON_RESET
+
+
+def reset() -> None:
+    raise SystemExit("machine.reset()")
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode: int = -1, pull: int = -1, value: int | None = None) -> None:
+        self.id = id
+        self._value = 0 if value is None else value
+
+    def value(self, value: int | None = None) -> int | None:
+        if value is None:
+            return self._value
+        self._value = value
+
+    def low(self) -> None:
+        self._value = 0
+
+    def high(self) -> None:
+        self._value = 1
+
+    def toggle(self) -> None:
+        self._value ^= 1
+
+
+class Timer:
+    """Timer callbacks are not fired on the host, poll instead(ex: NEO6M.start_streaming(..., background_period_ms=None))"""
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id: int = -1, mode: int = PERIODIC, period: int = -1, callback=None, **kwargs) -> None:
+        self.callback = callback
+
+    def deinit(self) -> None:
+        self.callback = None
+
+
+class UART:
+    def __init__(self, id: int, baudrate: int = 9600, tx=None, rx=None, **kwargs) -> None:
+        if id not in _uart_transports:
+            raise OSError(f"No transport attached to UART {id}, see machine.attach_uart")
+        self.id = id
+        self.baudrate = baudrate
+        self._transport = _uart_transports[id]
+        if hasattr(self._transport, "open"):
+            self._transport.open(baudrate)
+
+    def any(self) -> int:
+        return self._transport.any()
+
+    def read(self, nbytes: int | None = None) -> bytes | None:
+        available = self._transport.any()
+        if available == 0:
+            return None
+        buffer = bytearray(available if nbytes is None else min(nbytes, available))
+        bytes_read = self._transport.readinto(buffer)
+        return bytes(buffer[:bytes_read]) if bytes_read else None
+
+    def readinto(self, buffer, nbytes: int | None = None) -> int | None:
+        if nbytes is not None:
+            buffer = memoryview(buffer)[:nbytes]
+        return self._transport.readinto(buffer)
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode()
+        return self._transport.write(data)
+
+    def flush(self) -> None:
+        pass
@@ -0,0 +1,633 @@
+# Host(CPython) emulator of a NEO-6M GPS module speaking UBX, for testing and benchmarking NEO6M.py without hardware
+#
+# Attach it to a UART of the host 'machine' module(see machine.py) and create NEO6M as usual:
+#   emulator = NEO6MEmulator(time_scale=None)
+#   machine.attach_uart(0, emulator)
+#   gps_module = NEO6M.NEO6M(device_config.DeviceModuleUART("GPS", "NEO6M", 0, 0, 1, -1, 115200), logger.Logger(7))
+#
+# Emulated:
+#   - CFG-PRT, CFG-MSG, CFG-RATE, CFG-CFG and CFG-RST(set and poll) with ACK-ACK/ACK-NAK
+#   - Baudrate changes, responses are only recieved if the UART is opened at the module's baudrate
+#   - NAV-POSLLH, NAV-STATUS, NAV-TIMEUTC, NAV-SOL, NAV-VELNED and NAV-DOP polls and periodic output from a synthetic track
+#   - AID polls and aiding data input
+#   - Byte noise, dropped bytes and corrupted checksums
+# Not emulated: NMEA output, ports other than Serial1 and any other message
+#
+# Run it directly to check the aiding data save/restore of NEO6M.py against the emulator:
+#   python3 code/host/neo6m_emulator.py
+
+import os
+import sys
+import math
+import time
+import random
+import datetime
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOST_DIR)
+sys.path.insert(1, os.path.join(HOST_DIR, "..", "lib"))
+
+import machine  # Host stand-in, see machine.py
+import ubx
+import utils
+
+# WGS84 ellipsoid
+WGS84_A = 6_378_137.0
+WGS84_E2 = 6.69437999014e-3
+
+GPS_EPOCH = datetime.datetime(1980, 1, 6)
+GPS_UTC_LEAP_SECONDS = 18
+MS_PER_WEEK = 7 * 24 * 3600 * 1_000
+
+
+class NEO6MConfig:
+    """Config of the emulated module, the current config and the config saved with CFG-CFG are separate instances"""
+
+    def __init__(self, baudrate: int = 9600) -> None:
+        self.baudrate = baudrate
+        self.mode = 0x000008C0  # 8N1
+        self.in_proto_mask = 0x0007  # UBX, NMEA and RTCM
+        self.out_proto_mask = 0x0007
+        self.message_rates: dict[bytes, int] = {}
+        self.measurement_rate_ms = 1_000
+        self.navigation_rate = 1
+        self.time_reference = 1
+
+    def copy(self) -> "NEO6MConfig":
+        config = NEO6MConfig()
+        config.__dict__.update(self.__dict__)
+        config.message_rates = dict(self.message_rates)
+        return config
+
+
+class SyntheticTrack:
+    """
+    Vehicle moving at constant speed, turning at a constant rate, i.e a circle or a straight line
+
+    Position is integrated once per navigation solution, so polls and periodic messages of the same epoch agree.
+    """
+
+    def __init__(
+        self,
+        lat_deg: float = 12.9716,
+        lon_deg: float = 77.5946,
+        height_m: float = 920.0,
+        speed_mps: float = 10.0,
+        heading_deg: float = 0.0,
+        turn_rate_deg_s: float = 1.0,
+    ) -> None:
+        self.lat = math.radians(lat_deg)
+        self.lon = math.radians(lon_deg)
+        self.height_m = height_m
+        self.speed_mps = speed_mps
+        self.heading = math.radians(heading_deg)
+        self.turn_rate = math.radians(turn_rate_deg_s)
+
+    def advance(self, time_step_s: float) -> None:
+        self.heading = (self.heading + self.turn_rate * time_step_s) % (2 * math.pi)
+        distance_n = self.speed_mps * math.cos(self.heading) * time_step_s
+        distance_e = self.speed_mps * math.sin(self.heading) * time_step_s
+        self.lat += distance_n / WGS84_A
+        self.lon += distance_e / (WGS84_A * math.cos(self.lat))
+
+    def velocity_ned(self) -> tuple[float, float, float]:
+        return (
+            self.speed_mps * math.cos(self.heading),
+            self.speed_mps * math.sin(self.heading),
+            0.0,
+        )
+
+    def position_ecef(self) -> tuple[float, float, float]:
+        sin_lat, cos_lat = math.sin(self.lat), math.cos(self.lat)
+        prime_vertical_radius = WGS84_A / math.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+        return (
+            (prime_vertical_radius + self.height_m) * cos_lat * math.cos(self.lon),
+            (prime_vertical_radius + self.height_m) * cos_lat * math.sin(self.lon),
+            (prime_vertical_radius * (1 - WGS84_E2) + self.height_m) * sin_lat,
+        )
+
+    def velocity_ecef(self) -> tuple[float, float, float]:
+        # Inverse of the rotation in NEO6M._fix_record
+        sin_lat, cos_lat = math.sin(self.lat), math.cos(self.lat)
+        sin_lon, cos_lon = math.sin(self.lon), math.cos(self.lon)
+        vel_n, vel_e, vel_d = self.velocity_ned()
+        return (
+            -sin_lat * cos_lon * vel_n - sin_lon * vel_e - cos_lat * cos_lon * vel_d,
+            -sin_lat * sin_lon * vel_n + cos_lon * vel_e - cos_lat * sin_lon * vel_d,
+            cos_lat * vel_n - sin_lat * vel_d,
+        )
+
+
+class NEO6MEmulator:
+    """
+    Emulated NEO-6M module, stands in for the module behind machine.UART
+
+    Implements the transport interface of machine.attach_uart: 'open', 'any', 'readinto' and 'write'.
+    Navigation solutions are generated on the emulator's clock. In real time mode(time_scale=1.0) the
+    clock follows the host clock and bytes become readable after their transfer time at the current baudrate.
+    With time_scale=None the clock only advances when '.step' is called and bytes are readable immediately,
+    so the driver can be benchmarked as fast as possible.
+    """
+
+    def __init__(
+        self,
+        track: SyntheticTrack | None = None,
+        baudrate: int = 9600,
+        time_scale: float | None = 1.0,
+        ttff_ms: int = 0,
+        gps_week: int = 2_300,
+        start_iTOW_ms: int = 0,
+        noise_probability: float = 0.0,
+        drop_probability: float = 0.0,
+        bad_checksum_probability: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Args:
+            track (SyntheticTrack | None, optional): Track reported by NAV messages. Defaults to a circle around the default position.
+            baudrate (int, optional): Baudrate of the module after power on. Defaults to 9600.
+            time_scale (float | None, optional): Speed of the emulator's clock, 1.0 is real time. None advances the clock with '.step'. Defaults to 1.0.
+            ttff_ms (int, optional): Time to first fix after power on and after cold/warm restarts. Defaults to 0.
+            gps_week (int, optional): GPS week at power on. Defaults to 2_300.
+            start_iTOW_ms (int, optional): GPS time of week at power on. Defaults to 0.
+            noise_probability (float, optional): Probability of random bytes being sent before a frame. Defaults to 0.0.
+            drop_probability (float, optional): Probability of each sent byte being dropped. Defaults to 0.0.
+            bad_checksum_probability (float, optional): Probability of a frame being sent with a wrong checksum. Defaults to 0.0.
+            seed (int, optional): Seed of the fault injection, same seed gives the same faults. Defaults to 0.
+        """
+        self.track = SyntheticTrack() if track is None else track
+        self.time_scale = time_scale
+        self.ttff_ms = ttff_ms
+        self.noise_probability = noise_probability
+        self.drop_probability = drop_probability
+        self.bad_checksum_probability = bad_checksum_probability
+        self._random = random.Random(seed)
+
+        self._default_baudrate = baudrate
+        self.config = NEO6MConfig(baudrate)
+        self._saved_config = self.config.copy()
+        # Forces ACK-NAK for these message types, to test error handling
+        self.nak_message_types: set[bytes] = set()
+        # AID message type -> payloads sent in response to a poll
+        self.aiding_data: dict[bytes, list[bytes]] = {}
+
+        # Baudrate the UART was last opened at
+        self._uart_baudrate = None
+        self._parser = ubx.UBXParser()
+        # Sent bytes, list of [time the last byte is on the line(ms), baudrate, bytes]
+        self._tx_queue: list[list] = []
+        self._line_free_ms = 0.0
+        # Time periodic messages are sent at, None for responses which are sent immediately
+        self._send_time_ms = None
+
+        self._start_time = time.monotonic()
+        self._virtual_time_ms = 0.0
+        self._gps_time_ms = gps_week * MS_PER_WEEK + start_iTOW_ms
+        self._fix_time_ms = ttff_ms
+        self._epoch_time_ms = 0.0
+        self._next_epoch_ms = 0.0
+        self._navigation_solutions = 0
+        self._epoch_payloads: dict[bytes, bytes] = {}
+        self._new_epoch(0.0)
+
+        # Statistics
+        self.received_frames = 0
+        self.sent_frames = 0
+        self.sent_bytes = 0
+        self.noise_bytes = 0
+        self.dropped_bytes = 0
+        self.corrupted_frames = 0
+        self.lost_bytes = 0  # Sent at a baudrate the UART wasn't opened at
+
+    # Clock
+
+    def _now_ms(self) -> float:
+        if self.time_scale is None:
+            return self._virtual_time_ms
+        return (time.monotonic() - self._start_time) * 1_000 * self.time_scale
+
+    def step(self, number_of_solutions: int = 1) -> None:
+        """Advances the clock to the next 'number_of_solutions' navigation solutions, if time_scale is None"""
+        for _ in range(number_of_solutions):
+            self._virtual_time_ms = self._next_epoch_ms
+            self._update()
+
+    def _update(self) -> None:
+        now_ms = self._now_ms()
+        epoch_period_ms = self.config.measurement_rate_ms * self.config.navigation_rate
+        missed_epochs = int((now_ms - self._next_epoch_ms) // epoch_period_ms)
+        if missed_epochs > 10:
+            # Host wasn't reading for a while, only the last 10 solutions are sent
+            self._next_epoch_ms += (missed_epochs - 10) * epoch_period_ms
+
+        while self._next_epoch_ms <= now_ms:
+            self._new_epoch(self._next_epoch_ms)
+            # Solutions computed while the host wasn't reading are already in its recieve buffer
+            self._send_time_ms = self._next_epoch_ms
+            self._send_periodic_messages()
+            self._send_time_ms = None
+            self._next_epoch_ms += epoch_period_ms
+
+    # Navigation solutions
+
+    def has_fix(self) -> bool:
+        return self._epoch_time_ms >= self._fix_time_ms
+
+    def _new_epoch(self, epoch_time_ms: float) -> None:
+        self.track.advance((epoch_time_ms - self._epoch_time_ms) / 1_000)
+        self._epoch_time_ms = epoch_time_ms
+        self._navigation_solutions += 1
+        self._epoch_payloads = {}
+
+    def _nav_payload(self, message_type: bytes) -> bytes | None:
+        # Payloads are built once per epoch, on first use
+        payload = self._epoch_payloads.get(message_type)
+        if payload is None:
+            record_fields = self._nav_record_fields(message_type)
+            if record_fields is None:
+                return None
+            schema = ubx.PAYLOAD_SCHEMAS[message_type]
+            payload = schema.fmt.pack(*schema.record(**record_fields))
+            self._epoch_payloads[message_type] = payload
+        return payload
+
+    def _nav_record_fields(self, message_type: bytes) -> dict | None:
+        gps_time_ms = self._gps_time_ms + int(self._epoch_time_ms)
+        week, iTOW = divmod(gps_time_ms, MS_PER_WEEK)
+        has_fix = self.has_fix()
+        gps_fix = 3 if has_fix else 0
+        # gpsFixOk, WKNSET and TOWSET
+        flags = 0x0D if has_fix else 0x0C
+        horizontal_accuracy_mm = 2_500 if has_fix else 500_000_000
+        speed_accuracy_mm_s = 200 if has_fix else 20_000
+        vel_n, vel_e, vel_d = self.track.velocity_ned() if has_fix else (0.0, 0.0, 0.0)
+        ground_speed_mps = math.sqrt(vel_n * vel_n + vel_e * vel_e)
+
+        if message_type == ubx.UBXMessageTypes.NAV_POSLLH:
+            return dict(
+                iTOW=iTOW,
+                lon=round(math.degrees(self.track.lon) * 1e7) if has_fix else 0,
+                lat=round(math.degrees(self.track.lat) * 1e7) if has_fix else 0,
+                height=round(self.track.height_m * 1_000) if has_fix else 0,
+                hMSL=round((self.track.height_m - 86.0) * 1_000) if has_fix else 0,
+                hAcc=horizontal_accuracy_mm,
+                vAcc=2 * horizontal_accuracy_mm,
+            )
+
+        if message_type == ubx.UBXMessageTypes.NAV_STATUS:
+            return dict(
+                iTOW=iTOW,
+                gpsFix=gps_fix,
+                flags=flags,
+                fixStat=0,
+                flags2=0,
+                ttff=self.ttff_ms if has_fix else 0,
+                msss=int(self._epoch_time_ms),
+            )
+
+        if message_type == ubx.UBXMessageTypes.NAV_TIMEUTC:
+            utc_time = GPS_EPOCH + datetime.timedelta(
+                milliseconds=gps_time_ms - GPS_UTC_LEAP_SECONDS * 1_000
+            )
+            return dict(
+                iTOW=iTOW,
+                tAcc=50,
+                nano=(utc_time.microsecond % 1_000) * 1_000,
+                year=utc_time.year,
+                month=utc_time.month,
+                day=utc_time.day,
+                hour=utc_time.hour,
+                min=utc_time.minute,
+                sec=utc_time.second,
+                valid=0x07 if has_fix else 0x03,
+            )
+
+        if message_type == ubx.UBXMessageTypes.NAV_SOL:
+            ecef_x, ecef_y, ecef_z = self.track.position_ecef() if has_fix else (0.0, 0.0, 0.0)
+            ecef_vx, ecef_vy, ecef_vz = self.track.velocity_ecef() if has_fix else (0.0, 0.0, 0.0)
+            return dict(
+                iTOW=iTOW,
+                fTOW=0,
+                week=week,
+                gpsFix=gps_fix,
+                flags=flags,
+                ecefX=round(ecef_x * 100),
+                ecefY=round(ecef_y * 100),
+                ecefZ=round(ecef_z * 100),
+                pAcc=horizontal_accuracy_mm // 10,
+                ecefVX=round(ecef_vx * 100),
+                ecefVY=round(ecef_vy * 100),
+                ecefVZ=round(ecef_vz * 100),
+                sAcc=speed_accuracy_mm_s // 10,
+                pDOP=150 if has_fix else 9_999,
+                reserved1=0,
+                numSV=8 if has_fix else 0,
+                reserved2=0,
+            )
+
+        if message_type == ubx.UBXMessageTypes.NAV_VELNED:
+            return dict(
+                iTOW=iTOW,
+                velN=round(vel_n * 100),
+                velE=round(vel_e * 100),
+                velD=round(vel_d * 100),
+                speed=round(math.sqrt(ground_speed_mps * ground_speed_mps + vel_d * vel_d) * 100),
+                gSpeed=round(ground_speed_mps * 100),
+                heading=round(math.degrees(self.track.heading) * 1e5) if has_fix else 0,
+                sAcc=speed_accuracy_mm_s // 10,
+                cAcc=50 * 100_000 if has_fix else 180 * 100_000,
+            )
+
+        if message_type == ubx.UBXMessageTypes.NAV_DOP:
+            dop = 150 if has_fix else 9_999
+            return dict(iTOW=iTOW, gDOP=dop, pDOP=dop, tDOP=dop, vDOP=dop, hDOP=dop, nDOP=dop, eDOP=dop)
+
+        return None
+
+    def _send_periodic_messages(self) -> None:
+        for message_type, rate in self.config.message_rates.items():
+            if rate == 0 or self._navigation_solutions % rate != 0:
+                continue
+            payload = self._nav_payload(message_type)
+            if payload is not None:
+                self._send(message_type, payload)
+
+    # Output
+
+    def _send(self, message_type: bytes, payload: bytes) -> None:
+        frame = bytearray(ubx.encode_frame(message_type, payload))
+        self.sent_frames += 1
+
+        if self.bad_checksum_probability and self._random.random() < self.bad_checksum_probability:
+            frame[-1] ^= 0xFF
+            self.corrupted_frames += 1
+
+        if self.drop_probability:
+            sent_bytes = bytearray()
+            for byte in frame:
+                if self._random.random() < self.drop_probability:
+                    self.dropped_bytes += 1
+                else:
+                    sent_bytes.append(byte)
+            frame = sent_bytes
+
+        if self.noise_probability and self._random.random() < self.noise_probability:
+            noise = bytes(self._random.randrange(256) for _ in range(self._random.randint(1, 8)))
+            self.noise_bytes += len(noise)
+            frame = noise + frame
+
+        self._transmit(bytes(frame))
+
+    def _transmit(self, data: bytes) -> None:
+        send_time_ms = self._now_ms() if self._send_time_ms is None else self._send_time_ms
+        done_ms = send_time_ms
+        if self.time_scale is not None:
+            # 10 bits per byte, bytes are sent one after another
+            done_ms = max(send_time_ms, self._line_free_ms) + len(data) * 10 * 1_000 / self.config.baudrate
+            self._line_free_ms = done_ms
+        self._tx_queue.append([done_ms, self.config.baudrate, data])
+        self.sent_bytes += len(data)
+
+    def _send_acknowledgement(self, message_type: bytes, acknowledged: bool) -> None:
+        if message_type in self.nak_message_types:
+            acknowledged = False
+        self._send(
+            ubx.UBXMessageTypes.ACK_ACK if acknowledged else ubx.UBXMessageTypes.ACK_NAK,
+            message_type,
+        )
+
+    # Input
+
+    def _receive_message(self, message_type: bytes, payload: bytes) -> None:
+        self.received_frames += 1
+        handler = self._CFG_HANDLERS.get(message_type)
+        if handler is not None:
+            acknowledged = handler(self, payload)
+            # None if the handler has sent the acknowledgement itself
+            if acknowledged is not None:
+                self._send_acknowledgement(message_type, acknowledged)
+            return
+
+        if message_type[0] == ubx.UBXMessageTypes.CFG_PRT[0]:
+            # Config message that isn't emulated
+            self._send_acknowledgement(message_type, False)
+            return
+
+        if message_type[0] == ubx.UBXMessageTypes.AID_INI[0]:
+            if len(payload) == 0:
+                for aiding_payload in self.aiding_data.get(message_type, ()):
+                    self._send(message_type, aiding_payload)
+            else:
+                self.aiding_data.setdefault(message_type, []).append(payload)
+            return
+
+        if len(payload) == 0:
+            nav_payload = self._nav_payload(message_type)
+            if nav_payload is not None:
+                self._send(message_type, nav_payload)
+        # Unknown messages are ignored
+
+    def _cfg_prt(self, payload: bytes) -> bool:
+        schema = ubx.PAYLOAD_SCHEMAS[ubx.UBXMessageTypes.CFG_PRT]
+        if len(payload) <= 1:
+            # Poll, Serial1 if port id is omitted
+            self._send(
+                ubx.UBXMessageTypes.CFG_PRT,
+                schema.fmt.pack(
+                    payload[0] if payload else 1,
+                    0,
+                    0,
+                    self.config.mode,
+                    self.config.baudrate,
+                    self.config.in_proto_mask,
+                    self.config.out_proto_mask,
+                    0,
+                    0,
+                ),
+            )
+            return True
+
+        if len(payload) != schema.size:
+            return False
+        port_config = schema.decode(payload)
+        if port_config.portID != 1:
+            return port_config.portID < 6
+
+        self.config.mode = port_config.mode
+        self.config.in_proto_mask = port_config.inProtoMask
+        self.config.out_proto_mask = port_config.outProtoMask
+        # Acknowledgement is sent at the new baudrate
+        self.config.baudrate = port_config.baudRate
+        return True
+
+    def _cfg_msg(self, payload: bytes) -> bool:
+        message_type = bytes(payload[:2])
+        if len(payload) == 2:
+            self._send(
+                ubx.UBXMessageTypes.CFG_MSG,
+                message_type + bytes((0, self.config.message_rates.get(message_type, 0), 0, 0, 0, 0)),
+            )
+            return True
+
+        if len(payload) == 3:
+            rate = payload[2]
+        elif len(payload) == 8:
+            # Rates of all 6 I/O ports, Serial1 is port 1
+            rate = payload[3]
+        else:
+            return False
+
+        self.config.message_rates[message_type] = rate
+        return True
+
+    def _cfg_rate(self, payload: bytes) -> bool:
+        schema = ubx.PAYLOAD_SCHEMAS[ubx.UBXMessageTypes.CFG_RATE]
+        if len(payload) == 0:
+            self._send(
+                ubx.UBXMessageTypes.CFG_RATE,
+                schema.fmt.pack(
+                    self.config.measurement_rate_ms,
+                    self.config.navigation_rate,
+                    self.config.time_reference,
+                ),
+            )
+            return True
+
+        if len(payload) != schema.size:
+            return False
+        rate_config = schema.decode(payload)
+        # NEO-6M supports navigation update rates upto 5Hz
+        if rate_config.measRate < 200 or rate_config.navRate == 0 or rate_config.timeRef > 1:
+            return False
+
+        self.config.measurement_rate_ms = rate_config.measRate
+        self.config.navigation_rate = rate_config.navRate
+        self.config.time_reference = rate_config.timeRef
+        return True
+
+    def _cfg_cfg(self, payload: bytes) -> bool:
+        if len(payload) not in (12, 13):
+            return False
+        clear_mask, save_mask, load_mask = utils.compile_fmt("<3L").unpack_from(payload)
+        # Port, message and navigation configs are emulated, see Section 31.3 of mannual
+        emulated_mask = 0x0000000B
+        if clear_mask & emulated_mask:
+            self._saved_config = NEO6MConfig(self._default_baudrate)
+        if save_mask & emulated_mask:
+            self._saved_config = self.config.copy()
+        if load_mask & emulated_mask:
+            self._load_saved_config()
+        return True
+
+    def _cfg_rst(self, payload: bytes) -> bool | None:
+        if len(payload) != 4:
+            return False
+        nav_bbr_mask, reset_mode = utils.compile_fmt("<HB").unpack_from(payload)
+
+        if nav_bbr_mask != 0x0000:
+            # Warm and cold restarts have to reacquire the fix
+            self._fix_time_ms = self._epoch_time_ms + self.ttff_ms
+
+        if reset_mode in (0x00, 0x04):
+            # Hardware reset, acknowledgement is sent before the current config is replaced by the saved config
+            self._send_acknowledgement(ubx.UBXMessageTypes.CFG_RST, True)
+            self._load_saved_config()
+            self._parser.flush()
+            return None
+        return reset_mode in (0x01, 0x02, 0x08, 0x09)
+
+    def _load_saved_config(self) -> None:
+        self.config = self._saved_config.copy()
+
+    _CFG_HANDLERS = {
+        ubx.UBXMessageTypes.CFG_PRT: _cfg_prt,
+        ubx.UBXMessageTypes.CFG_MSG: _cfg_msg,
+        ubx.UBXMessageTypes.CFG_RATE: _cfg_rate,
+        ubx.UBXMessageTypes.CFG_CFG: _cfg_cfg,
+        ubx.UBXMessageTypes.CFG_RST: _cfg_rst,
+    }
+
+    # Transport interface, see machine.attach_uart
+
+    def open(self, baudrate: int) -> None:
+        self._uart_baudrate = baudrate
+
+    def write(self, data) -> int:
+        self._update()
+        if self._uart_baudrate != self.config.baudrate:
+            # Module can't decode bytes sent at another baudrate
+            return len(data)
+        for _ in self._parser.frames(data):
+            self._receive_message(self._parser.message_class_id_bytes, bytes(self._parser.payload))
+        return len(data)
+
+    def _readable(self) -> list:
+        """Returns the sent bytes that have been transferred completely, bytes sent at another baudrate are discarded"""
+        self._update()
+        now_ms = self._now_ms()
+        index = 0
+        while index < len(self._tx_queue) and self._tx_queue[index][0] <= now_ms:
+            if self._tx_queue[index][1] != self._uart_baudrate:
+                self.lost_bytes += len(self._tx_queue[index][2])
+                del self._tx_queue[index]
+                continue
+            index += 1
+        return self._tx_queue[:index]
+
+    def any(self) -> int:
+        return sum(len(data) for _, _, data in self._readable())
+
+    def readinto(self, buffer) -> int | None:
+        bytes_read = 0
+        for entry in self._readable():
+            data = entry[2]
+            count = min(len(buffer) - bytes_read, len(data))
+            buffer[bytes_read : bytes_read + count] = data[:count]
+            bytes_read += count
+            if count < len(data):
+                entry[2] = data[count:]
+                break
+            self._tx_queue.pop(0)
+        return bytes_read if bytes_read else None
+
+
+if __name__ == "__main__":
+    import tempfile
+    import NEO6M
+    import logger
+    import device_config
+
+    print("neo6m_emulator.py: Running tests...")
+
+    emulator = NEO6MEmulator(time_scale=None)
+    machine.attach_uart(0, emulator)
+    gps_module = NEO6M.NEO6M(
+        device_config.DeviceModuleUART("GPS", "NEO6M", 0, 0, 1, -1, 9600),
+        logger.Logger(logger.Logger.LOG_ERROR),
+    )
+    aiding_file_path = os.path.join(tempfile.mkdtemp(), "aiding.ubx")
+
+    print("Saving aiding data...")
+    emulator.aiding_data = {
+        ubx.UBXMessageTypes.AID_INI: [bytes(48)],
+        ubx.UBXMessageTypes.AID_HUI: [bytes(72)],
+        ubx.UBXMessageTypes.AID_EPH: [bytes((sv_id,)) + bytes(103) for sv_id in range(1, 33)],
+        ubx.UBXMessageTypes.AID_ALM: [bytes((sv_id,)) + bytes(7) for sv_id in range(1, 33)],
+    }
+    # Almanac of every satellite is empty and skipped
+    assert gps_module.save_aiding_data(aiding_file_path) == 34
+    saved_bytes = open(aiding_file_path, "rb").read()
+
+    print("Restoring aiding data...")
+    emulator.aiding_data = {}
+    assert gps_module.restore_aiding_data(aiding_file_path, force=True) == 34
+    gps_module.poll_config_uart()
+    assert len(emulator.aiding_data[ubx.UBXMessageTypes.AID_EPH]) == 32
+
+    print("Saving aiding data of an unresponsive module...")
+    emulator.aiding_data = {}
+    assert gps_module.save_aiding_data(aiding_file_path) == 0
+    assert open(aiding_file_path, "rb").read() == saved_bytes
+    assert not os.path.exists(aiding_file_path + ".tmp")
+
+    print("Success")
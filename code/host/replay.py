@@ -0,0 +1,140 @@
+# Replays a UART log recorded on the device(see ../lib/uart_recorder.py) on a host
+#
+# Parse a log as fast as possible and print statistics:
+#   python3 code/host/replay.py GPS_UART.log
+# Replay in real time(--speed 1) or accelerated(--speed 10):
+#   python3 code/host/replay.py GPS_UART.log --speed 10
+#
+# ReplayUART can also be attached to the host 'machine' module to run the drivers against a log:
+#   replay_uart = ReplayUART("GPS_UART.log", speed=None)
+#   machine.attach_uart(0, replay_uart)
+
+import os
+import sys
+import time
+import argparse
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOST_DIR)
+sys.path.insert(1, os.path.join(HOST_DIR, "..", "lib"))
+
+import machine  # Host stand-in, see machine.py
+import ubx
+import utils
+import uart_recorder
+
+
+class ReplayUART:
+    """
+    Plays back the recieved(RX) bytes of a UART log, stands in for machine.UART
+
+    Bytes are handed out with the same boundaries as they were read on the device, so replays are deterministic.
+    Recieved bytes that were recorded after bytes were sent(ex: a poll response) are held back until the same
+    number of bytes has been written to the ReplayUART, so request/response drivers stay in sync with the log.
+    Written bytes are counted and discarded.
+    """
+
+    def __init__(self, file_path: str, speed: float | None = 1.0) -> None:
+        """
+        Args:
+            file_path (str): UART log file
+            speed (float | None, optional): Playback speed, 1.0 is real time. None replays as fast as possible. Defaults to 1.0.
+        """
+        self.speed = speed
+        self._records = uart_recorder.read_records(file_path)
+        self._pending = memoryview(b"")
+        self._next_record = None
+        self._start_time = None
+        self.finished = False
+        # Number of bytes sent before the next record was recorded
+        self._recorded_tx_bytes = 0
+
+        self.rx_bytes = 0
+        self.tx_bytes = 0
+        self.recorded_duration_ms = 0
+
+    def _elapsed_ms(self) -> float:
+        if self._start_time is None:
+            self._start_time = time.monotonic()
+        return (time.monotonic() - self._start_time) * 1_000 * self.speed
+
+    def _load(self) -> None:
+        while len(self._pending) == 0 and not self.finished:
+            if self._next_record is None:
+                self._next_record = next(self._records, None)
+                if self._next_record is None:
+                    self.finished = True
+                    return
+
+            time_ms, record_type, data = self._next_record
+            if self.speed is not None and time_ms > self._elapsed_ms():
+                return
+            if record_type == uart_recorder.UARTLog.RECORD_RX and self.tx_bytes < self._recorded_tx_bytes:
+                return
+
+            self._next_record = None
+            self.recorded_duration_ms = time_ms
+            if record_type == uart_recorder.UARTLog.RECORD_RX:
+                self._pending = memoryview(data)
+            elif record_type == uart_recorder.UARTLog.RECORD_TX:
+                self._recorded_tx_bytes += len(data)
+
+    def any(self) -> int:
+        self._load()
+        return len(self._pending)
+
+    def readinto(self, buffer) -> int | None:
+        self._load()
+        bytes_read = min(len(buffer), len(self._pending))
+        if bytes_read == 0:
+            return None
+        buffer[:bytes_read] = self._pending[:bytes_read]
+        self._pending = self._pending[bytes_read:]
+        self.rx_bytes += bytes_read
+        return bytes_read
+
+    def write(self, data) -> int:
+        self.tx_bytes += len(data)
+        return len(data)
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Replay a UART log through the UBX parser")
+    argument_parser.add_argument("log_file", help="UART log recorded with uart_recorder.UARTLog")
+    argument_parser.add_argument("--speed", type=float, default=None, help="Playback speed, 1 is real time. Default: as fast as possible")
+    arguments = argument_parser.parse_args()
+
+    message_names = {
+        message_type: name
+        for name, message_type in vars(ubx.UBXMessageTypes).items()
+        if not name.startswith("_")
+    }
+
+    replay_uart = ReplayUART(arguments.log_file, arguments.speed)
+    # Nothing is sent, don't hold back responses
+    replay_uart.tx_bytes = float("inf")
+    parser = ubx.UBXParser()
+    message_counts = {}
+
+    start_time = time.perf_counter()
+    while not replay_uart.finished:
+        if not parser.read(replay_uart):
+            if arguments.speed is not None:
+                time.sleep(0.001)
+            continue
+        message_class_id_bytes = parser.message_class_id_bytes
+        message_counts[message_class_id_bytes] = message_counts.get(message_class_id_bytes, 0) + 1
+    time_taken_s = time.perf_counter() - start_time
+
+    number_of_frames = sum(message_counts.values())
+    print(f"Recorded duration: {replay_uart.recorded_duration_ms / 1_000:.1f} s, RX: {replay_uart.rx_bytes} bytes")
+    for message_class_id_bytes, count in sorted(message_counts.items()):
+        name = message_names.get(message_class_id_bytes, utils.bytes_to_hex_str(message_class_id_bytes))
+        print(f"  {name}: {count}")
+    print(f"Frames: {number_of_frames}, Skipped bytes: {parser.skipped_bytes}, Checksum errors: {parser.checksum_errors}, Oversized frames: {parser.oversized_frames}")
+    if time_taken_s > 0:
+        print(f"Replay time: {time_taken_s:.3f} s, {number_of_frames / time_taken_s:.0f} frames/s, {replay_uart.rx_bytes / time_taken_s / 1_000:.1f} kB/s")
+
+
+if __name__ == "__main__":
+    main()
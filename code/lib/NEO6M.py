@@ -1,11 +1,18 @@
+import os
+import math
 import time
+import json
 import struct
+import hashlib
 import machine
 
+from collections import namedtuple
+
 import ubx
 import utils
 import logger
 import device_config
+import uart_recorder
 
 
 
@@ -88,6 +95,42 @@ class NEO6M:
         "Time only fix",
     ]
 
+    SUPPORTED_BAUDRATE = (4800, 9600, 19200, 38400, 57600, 115200)
+    """Baudrates supported by interface 'Serial1', see Section 4.2 of the datasheet"""
+
+    FIX_RECORD = namedtuple(
+        "FIX",
+        (
+            "week",  # GPS week
+            "iTOW",  # GPS time of week, ms
+            "fTOW",  # Fractional part of iTOW, ns
+            "gpsFix",  # Index into 'GPS_FIX_TYPES'
+            "flags",  # NAV-SOL flags, see Section 35.8 of mannual
+            "numSV",  # Number of satellites used in the solution
+            "lon",  # 1e-7 deg
+            "lat",  # 1e-7 deg
+            "height",  # Height above ellipsoid, mm
+            "hMSL",  # Height above mean sea level, mm
+            "hAcc",  # Horizontal accuracy, mm
+            "vAcc",  # Vertical accuracy, mm
+            "velN",  # cm/s
+            "velE",  # cm/s
+            "velD",  # cm/s
+            "gSpeed",  # Ground speed, cm/s
+            "sAcc",  # Speed accuracy, cm/s
+            "pDOP",  # Position DOP, 0.01
+        ),
+    )
+    """Position, velocity and time of a navigation solution, built from NAV-SOL and NAV-POSLLH of the same epoch"""
+
+    AIDING_MESSAGES = (
+        (ubx.UBXMessageTypes.AID_INI, 1),
+        (ubx.UBXMessageTypes.AID_HUI, 1),
+        (ubx.UBXMessageTypes.AID_EPH, 32),
+        (ubx.UBXMessageTypes.AID_ALM, 32),
+    )
+    """Aiding messages saved for hot starts and number of responses to each poll, see Section 31.6 of mannual"""
+
     class RESET_TYPES:
         HW_RESET = b"\x00"
         SW_RESET = b"\x01"
@@ -106,7 +149,17 @@ class NEO6M:
         config: device_config.DeviceModuleUART,
         logger: logger.Logger,
         default_baudrate: int = 9600,
+        state_file_path: str = "",
+        record_file_path: str = "",
     ) -> None:
+        """
+        Args:
+            config (device_config.DeviceModuleUART): UART config of the module
+            logger (logger.Logger): Logger
+            default_baudrate (int, optional): Baudrate of the module's default config. Defaults to 9600.
+            state_file_path (str, optional): File used to persist the applied config across boots. Disabled if empty. Defaults to "".
+            record_file_path (str, optional): File to record all UART traffic to, see uart_recorder.py. Disabled if empty. Defaults to "".
+        """
         self.module_UART_config = config
         self.logger = logger
 
@@ -114,23 +167,235 @@ class NEO6M:
         self.tx_pin = machine.Pin(self.module_UART_config.tx)
         self.rx_pin = machine.Pin(self.module_UART_config.rx)
 
-        # Assume the NEO6M is running the default config i.e 9600
-        self.baudrate = default_baudrate
+        # Raw UART traffic log, for replay on a host
+        self._uart_log = None
+        if record_file_path != "":
+            self._uart_log = uart_recorder.UARTLog(record_file_path)
+
+        # Streaming decoder for messages recieved from the module
+        self._parser = ubx.UBXParser()
+        # Polls and config messages sent repeatedly
+        self._frame_cache = ubx.UBXFrameCache()
+
+        # Periodic messages
+        self._message_callbacks: dict[bytes, list] = {}
+        self._latest_payloads: dict[bytes, bytes | None] = {}
+        self._background_timer = None
+        self._uart_busy = 0
+
+        # Aiding data used for the current start, reported with the TTFF
+        self.aiding_source = "none"
+        self.ttff_ms: int | None = None
+        # Decoder for aiding data downloaded in chunks, frames can be split across chunks
+        self._aiding_parser = ubx.UBXParser()
+
+        # Config applied by the last boot
+        self._state_file_path = state_file_path
+        self._state = self._load_state()
+        self._port_config: tuple[bytes, int, bytes, bytes] | None = None
+        # True if the module is known to be running the config saved in the state file
+        self._config_verified = False
+
+        # Find the baudrate the module is running at, starting with the last known-good baudrate
+        self._default_baudrate = default_baudrate
+        baudrate = self.probe_baudrate()
+        if baudrate is None:
+            # Responses can be delayed by periodic NMEA messages at low baudrates
+            baudrate = self.probe_baudrate(read_timeout_ms=1_000)
+        if baudrate is None:
+            raise ubx.UBXErrorTimeout("GPS module didn't respond at any supported baudrate!")
+
+        # If the module kept the configured baudrate, it is still running the config applied by the last boot.
+        # A module reset to factory defaults answers at the configured baudrate too, if it is the default baudrate,
+        # so '.apply_config' checks a message rate before skipping the config.
+        self._config_verified = (
+            bool(self._state.get("fingerprint"))
+            and baudrate == self.module_UART_config.baudrate
+        )
+
+        # Configure the module to use the specified baudrate
+        if baudrate != self.module_UART_config.baudrate:
+            self.configure_uart(self.module_UART_config.baudrate)
+
+    def _open_uart(self, baudrate: int) -> None:
+        self.baudrate = baudrate
         self.UART = machine.UART(
             self.uart_id, self.baudrate, tx=self.tx_pin, rx=self.rx_pin
         )
-        # Configure the module to use the specified baudrate
+        if self._uart_log is not None:
+            self.UART = uart_recorder.UARTRecorder(self.UART, self._uart_log, self.baudrate)
+        self._parser.flush()
+
+    def probe_baudrate(
+        self,
+        candidate_baudrates: list[int] | None = None,
+        read_timeout_ms: int | None = None,
+    ) -> int | None:
+        """Finds the baudrate of the module by polling its port config at each candidate baudrate.
+
+        The first baudrate that gets a response is used and saved to the state file as the last known-good baudrate.
+
+        Args:
+            candidate_baudrates (list[int] | None, optional): Baudrates to try in order. Defaults to the last known-good baudrate, configured baudrate, default baudrate and remaining supported baudrates.
+            read_timeout_ms (int | None, optional): Timeout for each poll. Defaults to the time needed to transfer the poll and its response plus a small margin.
+
+        Returns:
+            int | None: Baudrate of the module or None if the module didn't respond
+        """
+        if candidate_baudrates is None:
+            candidate_baudrates = []
+            for baudrate in (
+                self._state.get("baudrate"),
+                self.module_UART_config.baudrate,
+                self._default_baudrate,
+            ) + NEO6M.SUPPORTED_BAUDRATE:
+                if baudrate is not None and baudrate not in candidate_baudrates:
+                    candidate_baudrates.append(baudrate)
+
+        for baudrate in candidate_baudrates:
+            self._open_uart(baudrate)
+
+            poll_timeout_ms = read_timeout_ms
+            if poll_timeout_ms is None:
+                # Poll(9 bytes), response(28 bytes) and acknowledgement(10 bytes), 10 bits per byte
+                poll_timeout_ms = (9 + 28 + 10) * 10 * 1_000 // baudrate + 20
+
+            try:
+                self._port_config = self.poll_config_uart(poll_timeout_ms)
+            except ubx.UBXErrorTimeout:
+                continue
+
+            if self._state.get("baudrate") != baudrate:
+                self._save_state(baudrate=baudrate)
+            return baudrate
+
+        return None
+
+    def _load_state(self) -> dict:
+        if self._state_file_path == "":
+            return {}
+
         try:
-            self.configure_uart(self.module_UART_config.baudrate)
-        # If the default baudrate fails, try the baudrate specified in the config
-        except ubx.UBXErrorTimeout:
-            self.baudrate = self.module_UART_config.baudrate
-            self.UART = machine.UART(
-                self.uart_id, self.baudrate, tx=self.tx_pin, rx=self.rx_pin
-            )
-            self.configure_uart(self.baudrate)
+            with open(self._state_file_path, "r") as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, **state) -> None:
+        self._state.update(state)
+        if self._state_file_path == "":
+            return
+
+        with open(self._state_file_path, "w") as state_file:
+            json.dump(self._state, state_file)
 
+    def _config_fingerprint(
+        self,
+        message_rates: list[tuple[bytes, int]],
+        measurement_rate_ms: int,
+        navigation_rate: int,
+    ) -> str:
+        mode, baudrate, in_proto_mask, out_proto_mask = self._port_config
+        config_str = f"PRT:{mode.hex()},{baudrate},{in_proto_mask.hex()},{out_proto_mask.hex()};"
+        config_str += "MSG:" + ",".join(f"{message_type.hex()}={rate}" for message_type, rate in message_rates) + ";"
+        config_str += f"RATE:{measurement_rate_ms},{navigation_rate}"
+        return hashlib.sha256(config_str.encode()).digest().hex()
+
+    def apply_config(
+        self,
+        message_rates: list[tuple[bytes, int]],
+        measurement_rate_ms: int = 1_000,
+        navigation_rate: int = 1,
+        save_to_module: bool = False,
+    ) -> bool:
+        """Applies message rates and navigation rate, unless the module is already running the same config.
 
+        A fingerprint of the port settings, message rates and navigation rate is saved to the state file.
+        If the config of the last boot was verified at startup and its fingerprint matches, nothing is sent to the module.
+
+        Args:
+            message_rates (list[tuple[bytes, int]]): Pairs of message class and id, and rate
+            measurement_rate_ms (int, optional): Time between GPS measurements. Defaults to 1_000.
+            navigation_rate (int, optional): Number of measurements per navigation solution. Defaults to 1.
+            save_to_module (bool, optional): Save the config to the module's battery backed RAM/flash with CFG-CFG. Defaults to False.
+
+        Returns:
+            bool: True if the config was sent to the module, False if it was skipped
+        """
+        if self._port_config is None:
+            self._port_config = self.poll_config_uart()
+
+        fingerprint = self._config_fingerprint(message_rates, measurement_rate_ms, navigation_rate)
+        if (
+            self._config_verified
+            and self._state.get("fingerprint") == fingerprint
+            and self._is_running_config(message_rates, measurement_rate_ms, navigation_rate)
+        ):
+            self.logger.info("GPS module is already running the saved config.")
+            return False
+
+        response_statuses = self.set_message_rates(message_rates)
+        for (message_type, _), response_status in zip(message_rates, response_statuses):
+            if not response_status:
+                self.logger.warning(f"Unable to set rate of message: {utils.bytes_to_hex_str(message_type)}")
+
+        rate_status = self.configure_rate(measurement_rate_ms, navigation_rate)
+        if not rate_status:
+            self.logger.warning("Unable to set navigation rate.")
+
+        save_status = not save_to_module or self.save_config()
+        if not save_status:
+            self.logger.warning("Unable to save config to the module.")
+
+        # Don't skip a partially applied config on the next boot
+        if all(response_statuses) and rate_status and save_status:
+            self._save_state(fingerprint=fingerprint, baudrate=self.baudrate)
+            self._config_verified = True
+        else:
+            self._save_state(fingerprint="")
+        return True
+
+    def _is_running_config(
+        self,
+        message_rates: list[tuple[bytes, int]],
+        measurement_rate_ms: int,
+        navigation_rate: int,
+    ) -> bool:
+        """Checks a single setting of the config against the module, with one poll"""
+        try:
+            if len(message_rates) > 0:
+                message_type, rate = message_rates[0]
+                return self.poll_message_rate(message_type) == rate
+            return self.poll_config_rate()[:2] == (measurement_rate_ms, navigation_rate)
+        except (ubx.UBXErrorTimeout, AssertionError):
+            return False
+
+    def save_config(self, device_mask: int = 0x07) -> bool:
+        """Saves port, message and navigation config of the module to non-volatile memory, so it survives a power cycle.
+
+        See Section 31.3 of mannual
+
+        Args:
+            device_mask (int, optional): Bit 0: Battery backed RAM, Bit 1: Flash, Bit 2: EEPROM. Defaults to 0x07.
+
+        Returns:
+            bool: True if the message was acknowledged otherwise False
+        """
+        mask_fmt_str = ubx.UBXDataTypes.BIG_ENDIAN + ubx.UBXDataTypes.X4
+        clear_mask = 0x00000000
+        save_mask = 0x0000000B  # ioPort, msgConf and navConf
+        load_mask = 0x00000000
+
+        message = ubx.UBXMessage(
+            ubx.UBXMessageTypes.CFG_CFG,
+            3 * ubx.UBXDataTypes.X4 + ubx.UBXDataTypes.X1,
+            struct.pack(mask_fmt_str, clear_mask),
+            struct.pack(mask_fmt_str, save_mask),
+            struct.pack(mask_fmt_str, load_mask),
+            bytes((device_mask,)),
+        )
+        response_status, _ = self.send_UBX_message(message)
+        return response_status == True
 
     def send_UBX_message(
         self,
@@ -138,106 +403,316 @@ class NEO6M:
         read_timeout_ms: int = 1_000,
     ) -> tuple[bool | None, list[bytes]]:
 
-        # Flush Rx buffer to ignore any unread bytes
-        if self.UART.any():
-            self.logger.warning(f"Rx buffer was NOT empty. Contents flushed: {self.UART.read()}")
+        # Keep the background reader away from the UART while waiting for the response
+        self._uart_busy += 1
+        try:
+            # Dispatch any unread messages, such as periodic messages, before sending the message
+            self._dispatch_messages()
+
+            self.UART.write(ubx_message.message_bytes)
+            self.UART.flush()
+
+            # Read and wait for response
+            parsed_messages = []  # Array of parsed UBX messages
+            skipped_bytes = self._parser.skipped_bytes
+            start_time = time.ticks_ms()
+            while time.ticks_diff(time.ticks_ms(), start_time) < read_timeout_ms:
+                if not self._parser.read(self.UART):
+                    continue
+
+                if self._parser.skipped_bytes != skipped_bytes:
+                    self.logger.warning(f"Expected header bytes, read unexpected bytes; ignoring them. Number of bytes ignored: {self._parser.skipped_bytes - skipped_bytes}")
+                    skipped_bytes = self._parser.skipped_bytes
+
+                # If the sent UBX message was of message class CFG(0x06)
+                # then it has to acknowledged with a response message of class ACK(0x05)
+                if ubx_message.message_class_id_bytes.startswith(b"\x06"):
+                    response_status = self._parse_acknowledgement()
+                    if response_status is not None and bytes(self._parser.payload) == ubx_message.message_class_id_bytes:
+                        parsed_messages.append(self._parser.message_bytes)
+                        return (response_status, parsed_messages)
+
+                    elif self._parser.is_message_type(ubx_message.message_class_id_bytes):
+                        # Current message has to poll response
+                        parsed_messages.append(self._parser.message_bytes)
+                        continue
 
-        self.UART.write(ubx_message.message_bytes)
-        self.UART.flush()
+                elif self._parser.is_message_type(ubx_message.message_class_id_bytes):
+                    parsed_messages.append(self._parser.message_bytes)
+                    return (None, parsed_messages)
 
-        # Read and wait for response
-        rx_buffer = b""  # Temporary buffer for unparsed messages
-        parsed_messages = []  # Array of parsed UBX messages
-        start_time = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), start_time) < read_timeout_ms:
-            # Append any unread bytes to rx_buffer
-            if self.UART.any():
-                rx_buffer += self.UART.read()
+                # Message is not a response to the sent message, e.g. a periodic message
+                self._dispatch_message()
+
+            raise ubx.UBXErrorTimeout(f"Timeout reached! Recieved Messages: {[utils.bytes_to_hex_str(message) for message in parsed_messages]}")
+        finally:
+            self._uart_busy -= 1
+
+    def _parse_acknowledgement(self) -> bool | None:
+        """Returns True if the last parsed message is ACK-ACK, False if it is ACK-NAK otherwise None.
+
+        Payload of ACK-ACK/ACK-NAK is the message class and id of the acknowledged message.
+        """
+        if self._parser.payload_length != 2:
+            return None
+        if self._parser.is_message_type(ubx.UBXMessageTypes.ACK_ACK):
+            return True
+        if self._parser.is_message_type(ubx.UBXMessageTypes.ACK_NAK):
+            return False
+        return None
+
+    def _dispatch_message(self) -> None:
+        """Stores the last parsed message in its latest-value slot and passes it to the subscribed callbacks"""
+        message_class_id_bytes = self._parser.message_class_id_bytes
+
+        if message_class_id_bytes in self._latest_payloads:
+            self._latest_payloads[message_class_id_bytes] = bytes(self._parser.payload)
+
+        for callback in self._message_callbacks.get(message_class_id_bytes, ()):
+            callback(message_class_id_bytes, self._parser.payload)
+
+    def _dispatch_messages(self) -> int:
+        number_of_messages = 0
+        while self._parser.read(self.UART):
+            self._dispatch_message()
+            number_of_messages += 1
+        return number_of_messages
+
+    def process_messages(self) -> int:
+        """Reads all buffered messages and dispatches them to the latest-value slots and subscribed callbacks.
+
+        Call it periodically from the main loop or let the background reader started by '.start_streaming' call it.
 
-            # If rx_buffer is not empty, parse ubx messages
-            if len(rx_buffer) >= 2:
+        Returns:
+            int: Number of dispatched messages
+        """
+
+        # Another method is waiting for a response
+        if self._uart_busy:
+            return 0
+
+        self._uart_busy += 1
+        try:
+            return self._dispatch_messages()
+        finally:
+            self._uart_busy -= 1
+
+    def subscribe(self, message_type: bytes, callback) -> None:
+        """Registers 'callback(message_class_id_bytes, payload)' to be called for every recieved message of type 'message_type'.
+
+        'payload' is a memoryview into the parser's buffer, it is only valid during the call.
+        """
+        self._message_callbacks.setdefault(message_type, []).append(callback)
+
+    def unsubscribe(self, message_type: bytes, callback) -> None:
+        callbacks = self._message_callbacks.get(message_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def get_latest(self, message_type: bytes) -> tuple | None:
+        """Returns the unpacked payload of the newest recieved message of type 'message_type' without any UART transaction.
+
+        Returns None if no message of that type has been recieved since '.start_streaming' was called.
+        """
+        payload_bytes = self._latest_payloads.get(message_type)
+        if payload_bytes is None:
+            return None
+        return ubx.decode_payload(message_type, payload_bytes)
+
+    def send_UBX_config_messages(
+        self,
+        ubx_messages: list[ubx.UBXMessage],
+        read_timeout_ms: int = 1_000,
+        max_outstanding: int = 16,
+    ) -> list[bool | None]:
+        """Sends CFG messages back-to-back without waiting for each acknowledgement.
+
+        Acknowledgements are matched to the sent messages by the message class and id echoed in the
+        payload of ACK-ACK/ACK-NAK messages. Messages with the same class and id are acknowledged in the order they were sent.
+
+        Args:
+            ubx_messages (list[ubx.UBXMessage]): Messages of message class CFG(0x06)
+            read_timeout_ms (int, optional): Maximum time to wait for the next acknowledgement. Defaults to 1_000.
+            max_outstanding (int, optional): Maximum number of unacknowledged messages. Defaults to 16.
+
+        Raises:
+            ValueError: If a message is not of message class CFG(0x06)
+
+        Returns:
+            list[bool | None]: True if acknowledged, False if not acknowledged and None if no acknowledgement was recieved, for each message
+        """
 
-                # Find ubx header bytes (0xB5 0x62)
-                header_index = rx_buffer.find(b"\xB5\x62")
-                if header_index == -1:
+        for ubx_message in ubx_messages:
+            if not ubx_message.message_class_id_bytes.startswith(b"\x06"):
+                raise ValueError(f"Only messages of message class CFG(0x06) are acknowledged. Recieved message: {utils.bytes_to_hex_str(ubx_message.message_class_id_bytes)}")
+
+        number_of_messages = len(ubx_messages)
+        response_statuses: list[bool | None] = [None] * number_of_messages
+
+        # Indices of unacknowledged messages by message class and id, in the order they were sent
+        outstanding_messages: dict[bytes, list[int]] = {}
+        number_of_outstanding_messages = 0
+        next_message_index = 0
+
+        self._uart_busy += 1
+        try:
+            # Dispatch any unread messages, such as periodic messages, before sending the messages
+            self._dispatch_messages()
+
+            start_time = time.ticks_ms()
+            while next_message_index < number_of_messages or number_of_outstanding_messages:
+
+                # Send as many messages as allowed in a single write
+                if next_message_index < number_of_messages and number_of_outstanding_messages < max_outstanding:
+                    end_message_index = min(
+                        number_of_messages,
+                        next_message_index + max_outstanding - number_of_outstanding_messages,
+                    )
+                    self.UART.write(
+                        b"".join(
+                            ubx_message.message_bytes
+                            for ubx_message in ubx_messages[next_message_index:end_message_index]
+                        )
+                    )
+                    for message_index in range(next_message_index, end_message_index):
+                        message_class_id_bytes = ubx_messages[message_index].message_class_id_bytes
+                        outstanding_messages.setdefault(message_class_id_bytes, []).append(message_index)
+                    number_of_outstanding_messages += end_message_index - next_message_index
+                    next_message_index = end_message_index
+                    start_time = time.ticks_ms()
+
+                if time.ticks_diff(time.ticks_ms(), start_time) >= read_timeout_ms:
+                    self.logger.warning(f"Timeout reached! {number_of_outstanding_messages} message(s) were not acknowledged.")
+                    break
+
+                if not self._parser.read(self.UART):
                     continue
-                else:
-                    if header_index != 0:
-                        self.logger.warning(f"Expected header bytes, read unexpected bytes; ignoring them. Bytes ignored: {rx_buffer[:header_index]}")
-                        rx_buffer = rx_buffer[header_index:]
-                        header_index = 0
 
-                    # Wait and read message class, message id and payload length
-                    if len(rx_buffer) < 6:
+                response_status = self._parse_acknowledgement()
+                if response_status is not None:
+                    message_indices = outstanding_messages.get(bytes(self._parser.payload))
+                    if message_indices:
+                        response_statuses[message_indices.pop(0)] = response_status
+                        number_of_outstanding_messages -= 1
+                        start_time = time.ticks_ms()
                         continue
-                    else:
-                        # Read ubx header(2 bytes), message class + message id(1 + 1 = 2 bytes), payload length (little endian 2 bytes)
-                        response_header_bytes = rx_buffer[:2]
-                        response_class_id_bytes = rx_buffer[2:4]
-                        response_payload_length_bytes = rx_buffer[4:6]
-                        (response_payload_length,) = struct.unpack(
-                            ubx.UBXDataTypes.PAYLOAD_LENGTH,
-                            response_payload_length_bytes,
-                        )
 
-                        # Wait and read the remaining message i.e payload and 2 bytes checksum
-                        if len(rx_buffer) < (2 + 2 + 2) + response_payload_length + 2:
-                            continue
-                        else:
-                            response_payload_start_index = (
-                                len(response_header_bytes)  # 2 bytes
-                                + len(response_class_id_bytes)  # 2 bytes
-                                + len(response_payload_length_bytes)  # 2 bytes
-                            )
-                            assert response_payload_start_index == 6
-
-                            response_payload_end_index = (
-                                response_payload_start_index + response_payload_length
-                            )
-                            response_payload_bytes = rx_buffer[
-                                response_payload_start_index:response_payload_end_index
-                            ]
-                            response_checksum_bytes = rx_buffer[
-                                response_payload_end_index : response_payload_end_index
-                                + 2
-                            ]
-
-                            response_bytes = (
-                                response_header_bytes
-                                + response_class_id_bytes
-                                + response_payload_length_bytes
-                                + response_payload_bytes
-                                + response_checksum_bytes
-                            )
-
-                            message_size = len(response_bytes)
-                            message_end_index = header_index + message_size
-                            parsed_message = rx_buffer[header_index:message_end_index]
-                            rx_buffer = rx_buffer[message_end_index:]
-                            parsed_messages.append(parsed_message)
-                            assert parsed_message == response_bytes
-
-                            response_status = None
-                            # If the sent UBX message was of message class CFG(0x06)
-                            # then it has to acknowledged with a response message of class ACK(0x05)
-                            if ubx_message.message_class_id_bytes.startswith(b"\x06"):
-                                if (response_class_id_bytes== ubx.UBXMessageTypes.ACK_ACK):
-                                    response_status = True
-                                    return (response_status, parsed_messages)
-
-                                elif (response_class_id_bytes== ubx.UBXMessageTypes.ACK_NAK):
-                                    response_status = False
-                                    return (response_status, parsed_messages)
-
-                                else:
-                                    # Current message has to poll response
-                                    assert (ubx_message.message_class_id_bytes== response_class_id_bytes)
-                                    continue
-
-                            else:
-                                return (response_status, parsed_messages)
-
-        raise ubx.UBXErrorTimeout(f"Timeout reached! Recieved Bytes: {utils.bytes_to_hex_str(rx_buffer)}")
+                # Message is not an acknowledgement of a sent message, e.g. a periodic message
+                self._dispatch_message()
+        finally:
+            self._uart_busy -= 1
+
+        return response_statuses
+
+    def _message_rate_message(self, message_type: bytes, rate: int) -> ubx.UBXMessage:
+        # Payload: message class, message id, rate
+        return self._frame_cache.get(ubx.UBXMessageTypes.CFG_MSG, message_type + bytes((rate,)))
+
+    def set_message_rate(self, message_type: bytes, rate: int) -> bool:
+        """Sets the rate of a periodic message on the current port.
+
+        See Section 31.11.3 of mannual
+
+        Args:
+            message_type (bytes): Message class and message id
+            rate (int): Message is sent once every 'rate' navigation solutions, 0 disables the message.
+
+        Returns:
+            bool: True if the message was acknowledged otherwise False
+        """
+        response_status, _ = self.send_UBX_message(
+            self._message_rate_message(message_type, rate)
+        )
+        return response_status == True
+
+    def set_message_rates(self, message_rates: list[tuple[bytes, int]]) -> list[bool]:
+        """Sets the rates of multiple periodic messages with pipelined CFG-MSG messages.
+
+        Args:
+            message_rates (list[tuple[bytes, int]]): Pairs of message class and id, and rate
+
+        Returns:
+            list[bool]: True if the message was acknowledged otherwise False, for each message
+        """
+        response_statuses = self.send_UBX_config_messages(
+            [
+                self._message_rate_message(message_type, rate)
+                for message_type, rate in message_rates
+            ]
+        )
+        return [response_status == True for response_status in response_statuses]
+
+    def configure_rate(
+        self,
+        measurement_rate_ms: int,
+        navigation_rate: int = 1,
+        time_reference: int = 1,
+    ) -> bool:
+        """Sets the measurement and navigation rate, i.e rate at which periodic messages are sent.
+
+        See Section 31.17 of mannual
+
+        Args:
+            measurement_rate_ms (int): Time between GPS measurements
+            navigation_rate (int, optional): Number of measurements per navigation solution. Defaults to 1.
+            time_reference (int, optional): 0: UTC time, 1: GPS time. Defaults to 1.
+
+        Returns:
+            bool: True if the message was acknowledged otherwise False
+        """
+        field_fmt_str = ubx.UBXDataTypes.BIG_ENDIAN + ubx.UBXDataTypes.U2
+        message = ubx.UBXMessage(
+            ubx.UBXMessageTypes.CFG_RATE,
+            3 * ubx.UBXDataTypes.U2,
+            struct.pack(field_fmt_str, measurement_rate_ms),
+            struct.pack(field_fmt_str, navigation_rate),
+            struct.pack(field_fmt_str, time_reference),
+        )
+        response_status, _ = self.send_UBX_message(message)
+        return response_status == True
+
+    def start_streaming(
+        self,
+        message_types: list[bytes],
+        rate: int = 1,
+        background_period_ms: int | None = 100,
+    ) -> None:
+        """Enables periodic output of 'message_types' and keeps the newest message of each type in a latest-value slot.
+
+        Args:
+            message_types (list[bytes]): Messages to enable, usually NAV messages
+            rate (int, optional): Message is sent once every 'rate' navigation solutions. Defaults to 1.
+            background_period_ms (int | None, optional): Period of the background reader. If None, '.process_messages' has to be called by the user. Defaults to 100.
+        """
+        response_statuses = self.set_message_rates(
+            [(message_type, rate) for message_type in message_types]
+        )
+        for message_type, response_status in zip(message_types, response_statuses):
+            if not response_status:
+                self.logger.warning(f"Unable to enable periodic message: {utils.bytes_to_hex_str(message_type)}")
+            self._latest_payloads.setdefault(message_type, None)
+
+        if background_period_ms is not None and self._background_timer is None:
+            self._background_timer = machine.Timer(
+                period=background_period_ms,
+                mode=machine.Timer.PERIODIC,
+                callback=lambda timer: self.process_messages(),
+            )
+
+    def stop_streaming(self) -> None:
+        """Disables all periodic messages enabled by '.start_streaming' and stops the background reader"""
+        if self._background_timer is not None:
+            self._background_timer.deinit()
+            self._background_timer = None
+
+        message_types = list(self._latest_payloads)
+        response_statuses = self.set_message_rates(
+            [(message_type, 0) for message_type in message_types]
+        )
+        for message_type, response_status in zip(message_types, response_statuses):
+            if not response_status:
+                self.logger.warning(f"Unable to disable periodic message: {utils.bytes_to_hex_str(message_type)}")
+        self._latest_payloads = {}
 
     def reset_and_restart(
         self, reset_type: bytes, restart_type: bytes, default_baudrate: int = 9600
@@ -260,17 +735,17 @@ class NEO6M:
             reset_type == NEO6M.RESET_TYPES.HW_RESET
             or reset_type == NEO6M.RESET_TYPES.HW_RESET_AFTER_SHUTDOWN
         ):
-            self.baudrate = default_baudrate
-            self.UART = machine.UART(
-                self.uart_id, self.baudrate, tx=self.tx_pin, rx=self.rx_pin
-            )
+            self._config_verified = False
 
             # Wait for the module to recover from hardware reset
             time.sleep_ms(300)  # Arbitrary sleep delay
 
+            # Module restarts with the config saved in non-volatile memory or the default config
+            if self.probe_baudrate([self.baudrate, default_baudrate]) is None:
+                raise ubx.UBXErrorTimeout("GPS module didn't respond after hardware reset!")
+
         # Restore the baudrate specified in the config file
-        self.baudrate = self.module_UART_config.baudrate
-        self.configure_uart(self.baudrate)
+        self.configure_uart(self.module_UART_config.baudrate)
 
     def reset_sw_restart_cold(self) -> None:
         """Forces GPS only software reset and cold restart. Current configuration will persists after the restart."""
@@ -296,6 +771,7 @@ class NEO6M:
         mode: bytes | None = None,
         in_proto_mask: bytes | None = None,
         out_proto_mask: bytes | None = None,
+        read_timeout_ms: int = 500,
     ) -> None:
         """_summary_
 
@@ -369,50 +845,25 @@ class NEO6M:
 
             # TODO: Add support for non-default 'mode'
             # Reconfigure UART to use the new baudrate
-            self.baudrate = new_baudrate
-            self.UART = machine.UART(
-                self.uart_id, self.baudrate, tx=self.tx_pin, rx=self.rx_pin
-            )
-
-            rx_buffer = b""
-
-            while True:
-                if self.UART.any():
-                    rx_buffer += self.UART.read()
-
-                if len(rx_buffer) >= 10:
-                    header_index = rx_buffer.find(b"\xB5\x62")
-                    if header_index == -1:
-                        continue
-
-                    else:
-                        if header_index != 0:
-                            self.logger.warning(f"Expected header bytes, read unexpected bytes; ignoring them. Bytes ignored: {rx_buffer[:header_index]}")
-                            rx_buffer = rx_buffer[header_index:]
-                            header_index = 0
-
-                        response_start_index = header_index
-                        response_end_index = header_index + 10
-                        response_bytes = rx_buffer[
-                            response_start_index:response_end_index
-                        ]  # Response to config message
-
-                        if len(rx_buffer) > 10:
-                            self.logger.warning(f"Recieved more than expected bytes; ignoring them. Bytes ignored: {rx_buffer[response_end_index:]}")
-
-                        (
-                            _,
-                            msg_cls_id_bytes,
-                            payload_length_bytes,
-                            payload_bytes,
-                            _,
-                        ) = ubx.UBXMessage.split_message_bytes(response_bytes)
-
-                        assert msg_cls_id_bytes == ubx.UBXMessageTypes.ACK_ACK
-                        assert payload_length_bytes == b"\x02\x00"
-                        assert payload_bytes == config_message.message_class_id_bytes
-
-                        break
+            self._open_uart(new_baudrate)
+            skipped_bytes = self._parser.skipped_bytes
+
+            # Response to config message is sent with the new baudrate
+            self._uart_busy += 1
+            try:
+                start_time = time.ticks_ms()
+                while not self._parser.read(self.UART):
+                    if time.ticks_diff(time.ticks_ms(), start_time) >= read_timeout_ms:
+                        raise ubx.UBXErrorTimeout(f"Timeout reached! Config message was not acknowledged at baudrate {new_baudrate}.")
+            finally:
+                self._uart_busy -= 1
+
+            if self._parser.skipped_bytes != skipped_bytes:
+                self.logger.warning(f"Expected header bytes, read unexpected bytes; ignoring them. Number of bytes ignored: {self._parser.skipped_bytes - skipped_bytes}")
+
+            assert self._parser.is_message_type(ubx.UBXMessageTypes.ACK_ACK)
+            assert self._parser.payload_length == 2
+            assert bytes(self._parser.payload) == config_message.message_class_id_bytes
 
         # Poll the new config
         polled_mode, polled_baudrate, polled_in_proto_mask, polled_out_proto_mask = (
@@ -425,150 +876,416 @@ class NEO6M:
         assert new_in_proto_mask == polled_in_proto_mask
         assert new_out_proto_mask == polled_out_proto_mask
 
-    def poll_config_uart(self) -> tuple[bytes, int, bytes, bytes]:
+        self._port_config = (polled_mode, polled_baudrate, polled_in_proto_mask, polled_out_proto_mask)
+        if self._state.get("baudrate") != polled_baudrate:
+            self._save_state(baudrate=polled_baudrate)
+
+    def poll_config_uart(self, read_timeout_ms: int = 1_000) -> tuple[bytes, int, bytes, bytes]:
+        """Polls the config of interface 'Serial1'
+
+        See Section 31.16.3 of mannual
+
+        Returns:
+            tuple[bytes, int, bytes, bytes]: Mode, baudrate, input protocol mask and output protocol mask. Bitfields are big endian bytes, as expected by '.configure_uart'
+        """
         port_id = b"\x01"
-        payload_fields_fmt_str = ubx.UBXDataTypes.U1
+        poll_config_msg = self._frame_cache.get(ubx.UBXMessageTypes.CFG_PRT, port_id)
+
+        response_status, response_messages = self.send_UBX_message(poll_config_msg, read_timeout_ms)
+        assert response_status == True
+
+        port_config = NEO6M._decode_response(ubx.UBXMessageTypes.CFG_PRT, response_messages[0])
+
+        assert port_config.portID == port_id[0]
+        assert port_config.txReady == 0
 
-        poll_config_msg = ubx.UBXMessage(
-            ubx.UBXMessageTypes.CFG_PRT, payload_fields_fmt_str, port_id
+        return (
+            port_config.mode.to_bytes(4, "big"),
+            port_config.baudRate,
+            port_config.inProtoMask.to_bytes(2, "big"),
+            port_config.outProtoMask.to_bytes(2, "big"),
         )
 
-        response_status, response_messages = self.send_UBX_message(poll_config_msg)
-        poll_response = response_messages[0]
+    def poll_message_rate(self, message_type: bytes, read_timeout_ms: int = 1_000) -> int:
+        """Polls the rate of a message on interface 'Serial1'
+
+        See Section 31.11.1 of mannual
+
+        Args:
+            message_type (bytes): Message class and id
 
+        Returns:
+            int: Rate of the message, 0 if it is disabled
+        """
+        poll_rate_msg = self._frame_cache.get(ubx.UBXMessageTypes.CFG_MSG, message_type)
+
+        response_status, response_messages = self.send_UBX_message(poll_rate_msg, read_timeout_ms)
         assert response_status == True
 
-        _, message_cls_id_bytes, payload_length_bytes, payload_bytes, _ = (
-            ubx.UBXMessage.split_message_bytes(poll_response)
-        )
+        # Payload: msgClass, msgID and rates of the 6 I/O ports, Serial1 is port 1
+        # Header(2) + Class/Id(2) + Length(2) + msgClass(1) + msgID(1) + port 0(1)
+        response_bytes = response_messages[0]
+        assert response_bytes[6:8] == message_type
+        return response_bytes[9]
 
-        response_payload_fields_fmt_str = (
-            2 * ubx.UBXDataTypes.U1
-            + ubx.UBXDataTypes.X2
-            + ubx.UBXDataTypes.X4
-            + ubx.UBXDataTypes.U4
-            + 2 * ubx.UBXDataTypes.X2
-            + 2 * ubx.UBXDataTypes.U2
-        )
+    def poll_config_rate(self, read_timeout_ms: int = 1_000) -> tuple[int, int, int]:
+        """Polls the measurement and navigation rate
+
+        See Section 31.17 of mannual
 
-        (payload_length,) = struct.unpack(
-            ubx.UBXDataTypes.PAYLOAD_LENGTH, payload_length_bytes
+        Returns:
+            tuple[int, int, int]: Measurement rate in ms, navigation rate and time reference
+        """
+        response_status, response_messages = self.send_UBX_message(
+            self._frame_cache.get(ubx.UBXMessageTypes.CFG_RATE), read_timeout_ms
         )
-        calculated_payload_length = struct.calcsize(response_payload_fields_fmt_str)
+        assert response_status == True
 
-        assert payload_length == calculated_payload_length
-        assert message_cls_id_bytes == ubx.UBXMessageTypes.CFG_PRT
+        rate_config = NEO6M._decode_response(ubx.UBXMessageTypes.CFG_RATE, response_messages[0])
+        return rate_config.measRate, rate_config.navRate, rate_config.timeRef
 
-        (
-            response_port_id,
-            _,
-            tx_ready_bytes,
-            mode_bytes,
-            baudrate_bytes,
-            in_proto_mask_bytes,
-            out_proto_mask_bytes,
-            _,
-            _,
-        ) = utils.split_bytes_fmt(response_payload_fields_fmt_str, payload_bytes)
-
-        assert port_id == response_port_id
-        assert tx_ready_bytes == b"\x00\x00"
-
-        (baudrate,) = struct.unpack(ubx.UBXDataTypes.U4, baudrate_bytes)
+    @staticmethod
+    def _decode_response(message_type: bytes, response_bytes: bytes) -> tuple:
+        """Decodes the payload of a complete frame returned by '.send_UBX_message'"""
+        assert response_bytes[2:4] == message_type
+        # Header(2) + Class/Id(2) + Length(2) + Payload(n) + Checksum(2)
+        return ubx.decode_payload(message_type, response_bytes, 6, len(response_bytes) - 8)
 
-        return (
-            utils.reverse_byte_order(mode_bytes),
-            baudrate,
-            utils.reverse_byte_order(in_proto_mask_bytes),
-            utils.reverse_byte_order(out_proto_mask_bytes),
-        )
+    def _poll_nav_message(self, message_type: bytes, read_timeout_ms: int = 1_000) -> tuple:
+        (response,) = self.poll_many([message_type], read_timeout_ms)
+        if response is None:
+            raise ubx.UBXErrorTimeout(f"Timeout reached! No response to poll: {utils.bytes_to_hex_str(message_type)}")
+        return response
 
     def poll_nav_posllh(self) -> tuple[int, int, int, int, int, int, int]:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_POSLLH)
 
-        poll_message = ubx.UBXMessage(ubx.UBXMessageTypes.NAV_POSLLH, "")
+    def poll_nav_status(self) -> tuple[int, int, int, int, int, int, int]:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_STATUS)
 
-        response_status, response = self.send_UBX_message(poll_message)
+    def poll_nav_timeutc(
+        self,
+    ) -> tuple[int, int, int, int, int, int, int, int, int, int]:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_TIMEUTC)
 
-        assert response_status == None
-        assert len(response) == 1
+    def poll_nav_sol(self) -> tuple:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_SOL)
 
-        payload_fields_fmt_str = (
-            ubx.UBXDataTypes.LITTLE_ENDIAN
-            + ubx.UBXDataTypes.U4
-            + 4 * ubx.UBXDataTypes.I4
-            + 2 * ubx.UBXDataTypes.U4
-        )
+    def poll_nav_velned(self) -> tuple:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_VELNED)
 
-        response_bytes = response[0]
-        (
-            _,  # Header bytes
-            _,  # Message class and id bytes
-            _,  # Payload_length_bytes
-            payload_bytes,
-            _,  # Checksum bytes
-        ) = ubx.UBXMessage.split_message_bytes(response_bytes)
+    def poll_nav_dop(self) -> tuple:
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_DOP)
 
-        assert struct.calcsize(payload_fields_fmt_str) == len(payload_bytes)
+    def poll_nav_svinfo(self) -> tuple:
+        """Polls NAV-SVINFO, field 'blocks' holds one record per channel"""
+        return self._poll_nav_message(ubx.UBXMessageTypes.NAV_SVINFO)
 
-        return struct.unpack(payload_fields_fmt_str, payload_bytes)
+    def poll_mon_hw(self) -> tuple:
+        return self._poll_nav_message(ubx.UBXMessageTypes.MON_HW)
 
-    def poll_nav_status(self) -> tuple[int, int, int, int, int, int, int]:
-        poll_message = ubx.UBXMessage(ubx.UBXMessageTypes.NAV_STATUS, "")
-        response_status, response = self.send_UBX_message(poll_message)
+    def poll_many(self, message_types: list[bytes], read_timeout_ms: int = 1_000) -> list[tuple | None]:
+        """Polls multiple messages in a single UART write and decodes the responses as they arrive.
 
-        assert response_status == None
-        assert len(response) == 1
+        Responses are matched to the polls by message class and id, in any order, so the total latency is close to
+        the slowest single response. Unrelated messages, e.g periodic messages, are dispatched as usual.
+        A message type listed more than once is polled once, its response is returned for each entry.
 
-        payload_fields_fmt_str = (
-            ubx.UBXDataTypes.U4
-            + ubx.UBXDataTypes.U1
-            + 3 * ubx.UBXDataTypes.X1
-            + 2 * ubx.UBXDataTypes.U4
-        )
+        Args:
+            message_types (list[bytes]): Messages to poll, each needs a schema in 'ubx.PAYLOAD_SCHEMAS'
+            read_timeout_ms (int, optional): Deadline shared by all polls. Defaults to 1_000.
 
-        response_bytes = response[0]
-        (
-            _,  # Header bytes
-            _,  # Message class and id bytes
-            _,  # Payload_length_bytes
-            payload_bytes,
-            _,  # Checksum bytes
-        ) = ubx.UBXMessage.split_message_bytes(response_bytes)
+        Raises:
+            ubx.UBXError: If a message type has no payload schema
+
+        Returns:
+            list[tuple | None]: Decoded response of each message type, None if it didn't arrive before the deadline
+        """
+        unique_message_types = []
+        for message_type in message_types:
+            if message_type not in ubx.PAYLOAD_SCHEMAS:
+                raise ubx.UBXError(f"No payload schema for message: {utils.bytes_to_hex_str(message_type)}")
+            if message_type not in unique_message_types:
+                unique_message_types.append(message_type)
 
-        assert struct.calcsize(payload_fields_fmt_str) == len(payload_bytes)
+        poll_bytes = self._frame_cache.get_polls(tuple(unique_message_types))
+        responses: dict[bytes, tuple] = {}
 
-        return struct.unpack(payload_fields_fmt_str, payload_bytes)
+        self._uart_busy += 1
+        try:
+            # Dispatch any unread messages instead of discarding them
+            self._dispatch_messages()
+            self.UART.write(poll_bytes)
+
+            start_time = time.ticks_ms()
+            while len(responses) < len(unique_message_types):
+                if time.ticks_diff(time.ticks_ms(), start_time) >= read_timeout_ms:
+                    break
+                if not self._parser.read(self.UART):
+                    continue
 
-    def poll_nav_timeutc(
-        self,
-    ) -> tuple[int, int, int, int, int, int, int, int, int, int]:
-        poll_message = ubx.UBXMessage(ubx.UBXMessageTypes.NAV_TIMEUTC, "")
+                message_class_id_bytes = self._parser.message_class_id_bytes
+                if message_class_id_bytes in unique_message_types and message_class_id_bytes not in responses:
+                    responses[message_class_id_bytes] = ubx.decode_payload(
+                        message_class_id_bytes, self._parser.payload
+                    )
+                else:
+                    self._dispatch_message()
+        finally:
+            self._uart_busy -= 1
 
-        response_status, response = self.send_UBX_message(poll_message)
+        return [responses.get(message_type) for message_type in message_types]
 
-        assert response_status == None
-        assert len(response) == 1
+    def poll_fix(self, read_timeout_ms: int = 1_000) -> tuple:
+        """Polls NAV-SOL and NAV-POSLLH in a single UART transaction and combines them into a fix record.
 
-        payload_fields_fmt_str = (
-            2 * ubx.UBXDataTypes.U4
-            + ubx.UBXDataTypes.I4
-            + ubx.UBXDataTypes.U2
-            + 5 * ubx.UBXDataTypes.U1
-            + ubx.UBXDataTypes.X1
+        Both responses have to belong to the same epoch(same iTOW), as in '.get_latest_fix'. If the polls straddled
+        an epoch boundary, they are polled once more.
+
+        Args:
+            read_timeout_ms (int, optional): Timeout for both responses. Defaults to 1_000.
+
+        Raises:
+            ubx.UBXErrorTimeout: If any of the polls wasn't answered within 'read_timeout_ms'
+            ubx.UBXError: If the responses of both attempts were of different epochs
+
+        Returns:
+            tuple: Record of type 'NEO6M.FIX_RECORD'
+        """
+        for _ in range(2):
+            nav_sol, nav_posllh = self.poll_many(
+                [ubx.UBXMessageTypes.NAV_SOL, ubx.UBXMessageTypes.NAV_POSLLH], read_timeout_ms
+            )
+            if nav_sol is None or nav_posllh is None:
+                raise ubx.UBXErrorTimeout(f"Timeout reached! NAV-SOL: {nav_sol}, NAV-POSLLH: {nav_posllh}")
+
+            if nav_sol.iTOW == nav_posllh.iTOW:
+                return NEO6M._fix_record(nav_sol, nav_posllh)
+
+        raise ubx.UBXError(f"NAV-SOL and NAV-POSLLH are of different epochs! iTOW: {nav_sol.iTOW}, {nav_posllh.iTOW}")
+
+    def get_latest_fix(self) -> tuple | None:
+        """Returns the fix record built from the newest streamed NAV-SOL and NAV-POSLLH without any UART transaction.
+
+        Both messages have to be enabled with '.start_streaming'. Returns None until both were recieved for the same epoch.
+        """
+        nav_sol = self.get_latest(ubx.UBXMessageTypes.NAV_SOL)
+        nav_posllh = self.get_latest(ubx.UBXMessageTypes.NAV_POSLLH)
+        if nav_sol is None or nav_posllh is None or nav_sol.iTOW != nav_posllh.iTOW:
+            return None
+        return NEO6M._fix_record(nav_sol, nav_posllh)
+
+    @staticmethod
+    def _fix_record(nav_sol: tuple, nav_posllh: tuple) -> tuple:
+        # Rotate the ECEF velocity of NAV-SOL into the local North-East-Down frame
+        lat = math.radians(nav_posllh.lat * 1e-7)
+        lon = math.radians(nav_posllh.lon * 1e-7)
+        sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+        sin_lon, cos_lon = math.sin(lon), math.cos(lon)
+        vel_x, vel_y, vel_z = nav_sol.ecefVX, nav_sol.ecefVY, nav_sol.ecefVZ
+
+        vel_n = -sin_lat * cos_lon * vel_x - sin_lat * sin_lon * vel_y + cos_lat * vel_z
+        vel_e = -sin_lon * vel_x + cos_lon * vel_y
+        vel_d = -cos_lat * cos_lon * vel_x - cos_lat * sin_lon * vel_y - sin_lat * vel_z
+
+        return NEO6M.FIX_RECORD(
+            nav_sol.week,
+            nav_sol.iTOW,
+            nav_sol.fTOW,
+            nav_sol.gpsFix,
+            nav_sol.flags,
+            nav_sol.numSV,
+            nav_posllh.lon,
+            nav_posllh.lat,
+            nav_posllh.height,
+            nav_posllh.hMSL,
+            nav_posllh.hAcc,
+            nav_posllh.vAcc,
+            round(vel_n),
+            round(vel_e),
+            round(vel_d),
+            round(math.sqrt(vel_n * vel_n + vel_e * vel_e)),
+            nav_sol.sAcc,
+            nav_sol.pDOP,
         )
 
-        response_bytes = response[0]
-        (
-            _,  # Header bytes
-            _,  # Message class and id bytes
-            _,  # Payload_length_bytes
-            payload_bytes,
-            _,  # Checksum bytes
-        ) = ubx.UBXMessage.split_message_bytes(response_bytes)
+    @staticmethod
+    def _is_fix(gps_fix: int) -> bool:
+        return gps_fix == 2 or gps_fix == 3 or gps_fix == 4
+
+    def has_fix(self) -> bool:
+        """Returns True if the module has a 2D/3D fix otherwise False"""
+        return NEO6M._is_fix(self.poll_nav_status().gpsFix)
+
+    def wait_for_fix(self, timeout_ms: int | None = None, poll_interval_ms: int = 100) -> tuple[int, int, int, int, int, int, int]:
+        """Polls NAV-STATUS until the module has a 2D/3D fix and records the time to first fix.
+
+        Args:
+            timeout_ms (int | None, optional): Maximum time to wait, waits forever if None. Defaults to None.
+            poll_interval_ms (int, optional): Time between polls. Defaults to 100.
 
-        assert struct.calcsize(payload_fields_fmt_str) == len(payload_bytes)
+        Raises:
+            ubx.UBXErrorTimeout: If there was no fix within 'timeout_ms'
 
-        return struct.unpack(payload_fields_fmt_str, payload_bytes)
+        Returns:
+            tuple[int, int, int, int, int, int, int]: NAV-STATUS payload of the first fix
+        """
+        start_time = time.ticks_ms()
+        while True:
+            nav_status = self.poll_nav_status()
+            if NEO6M._is_fix(nav_status.gpsFix):
+                self.ttff_ms = nav_status.ttff
+                self.logger.info(f"Time to first fix: {self.ttff_ms} ms, Aiding data: {self.aiding_source}")
+                return nav_status
+
+            if timeout_ms is not None and time.ticks_diff(time.ticks_ms(), start_time) >= timeout_ms:
+                raise ubx.UBXErrorTimeout(f"Timeout reached! No GPS fix after {timeout_ms} ms.")
+            time.sleep_ms(poll_interval_ms)
+
+    def _poll_messages(self, message_type: bytes, number_of_messages: int, callback, read_timeout_ms: int = 1_000) -> int:
+        """Polls a message that is answered with multiple messages, e.g AID-EPH, and passes each response to 'callback'.
+
+        'callback' is called without arguments while the response is held by the parser.
+
+        Returns:
+            int: Number of responses recieved
+        """
+        poll_message = self._frame_cache.get(message_type)
+        number_of_responses = 0
+
+        self._uart_busy += 1
+        try:
+            self._dispatch_messages()
+            self.UART.write(poll_message.message_bytes)
+
+            start_time = time.ticks_ms()
+            while number_of_responses < number_of_messages:
+                if time.ticks_diff(time.ticks_ms(), start_time) >= read_timeout_ms:
+                    break
+                if not self._parser.read(self.UART):
+                    continue
+
+                if self._parser.is_message_type(message_type):
+                    callback()
+                    number_of_responses += 1
+                    # Timeout is reset by every response
+                    start_time = time.ticks_ms()
+                else:
+                    self._dispatch_message()
+        finally:
+            self._uart_busy -= 1
+
+        return number_of_responses
+
+    def save_aiding_data(self, file_path: str) -> int:
+        """Saves the module's aiding data (AID-INI, AID-HUI, AID-EPH and AID-ALM) to a file, so it can be restored after power loss.
+
+        Messages are written as raw UBX frames. Ephemeris and almanac of satellites without valid data are skipped.
+        The file is replaced only if every poll was answered, otherwise the existing file is kept(ex: when saving after a
+        crash caused by an unresponsive module).
+
+        Args:
+            file_path (str): File to save the aiding data to
+
+        Returns:
+            int: Number of messages saved, 0 if the file wasn't replaced
+        """
+        temp_file_path = file_path + ".tmp"
+        number_of_messages = 0
+        is_complete = True
+
+        with open(temp_file_path, "wb") as aiding_file:
+
+            def save_message():
+                nonlocal number_of_messages
+                # AID-EPH/AID-ALM with only SV id and HOW word don't contain any data
+                if self._parser.payload_length > 8:
+                    aiding_file.write(self._parser.message_view)
+                    number_of_messages += 1
+
+            for message_type, number_of_responses in NEO6M.AIDING_MESSAGES:
+                if self._poll_messages(message_type, number_of_responses, save_message) != number_of_responses:
+                    self.logger.warning(f"Incomplete response to aiding data poll: {utils.bytes_to_hex_str(message_type)}")
+                    is_complete = False
+
+        if not is_complete or number_of_messages == 0:
+            os.remove(temp_file_path)
+            return 0
+
+        os.rename(temp_file_path, file_path)
+        return number_of_messages
+
+    def restore_aiding_data(self, file_path: str, force: bool = False) -> int:
+        """Sends aiding data saved by '.save_aiding_data' to the module.
+
+        Time of the saved AID-INI is stale, so it is marked invalid. The module uses its own time or time from the satellites instead.
+
+        Args:
+            file_path (str): File containing the aiding data
+            force (bool, optional): Restore even if the module already has a fix. Defaults to False.
+
+        Returns:
+            int: Number of messages sent
+        """
+        if not force:
+            # Module kept its aiding data, e.g only the board was reset
+            if self.has_fix():
+                return 0
+
+        try:
+            aiding_file = open(file_path, "rb")
+        except OSError:
+            return 0
+
+        # Separate parser, the module's parser may hold a partial frame
+        file_parser = ubx.UBXParser()
+        number_of_messages = 0
+
+        with aiding_file:
+            while file_parser.read(aiding_file):
+                if file_parser.is_message_type(ubx.UBXMessageTypes.AID_INI):
+                    self.UART.write(NEO6M._stale_aid_ini_frame(file_parser.payload))
+                else:
+                    self.UART.write(file_parser.message_view)
+                number_of_messages += 1
+
+        if file_parser.checksum_errors != 0:
+            self.logger.warning(f"Aiding data file is corrupted! Number of messages ignored: {file_parser.checksum_errors}")
+
+        if number_of_messages != 0:
+            self.aiding_source = "flash"
+        return number_of_messages
+
+    def inject_aiding_data(self, chunk: bytes) -> int:
+        """Sends the complete AID messages found in 'chunk' to the module, e.g an AssistNow Online file downloaded in chunks.
+
+        Frames split across chunks are completed by the next call. Messages of other classes are ignored.
+
+        Args:
+            chunk (bytes): Next part of the aiding data stream
+
+        Returns:
+            int: Number of messages sent
+        """
+        number_of_messages = 0
+        aiding_parser = self._aiding_parser
+        for _ in aiding_parser.frames(chunk):
+            if aiding_parser.message_class_id_bytes[0] == 0x0B:
+                self.UART.write(aiding_parser.message_view)
+                number_of_messages += 1
+
+        if number_of_messages != 0:
+            self.aiding_source = "network"
+        return number_of_messages
+
+    @staticmethod
+    def _stale_aid_ini_frame(payload: memoryview) -> memoryview:
+        """Clears the time valid and time pulse flags of an AID-INI payload, see Section 31.6.6 of mannual"""
+        payload = bytearray(payload)
+        (flags,) = struct.unpack_from("<L", payload, 44)
+        flags &= ~(0x02 | 0x08)
+        struct.pack_into("<L", payload, 44, flags)
+        return ubx.encode_frame(ubx.UBXMessageTypes.AID_INI, payload)
 
 
 if __name__ == "__main__":
@@ -672,32 +1389,28 @@ if __name__ == "__main__":
     # See Section 31.17 CFG-RATE for more information about UBX-CFG-RATE command
     # Poll the current navigation/measurement rate
     message_fmt_str = 3 * ubx.UBXDataTypes.U2
+    message_fmt = utils.compile_fmt(message_fmt_str)
     message = ubx.UBXMessage(ubx.UBXMessageTypes.CFG_RATE, "")
     response_status, response = gps_module.send_UBX_message(message)
     assert response_status == True
 
+    # Payload starts after header(2), message class/id(2) and payload length(2)
     response_bytes = response[0]
-    payload_bytes = ubx.UBXMessage.split_message_bytes(response_bytes)[-2]
-    meas_rate_bytes, nav_rate_bytes, time_ref_bytes = utils.split_bytes_fmt(
-        message_fmt_str, payload_bytes
-    )
-    meas_rate, nav_rate, time_ref = struct.unpack(message_fmt_str, payload_bytes)
+    meas_rate, nav_rate, time_ref = message_fmt.unpack_from(response_bytes, 6)
     print(f"Current mesurement rate: {meas_rate} ms", nav_rate, time_ref)
 
     # Set higher measurement rate, otherwise the module doesn't respond to multiple consecutive NAV messages quickly
     # This will increase power consumption
     new_meas_rate_ms = 100
-    new_meas_rate_ms_bytes = struct.pack(
-        ubx.UBXDataTypes.BIG_ENDIAN + ubx.UBXDataTypes.U2, new_meas_rate_ms
-    )
+    field_fmt = utils.compile_fmt(ubx.UBXDataTypes.BIG_ENDIAN + ubx.UBXDataTypes.U2)
     print(f"Setting mesurement rate to {new_meas_rate_ms} ms...")
 
     message = ubx.UBXMessage(
         ubx.UBXMessageTypes.CFG_RATE,
         message_fmt_str,
-        new_meas_rate_ms_bytes,
-        nav_rate_bytes,
-        time_ref_bytes,
+        field_fmt.pack(new_meas_rate_ms),
+        field_fmt.pack(nav_rate),
+        field_fmt.pack(time_ref),
     )
     response_status, response = gps_module.send_UBX_message(message)
     assert response_status == True
@@ -709,13 +1422,7 @@ if __name__ == "__main__":
     assert response_status == True
 
     response_bytes = response[0]
-    payload_bytes = ubx.UBXMessage.split_message_bytes(response_bytes)[-2]
-    meas_rate_bytes, nav_rate_bytes, time_ref_bytes = utils.split_bytes_fmt(
-        message_fmt_str, payload_bytes
-    )
-    (meas_rate,) = struct.unpack(
-        ubx.UBXDataTypes.LITTLE_ENDIAN + ubx.UBXDataTypes.U2, meas_rate_bytes
-    )
+    meas_rate = message_fmt.unpack_field_from(response_bytes, 0, 6)
     print(f"New mesurement rate: {meas_rate} ms")
 
     # Wait for GPS fix
@@ -1,3 +1,4 @@
+import os
 import time
 import json
 import machine
@@ -31,6 +32,52 @@ class SIM800L:
         460800,
     }
 
+    RX_BUFFER_SIZE = 512
+    """Size of the UART RX buffer, large enough to hold a HTTPREAD chunk while the previous chunk is processed"""
+
+    RESPONSE_BUFFER_SIZE = 1536
+    """Size of the response reader buffer, large enough to hold a line of 'AT+CIPRXGET=2,<SIM800L.MAX_RECIEVE_LENGTH>' data"""
+
+    URC_PREFIXES = (
+        "RDY",
+        "+CFUN:",
+        "+CPIN:",
+        "Call Ready",
+        "SMS Ready",
+        "+CREG:",
+        "+CIPRXGET: 1",
+        "CLOSED",
+        "+PDP: DEACT",
+        "+HTTPACTION:",
+        "RING",
+        "+CMTI:",
+        "UNDER-VOLTAGE",
+        "OVER-VOLTAGE",
+        "NORMAL POWER DOWN",
+    )
+    """Prefixes of URCs(Unsolicited Result Codes) routed to the URC handlers, see Section 18.3 of mannual"""
+
+    URC_QUEUE_SIZE = 16
+    """Number of URCs kept for '.wait_for_URC', oldest URC is dropped when the queue is full"""
+
+    HTTP_DATA_CHUNK_SIZE = 256
+    """Number of bytes of a request body written to the UART at a time, see '.HTTP_POST'"""
+
+    HTTP_DATA_MIN_TIME_MS = 1_000
+    """Time to input a request body on top of its transfer time at the baudrate, covers reading the body from a file or generator"""
+
+    HTTP_DATA_MAX_TIME_MS = 120_000
+    """Maximum time to input a request body, see AT+HTTPDATA in Section 16 of mannual"""
+
+    MAX_SEND_LENGTH = 1460
+    """Maximum number of bytes sent with a single AT+CIPSEND=<length>, see AT+CIPSEND? in Section 8 of mannual"""
+
+    MAX_RECIEVE_LENGTH = 1460
+    """Maximum number of bytes read with a single AT+CIPRXGET=2,<length>, see AT+CIPRXGET in Section 8 of mannual"""
+
+    PROMPT_STRS = ("> ",)
+    """Responses that aren't followed by a line delimiter, ex: prompt of AT+CIPSEND"""
+
     def __init__(
         self, 
         config: device_config.DeviceModuleUART,
@@ -50,18 +97,39 @@ class SIM800L:
         else:
             raise SIM800LError(f"Unsupported Baudrate: SIM800L doesn't support {self.module_UART_config.baudrate} baudrate! Supported baudrates: {SIM800L.SUPPORTED_BAUDRATE}")
 
-        self.UART = machine.UART(self.uart_id, self.baudrate, tx=self.TX_PIN, rx=self.RX_PIN)
+        self.UART = machine.UART(self.uart_id, self.baudrate, tx=self.TX_PIN, rx=self.RX_PIN, rxbuf=SIM800L.RX_BUFFER_SIZE)
 
         self._echo_mode = True
         self._line_delimiter_bytes = b"\r\n"
-        self._rx_buffer = b""
+        self._rx_reader = at.ATResponseReader(SIM800L.RESPONSE_BUFFER_SIZE)
+
+        # Command waiting for its response, lines recieved from the module are routed to it or to the URC handlers
+        self._pending_command: at.ATCommand | None = None
+        self._pending_lines: list[str] = []
+        self._pending_started = False
+        self._pending_done = False
+        # Final result code of a failed command, see at.ERROR_END_STRS
+        self._pending_error: str | None = None
+
+        # URCs not yet consumed by '.wait_for_URC' and callbacks by URC prefix
+        self._URC_queue: list[str] = []
+        self._URC_callbacks: dict[str, list] = {}
 
         self._GPRS_context_status: None | int = None
         self._HTTP_session_status: None | bool = None
+        # HTTP parameters set in the current HTTP session, see '._HTTP_set_parameters'
+        self._HTTP_parameters: dict[str, str] = {}
         self._TCP_connection_status: None | bool = None
+        # Bytes left in the module after the last AT+CIPRXGET=2, no +CIPRXGET: 1 URC is sent for them(TCP or UDP)
+        self._CIPRXGET_pending_length = 0
         self._UDP_connection_status: None | bool = None
 
     def reset_module(self) -> None:
+        # Bytes and URCs recieved before the reset are stale
+        self._rx_reader.clear()
+        self._URC_queue = []
+        self._HTTP_parameters = {}
+
         self.RST_PIN.low()
         time.sleep_ms(200)  # Minimum delay 105 ms
         self.RST_PIN.high()
@@ -74,64 +142,303 @@ class SIM800L:
         supress_warning: bool = False,
     ) -> list[str]:
 
+        # Route lines recieved before the command, such as URCs, so they are not mistaken for its response
+        self._read_lines(supress_warning)
+
         self.UART.write(f"{at_command.formatted_command_str}\n")
         self.UART.flush()
+        return self._read_response(at_command, read_timeout_ms, supress_warning)
 
-        rx_buffer = self._rx_buffer
-        unexpected_bytes = b""
-        start_bytes = self._line_delimiter_bytes
-        if self._echo_mode:
-            start_bytes = (
-                at_command.formatted_command_str.encode("ascii")
-                + self._line_delimiter_bytes
-            )
-        end_bytes = at_command.expected_end_str.encode("ascii")
+    def send_AT_commands(
+        self,
+        at_commands: list[at.ATCommand],
+        read_timeout_ms: int = 1_000,
+        supress_warning: bool = False,
+    ) -> list[list[str]]:
+        """
+        Sends 'at_commands' in as few round trips as possible and returns the response of each command\n
+        Consecutive commands are concatenated into a single command line where the syntax permits, see at.group_AT_commands.\n
+        Command lines are pipelined: the next command lines are written without waiting for the result of the previous\n
+        command line, as long as the command lines waiting for a result fit in the command line buffer of the module.\n
+        Responses are in the same format as the responses of '.send_AT_command'.\n
+        'read_timeout_ms' applies to every command line.\n
+        Raises at.ATCommandErrorResponse of the first failed command line after the results of the command lines\n
+        already written are read, command lines that are not yet written are not sent.\n
+        """
+
+        groups = at.group_AT_commands(at_commands)
+        command_lines = [at.concatenate_AT_commands(group) for group in groups]
+
+        # Route lines recieved before the commands, such as URCs, so they are not mistaken for their responses
+        self._read_lines(supress_warning)
+
+        responses = []
+        error = None
+        write_index = 0
+        written_length = 0
+        for index, command_line in enumerate(command_lines):
+            if error is None:
+                while write_index < len(command_lines):
+                    line_length = len(command_lines[write_index].formatted_command_str) + 1
+                    if write_index != index and written_length + line_length > at.MAX_COMMAND_LINE_LENGTH:
+                        break
+                    self.UART.write(f"{command_lines[write_index].formatted_command_str}\n")
+                    written_length += line_length
+                    write_index += 1
+                self.UART.flush()
+            elif index == write_index:
+                break
+
+            try:
+                response = self._read_response(command_line, read_timeout_ms, supress_warning)
+            except at.ATCommandErrorResponse as response_error:
+                if error is None:
+                    error = response_error
+                response = None
+            written_length -= len(command_line.formatted_command_str) + 1
+
+            if response is not None:
+                self._update_echo_mode(groups[index])
+                responses += self._split_response(groups[index], command_line, response)
+
+        if error is not None:
+            raise error
+        return responses
+
+    def _split_response(
+        self,
+        at_commands: list[at.ATCommand],
+        command_line: at.ATCommand,
+        response: list[str],
+    ) -> list[list[str]]:
+        """Maps the response of a concatenated command line back to its commands, see at.concatenate_AT_commands"""
+
+        if len(at_commands) == 1:
+            return [response]
+
+        # Echo and final result code are shared by the commands
+        is_echoed = response[0] == command_line.formatted_command_str
+        responses = []
+        for at_command in at_commands:
+            responses.append([at_command.formatted_command_str] if is_echoed else [])
+
+        for line in response[1 if is_echoed else 0 : -1]:
+            response_index = None
+            for index, at_command in enumerate(at_commands):
+                if at_command.response_prefix == "":
+                    if response_index is None:
+                        response_index = index
+                elif line.startswith(at_command.response_prefix):
+                    response_index = index
+                    break
+            responses[response_index if response_index is not None else 0].append(line)
+
+        for command_response in responses:
+            command_response.append(response[-1])
+        return responses
+
+    def _update_echo_mode(self, at_commands: list[at.ATCommand]) -> None:
+        for at_command in at_commands:
+            if at_command.formatted_command_str == "ATE0":
+                self._echo_mode = False
+            elif at_command.formatted_command_str == "ATE1":
+                self._echo_mode = True
+
+    def _read_response(
+        self,
+        at_command: at.ATCommand,
+        read_timeout_ms: int,
+        supress_warning: bool,
+        is_echoed: bool | None = None,
+    ) -> list[str]:
+        """Reads the response of 'at_command' that has already been written, 'is_echoed' defaults to the echo mode"""
+
+        if is_echoed is None:
+            is_echoed = self._echo_mode
+
+        self._pending_command = at_command
+        self._pending_lines = []
+        # Response starts after the echo of the command
+        self._pending_started = not is_echoed
+        self._pending_done = False
+        self._pending_error = None
+        try:
+            start_time = time.ticks_ms()
+            while time.ticks_diff(time.ticks_ms(), start_time) < read_timeout_ms:
+                self._read_lines(supress_warning)
+                if self._pending_done:
+                    # Fail fast instead of waiting for the timeout
+                    if self._pending_error is not None:
+                        raise at.ATCommandErrorResponse(self._pending_error, self._pending_lines)
+                    return self._pending_lines
+            raise at.ATCommandErrorTimeout(f"Timeout reached! Expected end string({at_command.expected_end_str}) not recieved. Recieved Lines: {self._pending_lines}, Recieved Bytes: {bytes(self._rx_reader.peek())}")
+        finally:
+            self._pending_command = None
+
+    def _read_lines(self, supress_warning: bool = False) -> None:
+        """Reads recieved bytes and routes every complete line to the pending command or the URC handlers"""
+        self._rx_reader.fill(self.UART)
+
+        line_bytes = self._rx_reader.read_line()
+        while line_bytes is not None:
+            if len(line_bytes) != 0:
+                self._route_line(line_bytes, supress_warning)
+                # Lines after the response belong to the next pipelined command
+                if self._pending_command is not None and self._pending_done:
+                    return
+            line_bytes = self._rx_reader.read_line()
+
+        # Prompts are not followed by a line delimiter
+        command = self._pending_command
+        if (
+            command is not None
+            and self._pending_started
+            and not self._pending_done
+            and command.expected_end_str in SIM800L.PROMPT_STRS
+        ):
+            if self._rx_reader.consume_prefix(command.expected_end_str.encode("ascii")):
+                self._pending_lines.append(command.expected_end_str)
+                self._pending_done = True
+
+    def _route_line(self, line_bytes: memoryview, supress_warning: bool) -> None:
+        try:
+            line = str(line_bytes, "utf-8")
+        except UnicodeError:
+            if not supress_warning:
+                self.logger.warning(f"Read undecodable line; ignoring it. Bytes ignored: {bytes(line_bytes)}")
+            return
+
+        URC_prefix_length = self._URC_prefix_length(line)
+
+        command = self._pending_command
+        if command is not None and not self._pending_done:
+            if self._pending_started:
+                if line.startswith(command.expected_end_str):
+                    self._pending_lines.append(line)
+                    self._pending_done = True
+                    return
+
+                if command.is_error_end(line):
+                    self._pending_lines.append(line)
+                    self._pending_error = line
+                    self._pending_done = True
+                    return
+
+                # Information responses can look like URCs(ex: +CREG: 0,1), unless the URC prefix is more specific(ex: +CIPRXGET: 1)
+                response_prefix_length = 0
+                for response_prefix in command.response_prefixes:
+                    if line.startswith(response_prefix) and len(response_prefix) > response_prefix_length:
+                        response_prefix_length = len(response_prefix)
+
+                if response_prefix_length != 0:
+                    if URC_prefix_length <= response_prefix_length:
+                        self._pending_lines.append(line)
+                        return
+
+                elif URC_prefix_length == 0:
+                    self._pending_lines.append(line)
+                    return
+
+            elif line == command.formatted_command_str:
+                # Echo is kept in the response
+                self._pending_lines.append(line)
+                self._pending_started = True
+                return
+
+        if URC_prefix_length != 0:
+            self._dispatch_URC(line)
+        elif not supress_warning:
+            self.logger.warning(f"Read unexpected line; ignoring it. Line ignored: {line}")
+
+    @staticmethod
+    def _starts_with_any(line: str, prefixes: tuple[str, ...]) -> bool:
+        for prefix in prefixes:
+            if line.startswith(prefix):
+                return True
+        return False
+
+    def _URC_prefix_length(self, line: str) -> int:
+        """Returns the length of the longest URC prefix 'line' starts with, 0 if it isn't a URC"""
+        prefix_length = 0
+        for prefixes in (SIM800L.URC_PREFIXES, self._URC_callbacks):
+            for prefix in prefixes:
+                if len(prefix) > prefix_length and line.startswith(prefix):
+                    prefix_length = len(prefix)
+        return prefix_length
+
+    def _dispatch_URC(self, line: str) -> None:
+        """Updates the connection state, queues the URC and passes it to the subscribed callbacks"""
+        if line.startswith("CLOSED"):
+            self._TCP_connection_status = False
+            self._UDP_connection_status = False
+            self._CIPRXGET_pending_length = 0
+        elif line.startswith("+PDP: DEACT"):
+            self._GPRS_context_status = 0
+            self._TCP_connection_status = False
+            self._UDP_connection_status = False
+        elif (
+            line.startswith("UNDER-VOLTAGE")
+            or line.startswith("OVER-VOLTAGE")
+            or line.startswith("NORMAL POWER DOWN")
+        ):
+            self.logger.warning(f"SIM module: {line}")
+
+        self._URC_queue.append(line)
+        if len(self._URC_queue) > SIM800L.URC_QUEUE_SIZE:
+            self._URC_queue.pop(0)
+
+        for prefix, callbacks in self._URC_callbacks.items():
+            if line.startswith(prefix):
+                for callback in callbacks:
+                    callback(line)
+
+    def subscribe_URC(self, urc_prefix: str, callback) -> None:
+        """Registers 'callback(urc_line)' to be called for every recieved URC starting with 'urc_prefix'.
+
+        'urc_prefix' doesn't have to be in 'SIM800L.URC_PREFIXES', lines starting with it are treated as URCs.
+        """
+        self._URC_callbacks.setdefault(urc_prefix, []).append(callback)
+
+    def unsubscribe_URC(self, urc_prefix: str, callback) -> None:
+        callbacks = self._URC_callbacks.get(urc_prefix, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if len(callbacks) == 0:
+            self._URC_callbacks.pop(urc_prefix, None)
+
+    def process_URCs(self) -> int:
+        """Reads all recieved lines and dispatches URCs to the subscribed callbacks.
+
+        Call it periodically from the main loop when the module is idle.
+
+        Returns:
+            int: Number of URCs waiting in the queue
+        """
+        self._read_lines()
+        return len(self._URC_queue)
+
+    def wait_for_URC(self, urc_prefixes: str | tuple[str, ...], read_timeout_ms: int = 1_000) -> str:
+        """Removes and returns the oldest URC starting with any of 'urc_prefixes', waits for it if it wasn't recieved yet.
+
+        Raises:
+            at.ATCommandErrorTimeout: If the URC isn't recieved within 'read_timeout_ms'
+        """
+        if type(urc_prefixes) == str:
+            urc_prefixes = (urc_prefixes,)
 
         start_time = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), start_time) < read_timeout_ms:
-            if self.UART.any():
-                rx_buffer += self.UART.read()
-
-            if len(rx_buffer) >= len(start_bytes + end_bytes):
-                start_bytes_index = rx_buffer.find(start_bytes)
-
-                # If expected start bytes are found
-                if start_bytes_index != -1:
-                    # Ignore any bytes before expected start bytes
-                    if start_bytes_index != 0:
-                        ignored_bytes = rx_buffer[:start_bytes_index]
-                        unexpected_bytes += ignored_bytes
-                        if not supress_warning:
-                            self.logger.warning(f"Expected start bytes({start_bytes}), read unexpected bytes; ignoring them. Bytes ignored: {ignored_bytes}")
-                        rx_buffer = rx_buffer[start_bytes_index:]
-                        start_bytes_index = 0
-
-                    # Module's reponse should be between start_bytes and end_bytes
-                    end_bytes_index = rx_buffer.find(end_bytes)
-                    if end_bytes_index != -1:
-                        # Find the index of delimiter which immediately follows end bytes
-                        end_dilimiter_index = rx_buffer.find(self._line_delimiter_bytes, end_bytes_index)
-                        response_end_index = end_dilimiter_index + len(self._line_delimiter_bytes)
-                        response_bytes = rx_buffer[start_bytes_index:response_end_index]
-
-                        # Remove parsed bytes from the buffer
-                        rx_buffer = rx_buffer[response_end_index:]
-
-                        if len(rx_buffer) != 0:
-                            unexpected_bytes += rx_buffer
-                            self._rx_buffer = unexpected_bytes
-                            if not supress_warning:
-                                self.logger.warning(f"Incomplete parse: {self._rx_buffer}")
-                        else:
-                            self._rx_buffer = b""
-
-                        output_lines = []
-                        for line_bytes in response_bytes.split(self._line_delimiter_bytes):
-                            if line_bytes != b"":
-                                output_lines.append(line_bytes.decode())
-
-                        return output_lines
-        raise at.ATCommandErrorTimeout(f"Timeout reached! Expected end string({at_command.expected_end_str}) not recieved. Recieved Bytes: {rx_buffer}")
+        while True:
+            for index, line in enumerate(self._URC_queue):
+                if SIM800L._starts_with_any(line, urc_prefixes):
+                    return self._URC_queue.pop(index)
+
+            if time.ticks_diff(time.ticks_ms(), start_time) >= read_timeout_ms:
+                raise at.ATCommandErrorTimeout(f"Timeout reached! Expected URC({urc_prefixes}) not recieved. Recieved URCs: {self._URC_queue}")
+            self._read_lines()
+
+    def _discard_URCs(self, urc_prefix: str) -> None:
+        """Removes stale URCs, ex: a response to a request that timed out"""
+        self._URC_queue = [line for line in self._URC_queue if not line.startswith(urc_prefix)]
 
     def init_module(self, echo_mode: bool = False) -> None:
         """
@@ -150,25 +457,25 @@ class SIM800L:
         # See Section 18.3 Summary of Unsolicited Result Codes for the full list of URCs
 
         # Handling URCs generated at startup/reset
-        # Expected URCs(in order): RDY, +CFUN: 1, +CPIN: READY, Call Ready, SMS Ready
+        # Expected URCs: RDY, +CFUN: 1, +CPIN: READY, Call Ready, SMS Ready
+        # URCs recieved before the 'AT' command are already queued
         EXPECTED_URCs = ("RDY", "+CFUN: 1", "+CPIN: READY", "Call Ready", "SMS Ready")
         try:
             for urc in EXPECTED_URCs:
-                at_command = at.ATCommand("", expected_end_str=urc)
-                # supress_warning=True is a hack
-                self.send_AT_command(
-                    at_command, read_timeout_ms=3_000, supress_warning=True
-                )
+                self.wait_for_URC(urc, read_timeout_ms=3_000)
         except at.ATCommandErrorTimeout as error:
             raise SIM800LError(f"SIM module initialization failed! {error}")
 
+        at_commands = []
+
         # Echo mode is enabled by default
         if echo_mode == False:
-            self.send_AT_command(at.ATCommand("ATE0"))
-            self._echo_mode = False
+            at_commands.append(at.ATCommand("ATE0"))
 
         # Enable Mobile Equipment(ME) verbose error reporting
-        self.send_AT_command(at.ATCommand("AT+CMEE=2"))
+        at_commands.append(at.ATCommand("AT+CMEE=2"))
+
+        self.send_AT_commands(at_commands)
 
     def get_sim_status(self) -> bool:
         """
@@ -236,18 +543,21 @@ class SIM800L:
         if self._GPRS_context_status is None or self._GPRS_context_status == 0:
 
             # Set connection type to GPRS
-            self.send_AT_command(at.ATCommand('"AT+SAPBR=3,1,"Contype","GPRS"'))
+            at_commands = [at.ATCommand('AT+SAPBR=3,1,"Contype","GPRS"')]
 
             # Set APN, username and password
-            self.send_AT_command(at.ATCommand(f'AT+SAPBR=3,1,"APN", "{apn}"'))
+            at_commands.append(at.ATCommand(f'AT+SAPBR=3,1,"APN", "{apn}"'))
             if user_name != "":
-                self.send_AT_command(at.ATCommand(f"AT+SAPBR=3,1,USER,{user_name}"))
+                at_commands.append(at.ATCommand(f"AT+SAPBR=3,1,USER,{user_name}"))
             if password != "":
-                self.send_AT_command(at.ATCommand(f"AT+SAPBR=3,1,PWD, {password}"))
+                at_commands.append(at.ATCommand(f"AT+SAPBR=3,1,PWD, {password}"))
 
             # Open GPRS context
             # This sometimes takes longer than usual and cause timeout exception to be raised.
-            self.send_AT_command(at.ATCommand("AT+SAPBR=1,1"), read_timeout_ms=30_000)
+            at_commands.append(at.ATCommand("AT+SAPBR=1,1"))
+
+            # Settings and open are sent as a single command line
+            self.send_AT_commands(at_commands, read_timeout_ms=30_000)
 
             # Wait untill module gets assigned a local IP address
             while True:
@@ -282,24 +592,26 @@ class SIM800L:
 
         if self._HTTP_session_status is None or self._GPRS_context_status == 0:
 
-            # Init HTTP session
-            self.send_AT_command(at.ATCommand("AT+HTTPINIT"))
+            # Init HTTP session, parameters of an earlier session are reset
+            at_commands = [at.ATCommand("AT+HTTPINIT")]
+            self._HTTP_parameters = {}
 
             # Set parameters for HTTP session
-            self.send_AT_command(at.ATCommand('AT+HTTPPARA="CID",1'))
+            parameters = {"CID": "1"}
 
             # Enable auto following of redirect request
             if enable_redirects == True:
-                self.send_AT_command(at.ATCommand('AT+HTTPPARA="REDIR",1'))
+                parameters["REDIR"] = "1"
 
             # Enable SSL
             if enable_ssl == True:
-                self.send_AT_command(at.ATCommand("AT+HTTPSSL=1"))
+                at_commands.append(at.ATCommand("AT+HTTPSSL=1"))
 
             # Set timeout
-            self.send_AT_command(
-                at.ATCommand(f'AT+HTTPPARA="TIMEOUT",{request_timeout_sec}')
-            )
+            parameters["TIMEOUT"] = f"{request_timeout_sec}"
+
+            # Init and parameters are sent as a single command line
+            self._HTTP_set_parameters(parameters, at_commands)
 
             self._HTTP_session_status = True
         else:
@@ -312,6 +624,7 @@ class SIM800L:
         if self._HTTP_session_status:
             self.send_AT_command(at.ATCommand("AT+HTTPTERM"))
             self._HTTP_session_status = False
+            self._HTTP_parameters = {}
         else:
             self.logger.warning("HTTP session is already closed.")
 
@@ -327,59 +640,191 @@ class SIM800L:
             raise SIM800LError("HTTP session is NOT open. Open HTTP session with '.HTTP_session_open' method before calling this method.")
 
         # Set URL
-        self.send_AT_command(at.ATCommand(f'AT+HTTPPARA="URL","{url}"'))
+        self._HTTP_set_parameters({"URL": f'"{url}"'})
 
         # Make GET request
-        module_response = self.send_AT_command(
-            at.ATCommand("AT+HTTPACTION=0", expected_end_str="+HTTPACTION"),
-            read_timeout_ms=30_000,
-        )
-        _, http_response_code, http_response_length = (
-            module_response[-1].split(":")[-1].split(",")
-        )
-
-        # Check response code
-        if http_response_code.startswith("4") or http_response_code.startswith("5"):
-            raise at.HTTPError(http_response_code)
-
-        if http_response_code.startswith("6"):
-            raise at.HTTPError(
-                http_response_code,
-                "6XX netowork errors usually means SIM has a expired data plan",
-            )
+        http_response_code, http_response_length = self._HTTP_action(0)
 
         # Read response
-        module_response = self.send_AT_command(at.ATCommand("AT+HTTPREAD"))
-        _, http_response, _ = module_response
+        http_response = self._HTTP_read_response(http_response_length)
 
         return http_response_code, http_response
 
-    def HTTP_POST(
-        self, url: str, data: str, header_content_type="text/plain"
-    ) -> tuple[str, str]:
+    def HTTP_GET_chunks(self, url: str, chunk_size: int = 256):
         """
-        Make a GET request to a given URL and return response code, response\n
+        Make a GET request to a given URL and yield the response in chunks of at most 'chunk_size' bytes.\n
+        Response is read with ranged HTTPREAD commands and is binary safe, see '._HTTP_read_chunks'.\n
+        Yielded chunk is only valid until the next iteration.\n
+        If the iteration is stopped early(break, exception), call '.close()' on the generator in a finally block:\n
+        MicroPython doesn't finalize abandoned generators, so the pipelined HTTPREAD response would be left unread.\n
         """
 
-        self.send_AT_command(at.ATCommand(f'AT+HTTPPARA="URL","{url}"'))
+        if not self._HTTP_session_status:
+            raise SIM800LError("HTTP session is NOT open. Open HTTP session with '.HTTP_session_open' method before calling this method.")
+
+        # Set URL
+        self._HTTP_set_parameters({"URL": f'"{url}"'})
 
-        self.send_AT_command(at.ATCommand(f'AT+HTTPPARA="CONTENT","{header_content_type}"'))
+        # Make GET request
+        _, http_response_length = self._HTTP_action(0)
 
-        # Set size of data(in bytes) to be send
-        # and set maximum timeout(in milliseconds) to send the data to 1_000ms
-        self.send_AT_command(at.ATCommand(f"AT+HTTPDATA={len(data)}, 1000", expected_end_str="DOWNLOAD"))
+        chunks = self._HTTP_read_chunks(http_response_length, chunk_size)
+        try:
+            yield from chunks
+        finally:
+            chunks.close()
 
-        # Send the data packet
-        self.send_AT_command(at.ATCommand(data))
+    def HTTP_GET_into(self, url: str, destination, chunk_size: int = 256) -> tuple[str, int]:
+        """
+        Make a GET request to a given URL, stream the response to 'destination' and return response code, response length\n
+        'destination' can be a callback called with each chunk, a file opened in binary mode or the path of a file to write.\n
+        Only a chunk of at most 'chunk_size' bytes is held in RAM, so the response can be larger than the free heap.\n
+        Chunk passed to a callback is only valid until the callback returns.\n
+        A file path is written through a temporary file, which replaces the file only if the whole response was read.\n
+        """
 
-        # Make POST request
-        module_response = self.send_AT_command(
-            at.ATCommand("AT+HTTPACTION=1", expected_end_str="+HTTPACTION"),
-            read_timeout_ms=30_000,
-        )
+        if not self._HTTP_session_status:
+            raise SIM800LError("HTTP session is NOT open. Open HTTP session with '.HTTP_session_open' method before calling this method.")
+
+        if isinstance(destination, str):
+            temp_file_path = destination + ".tmp"
+            try:
+                with open(temp_file_path, "wb") as file:
+                    http_response = self.HTTP_GET_into(url, file, chunk_size)
+            except Exception:
+                try:
+                    os.remove(temp_file_path)
+                except OSError:
+                    # Temporary file wasn't created
+                    pass
+                raise
+            os.rename(temp_file_path, destination)
+            return http_response
+
+        if hasattr(destination, "write"):
+            write = destination.write
+        elif callable(destination):
+            write = destination
+        else:
+            raise TypeError("'destination' must be a callback, a file or a file path")
+
+        # Set URL
+        self._HTTP_set_parameters({"URL": f'"{url}"'})
 
+        # Make GET request
+        http_response_code, http_response_length = self._HTTP_action(0)
+
+        chunks = self._HTTP_read_chunks(http_response_length, chunk_size)
+        try:
+            for chunk in chunks:
+                write(chunk)
+        finally:
+            chunks.close()
+
+        return http_response_code, http_response_length
+
+    def _HTTP_read_response(self, http_response_length: int) -> str:
+        """Read the response of the last HTTP request with ranged HTTPREAD commands and return it as a string"""
+
+        http_response = bytearray(http_response_length)
+        read_index = 0
+        chunks = self._HTTP_read_chunks(http_response_length, SIM800L.RX_BUFFER_SIZE - 32)
+        try:
+            for chunk in chunks:
+                http_response[read_index : read_index + len(chunk)] = chunk
+                read_index += len(chunk)
+        finally:
+            chunks.close()
+        return str(http_response, "utf-8")
+
+    def _HTTP_read_chunks(self, http_response_length: int, chunk_size: int):
+        """
+        Yield the response of the last HTTP request in chunks of at most 'chunk_size' bytes.\n
+        Chunks are read with AT+HTTPREAD=<start>,<length> and framed by their length, so the response is binary safe.\n
+        The next chunk is requested before the current chunk is yielded, so the module sends it while the caller\n
+        processes the current one. Yielded chunk is only valid until the next iteration.\n
+        If the generator is closed early, the requested chunk is read and discarded, so its OK doesn't end the response\n
+        of the next command. Callers must close it explicitly, MicroPython doesn't finalize abandoned generators.\n
+        """
+
+        if chunk_size > SIM800L.RX_BUFFER_SIZE - 32:
+            raise ValueError(f"Chunk size must leave room for the HTTPREAD header in the RX buffer({SIM800L.RX_BUFFER_SIZE} bytes)")
+
+        chunk = bytearray(chunk_size)
+        chunk_mv = memoryview(chunk)
+        read_index = 0
+        if http_response_length == 0:
+            return
+
+        self._HTTP_read_request(read_index, min(chunk_size, http_response_length))
+        is_read_pending = True
+        try:
+            while read_index < http_response_length:
+                is_read_pending = False
+                chunk_length = self._HTTP_read_response_into(chunk)
+                if chunk_length == 0:
+                    raise SIM800LError(f"HTTPREAD returned no data at offset {read_index} of {http_response_length}")
+                read_index += chunk_length
+
+                # Module sends the next chunk while the current chunk is processed
+                if read_index < http_response_length:
+                    self._HTTP_read_request(read_index, min(chunk_size, http_response_length - read_index))
+                    is_read_pending = True
+
+                yield chunk_mv[:chunk_length]
+        finally:
+            if is_read_pending:
+                try:
+                    self._HTTP_read_response_into(chunk)
+                except (SIM800LError, at.ATCommandError):
+                    self.logger.warning("Unable to read the HTTPREAD response of an unfinished read.")
+
+    def _HTTP_set_parameters(
+        self,
+        parameters: dict[str, str],
+        at_commands: list[at.ATCommand] | None = None,
+    ) -> None:
+        """
+        Sets HTTP parameters with AT+HTTPPARA, parameters already set to the same value in the HTTP session are not sent again\n
+        Values are sent as they are, string values must be quoted, ex: {"URL": '"http://example.com"'}\n
+        'at_commands' are sent before the parameters in the same batch, see '.send_AT_commands'\n
+        """
+
+        if at_commands is None:
+            at_commands = []
+
+        changed_parameters = {}
+        for name, value in parameters.items():
+            if self._HTTP_parameters.get(name) != value:
+                changed_parameters[name] = value
+                at_commands.append(at.ATCommand(f'AT+HTTPPARA="{name}",{value}'))
+
+        if len(at_commands) == 0:
+            return
+
+        try:
+            self.send_AT_commands(at_commands)
+        except at.ATCommandError:
+            # Parameters may or may not have been set
+            for name in changed_parameters:
+                self._HTTP_parameters.pop(name, None)
+            raise
+        self._HTTP_parameters.update(changed_parameters)
+
+    def _HTTP_action(self, method: int, read_timeout_ms: int = 30_000) -> tuple[str, int]:
+        """
+        Make a HTTP request with the URL set in the HTTP parameters and return response code, response length\n
+        Method: 0 = GET, 1 = POST, 2 = HEAD\n
+        """
+
+        # Result of an earlier request that timed out
+        self._discard_URCs("+HTTPACTION:")
+
+        # Result of the request is sent as a URC after OK
+        self.send_AT_command(at.ATCommand(f"AT+HTTPACTION={method}"))
+        http_action_urc = self.wait_for_URC("+HTTPACTION:", read_timeout_ms)
         _, http_response_code, http_response_length = (
-            module_response[-1].split(":")[-1].split(",")
+            http_action_urc.split(":")[-1].strip().split(",")
         )
 
         # Check response code
@@ -392,12 +837,183 @@ class SIM800L:
                 "6XX netowork errors usually means SIM has a expired data plan",
             )
 
+        return http_response_code, int(http_response_length)
+
+    def _HTTP_read_request(self, start_index: int, length: int) -> None:
+        self.UART.write(f"AT+HTTPREAD={start_index},{length}\n")
+
+    def _HTTP_read_response_into(self, buffer: bytearray, read_timeout_ms: int = 5_000) -> int:
+        """
+        Read the response to 'AT+HTTPREAD=<start>,<length>' into 'buffer' and return the number of data bytes\n
+        Response: +HTTPREAD: <length>\\r\\n<data>\\r\\nOK\\r\\n\n
+        """
+
+        (data_length,) = self._read_framed_data_into(b"+HTTPREAD: ", 0, buffer, read_timeout_ms)
+        return data_length
+
+    def _read_framed_data_into(
+        self,
+        header_bytes: bytes,
+        length_field_index: int,
+        buffer: bytearray,
+        read_timeout_ms: int = 5_000,
+    ) -> list[int]:
+        """
+        Read a response of binary data framed by its length into 'buffer' and return the fields of the header\n
+        Response: <header_bytes><field>,<field>...\\r\\n<data>\\r\\nOK\\r\\n, length of data is the field at 'length_field_index'\n
+        """
+
+        end_bytes = self._line_delimiter_bytes + b"OK" + self._line_delimiter_bytes
+        buffer_mv = memoryview(buffer)
+        data_length = None
+        data_index = 0
+        header_fields = []
+
+        start_time = time.ticks_ms()
+        while time.ticks_diff(time.ticks_ms(), start_time) < read_timeout_ms:
+            # Echo is ignored, URCs recieved before the header are routed to the URC handlers
+            if data_length is None:
+                self._rx_reader.fill(self.UART)
+                line_bytes = self._rx_reader.read_line()
+                while line_bytes is not None:
+                    if bytes(line_bytes[: len(header_bytes)]) == header_bytes:
+                        for field in str(line_bytes[len(header_bytes) :], "utf-8").split(","):
+                            header_fields.append(int(field))
+                        data_length = header_fields[length_field_index]
+                        if data_length > len(buffer):
+                            raise SIM800LError(f"Module returned more data({data_length} bytes) than the buffer can hold({len(buffer)} bytes)")
+                        break
+                    if bytes(line_bytes[:5]) == b"ERROR" or bytes(line_bytes[:11]) == b"+CME ERROR:":
+                        raise at.ATCommandErrorResponse(str(line_bytes, "utf-8"))
+                    if len(line_bytes) != 0:
+                        self._route_line(line_bytes, supress_warning=True)
+                    line_bytes = self._rx_reader.read_line()
+                continue
+
+            # Data is binary, only its length marks its end
+            if data_index < data_length:
+                data_index += self._rx_reader.read_into(self.UART, buffer_mv[data_index:data_length])
+                continue
+
+            self._rx_reader.fill(self.UART)
+            if len(self._rx_reader) >= len(end_bytes):
+                if not self._rx_reader.consume_prefix(end_bytes):
+                    raise SIM800LError(f"Unexpected end of {header_bytes} response: {bytes(self._rx_reader.peek())}")
+                return header_fields
+
+        raise at.ATCommandErrorTimeout(f"Timeout reached! {header_bytes} response not recieved. Recieved {data_index} of {data_length} data bytes, Recieved Bytes: {bytes(self._rx_reader.peek())}")
+
+    def HTTP_POST(
+        self,
+        url: str,
+        data,
+        header_content_type="text/plain",
+        read_response: bool = True,
+        data_length: int | None = None,
+    ) -> tuple[str, str]:
+        """
+        Make a POST request to a given URL and return response code, response\n
+        'data' can be a str, bytes, bytearray, memoryview, a file opened in binary mode or an iterable(ex: generator)\n
+        of bytes-like objects. Files and iterables are streamed, see '._HTTP_data'.\n
+        'data_length' is required for iterables, for files it defaults to the size of the rest of the file.\n
+        If 'read_response' is False, response isn't read from the module and an empty string is returned instead,\n
+        use it when only the response code is needed.\n
+        """
+
+        # URL and content type are only sent when they differ from the previous request
+        self._HTTP_set_parameters({"URL": f'"{url}"', "CONTENT": f'"{header_content_type}"'})
+
+        # Send the data packet
+        self._HTTP_data(data, data_length)
+
+        # Make POST request
+        http_response_code, http_response_length = self._HTTP_action(1)
+        if not read_response:
+            return http_response_code, ""
+
         # Read response
-        module_response = self.send_AT_command(at.ATCommand("AT+HTTPREAD"))
-        _, http_response, _ = module_response
+        http_response = self._HTTP_read_response(http_response_length)
 
         return http_response_code, http_response
 
+    def _HTTP_data(self, data, data_length: int | None = None) -> None:
+        """
+        Uploads the request body with AT+HTTPDATA, see '.HTTP_POST' for the supported types of 'data'\n
+        Body is written to the UART in chunks of at most SIM800L.HTTP_DATA_CHUNK_SIZE bytes, each chunk is flushed before\n
+        the next one is read, so the body is never held in RAM as a whole and the UART TX buffer can't overflow.\n
+        An empty body is uploaded too, otherwise the module would send the body of the previous request.\n
+        """
+
+        chunk_size = SIM800L.HTTP_DATA_CHUNK_SIZE
+        if isinstance(data, str):
+            data = data.encode()
+
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data_length = len(data)
+            chunks = (data,)
+        elif hasattr(data, "readinto"):
+            if data_length is None:
+                position = data.tell()
+                data_length = data.seek(0, 2) - position
+                data.seek(position)
+            chunks = self._file_chunks(data, data_length, chunk_size)
+        else:
+            if data_length is None:
+                raise ValueError("'data_length' is required when 'data' is an iterable")
+            chunks = data
+
+        # Size of data(in bytes) to be send and maximum time(in milliseconds) to send it,
+        # transfer time at the baudrate(10 bits per byte) and time to read the body from its source
+        input_time_ms = min(
+            data_length * 10_000 // self.baudrate + SIM800L.HTTP_DATA_MIN_TIME_MS,
+            SIM800L.HTTP_DATA_MAX_TIME_MS,
+        )
+        self.send_AT_command(at.ATCommand(f"AT+HTTPDATA={data_length},{input_time_ms}", expected_end_str="DOWNLOAD"))
+
+        bytes_written = 0
+        try:
+            for chunk in chunks:
+                chunk_mv = memoryview(chunk)
+                if bytes_written + len(chunk_mv) > data_length:
+                    raise SIM800LError(f"Request body is longer than 'data_length'({data_length} bytes)")
+                for start_index in range(0, len(chunk_mv), chunk_size):
+                    self.UART.write(chunk_mv[start_index : start_index + chunk_size])
+                    self.UART.flush()
+                    bytes_written += len(chunk_mv[start_index : start_index + chunk_size])
+
+            if bytes_written != data_length:
+                raise SIM800LError(f"Request body ended after {bytes_written} of {data_length} bytes")
+        except Exception:
+            # Module takes everything as data until 'data_length' bytes are recieved,
+            # pad the body so the next command isn't swallowed, the padded body is never sent
+            padding = bytes(min(chunk_size, data_length - bytes_written))
+            while bytes_written < data_length:
+                padding_length = min(len(padding), data_length - bytes_written)
+                self.UART.write(padding[:padding_length])
+                self.UART.flush()
+                bytes_written += padding_length
+            try:
+                self._read_response(at.ATCommand("AT+HTTPDATA"), input_time_ms, True, is_echoed=False)
+            except at.ATCommandError:
+                pass
+            raise
+
+        # Data isn't echoed, module sends OK when all the data is recieved
+        self._read_response(at.ATCommand("AT+HTTPDATA"), input_time_ms, False, is_echoed=False)
+
+    def _file_chunks(self, file, length: int, chunk_size: int):
+        """Yields at most 'length' bytes of 'file' in chunks of at most 'chunk_size' bytes, yielded chunk is only valid until the next iteration"""
+
+        chunk = bytearray(chunk_size)
+        chunk_mv = memoryview(chunk)
+        bytes_read = 0
+        while bytes_read < length:
+            chunk_length = file.readinto(chunk_mv[: min(chunk_size, length - bytes_read)])
+            if not chunk_length:
+                return
+            bytes_read += chunk_length
+            yield chunk_mv[:chunk_length]
+
     def GPRS_get_status(self) -> bool:
         response = self.send_AT_command(at.ATCommand("AT+CGATT?"))
         status = response[0].split(":")[1].strip()
@@ -408,21 +1024,47 @@ class SIM800L:
         else:
             raise SIM800LError(f"Unexpected response! Response: {response}")
 
-    def TCP_connect(self, remote_address: str, remote_port: int) -> None:
+    def TCP_connect(
+        self,
+        remote_address: str,
+        remote_port: int,
+        enable_ssl: bool = False,
+        read_timeout_ms: int = 3_000,
+    ) -> None:
+        """
+        Opens a TCP connection, with 'enable_ssl' the connection is encrypted with SSL/TLS(AT+CIPSSL)\n
+        TLS handshake takes longer than the TCP handshake, increase 'read_timeout_ms' accordingly.\n
+        """
         if not self.GPRS_get_status():
             raise SIM800LError("GPRS not attached! Use '.GPRS_context_open' method before calling this method.")
 
         # Set module to store response from TCP server for mannual retrieval
-        self.send_AT_command(at.ATCommand(f"AT+CIPRXGET=1"))
+        self.send_AT_commands(
+            [
+                at.ATCommand(f"AT+CIPRXGET=1"),
+                at.ATCommand(f"AT+CIPSSL={1 if enable_ssl else 0}"),
+            ]
+        )
+
+        # URCs of an earlier connection
+        self._discard_URCs("CLOSED")
+        self._discard_URCs("+CIPRXGET: 1")
 
         self.send_AT_command(
             at.ATCommand(
                 f'AT+CIPSTART="TCP",{remote_address},{remote_port}',
                 expected_end_str="CONNECT OK",
+                error_end_strs=at.ERROR_END_STRS + ("CONNECT FAIL", "ALREADY CONNECT"),
             ),
-            read_timeout_ms=3_000,
+            read_timeout_ms=read_timeout_ms,
         )
         self._TCP_connection_status = True
+        self._CIPRXGET_pending_length = 0
+
+    def TCP_is_connected(self) -> bool:
+        """Returns the connection status known from responses and URCs(ex: CLOSED) without sending a command"""
+        self.process_URCs()
+        return self._TCP_connection_status == True
 
     def TCP_status(self) -> str:
         return self.send_AT_command(
@@ -436,66 +1078,161 @@ class SIM800L:
         self._TCP_connection_status = False
         return False
 
-    def TCP_send(self, data: str) -> None:
+    def TCP_send(self, data) -> None:
         """
-        Sends the string 'data' to the TCP server.\n
+        Sends 'data'(str, bytes, bytearray or memoryview) to the TCP server, binary safe.\n
+        Data longer than SIM800L.MAX_SEND_LENGTH is sent with multiple AT+CIPSEND commands.\n
         TCP connection remains open after the transmission.\n
         Connection can be automatically closed by the sever after some time or\n
         mannually by calling .TCP_close() method.\n
         """
-        if not self.TCP_is_connection_active:
+        if not self.TCP_is_connected():
             raise SIM800LError("Connection not active!")
 
-        # This command doesn't end with a normal line delimiter('\r\n') string
-        self.send_AT_command(at.ATCommand("AT+CIPSEND", expected_end_str=""), supress_warning=True)
-        # This hack clears the rx buffer and prevent any parse errors that may occurs
-        assert self._rx_buffer == b"> "
-        self._rx_buffer = b""
+        if isinstance(data, str):
+            data = data.encode()
+        data_mv = memoryview(data)
+        bytes_sent = 0
+        while bytes_sent < len(data_mv):
+            bytes_sent += self._CIP_send(data_mv[bytes_sent:])
 
-        # Append CTRL + Z(0x1a) to terminate data and send it
-        self.send_AT_command(
-            at.ATCommand(data + b"\x1a".decode("ascii"), expected_end_str="SEND OK"),
-            read_timeout_ms=3_000,
+    def _CIP_send(self, data) -> int:
+        """
+        Sends at most SIM800L.MAX_SEND_LENGTH bytes of 'data' with AT+CIPSEND=<length> and returns the number of bytes sent\n
+        Data is written to the UART as it is, no terminator(CTRL + Z) is needed, so any byte value can be sent.\n
+        """
+
+        data_length = min(len(data), SIM800L.MAX_SEND_LENGTH)
+
+        # Prompt doesn't end with a line delimiter('\r\n'), see SIM800L.PROMPT_STRS
+        self.send_AT_command(at.ATCommand(f"AT+CIPSEND={data_length}", expected_end_str="> "))
+
+        # Module sends the data after 'data_length' bytes are recieved
+        self.UART.write(data[:data_length])
+        self.UART.flush()
+        self._read_response(
+            at.ATCommand(
+                "AT+CIPSEND",
+                expected_end_str="SEND OK",
+                error_end_strs=at.ERROR_END_STRS + ("SEND FAIL",),
+            ),
+            3_000,
+            True,
+            is_echoed=False,
         )
+        return data_length
 
     def TCP_recieve(
         self,
         timeout_ms: int = 3_000,
     ) -> str:
-        rx_buffer = self._rx_buffer
+        """
+        Reads all recieved data and returns it decoded, see SIM800L.TCP_recieve_into\n
+        """
+        return self._CIP_recieve(timeout_ms, at.TCPError, at.TCPErrorTimeout)
 
-        end_bytes = self._line_delimiter_bytes
+    def TCP_recieve_into(
+        self,
+        buffer: bytearray,
+        timeout_ms: int = 3_000,
+    ) -> int:
+        """
+        Reads recieved data into 'buffer' and returns the number of bytes read, binary safe\n
+        All data waiting in the module is read(up to len(buffer)), data that doesn't fit is read by the next call without waiting for a URC.\n
+        Raises at.TCPErrorTimeout if no data is recieved within 'timeout_ms' and at.TCPError if the connection was closed.\n
+        """
+        return self._CIP_recieve_into(buffer, timeout_ms, at.TCPError, at.TCPErrorTimeout)
 
-        start_time = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), start_time) < timeout_ms:
-            if self.UART.any():
-                rx_buffer += self.UART.read()
-
-            if len(rx_buffer) > 0:
-                lines_bytes = rx_buffer.split(end_bytes)
-                for line_bytes in lines_bytes:
-                    if line_bytes != b"":
-                        if line_bytes.startswith(b"+CIPRXGET: 1"):
-                            response = self.send_AT_command(at.ATCommand("AT+CIPRXGET=2,1460")) # Limited to 1460 bytes at a time
-                            if len(response) == 3:
-                                return response[1]
-                            return ""
-
-                        if line_bytes.startswith(b"CLOSED"):
-                            self._TCP_connection_status = False
-                            raise at.TCPError("TCP connection was closed!")
-
-        raise at.TCPErrorTimeout(f"Timeout reached! Received bytes: {rx_buffer}")
-
-    def TCP_close(self) -> None:
+    def _CIP_recieve_into(
+        self,
+        buffer: bytearray,
+        timeout_ms: int,
+        error_class: type,
+        timeout_error_class: type,
+        drain: bool = True,
+    ) -> int:
+        if self._CIPRXGET_pending_length == 0:
+            self._CIP_wait_for_data(timeout_ms, error_class, timeout_error_class)
+
+        # Drain the module(only a single read without 'drain'), each response reports the length left
+        # Response: +CIPRXGET: 2,<read length>,<length left>\r\n<data>\r\nOK\r\n
+        buffer_mv = memoryview(buffer)
+        read_index = 0
+        while read_index < len(buffer_mv):
+            read_length = min(len(buffer_mv) - read_index, SIM800L.MAX_RECIEVE_LENGTH)
+            self._read_lines()
+            self.UART.write(f"AT+CIPRXGET=2,{read_length}\n")
+            data_length, self._CIPRXGET_pending_length = self._read_framed_data_into(
+                b"+CIPRXGET: 2,", 0, buffer_mv[read_index:]
+            )
+            read_index += data_length
+            if not drain or data_length == 0 or self._CIPRXGET_pending_length == 0:
+                break
+        return read_index
+
+    def _CIP_recieve(
+        self,
+        timeout_ms: int,
+        error_class: type,
+        timeout_error_class: type,
+        drain: bool = True,
+    ) -> str:
+        if self._CIPRXGET_pending_length == 0:
+            self._CIP_wait_for_data(timeout_ms, error_class, timeout_error_class)
+
+        # Buffer is sized to the data waiting in the module, so it is read with a single drain
+        pending_length = self._CIP_pending_length()
+        if not drain:
+            pending_length = min(pending_length, SIM800L.MAX_RECIEVE_LENGTH)
+        buffer = bytearray(pending_length)
+        if len(buffer) == 0:
+            return ""
+        data_length = self._CIP_recieve_into(buffer, timeout_ms, error_class, timeout_error_class, drain)
+        return str(memoryview(buffer)[:data_length], "utf-8")
+
+    def _CIP_wait_for_data(
+        self,
+        timeout_ms: int,
+        error_class: type,
+        timeout_error_class: type,
+    ) -> None:
+        # Module sends +CIPRXGET: 1 when data is recieved, URC may have been recieved during an earlier command
+        try:
+            urc = self.wait_for_URC(("+CIPRXGET: 1", "CLOSED"), timeout_ms)
+        except at.ATCommandErrorTimeout:
+            raise timeout_error_class(f"Timeout reached! Received URCs: {self._URC_queue}")
+
+        if urc.startswith("CLOSED"):
+            raise error_class("Connection was closed!")
+
+    def _CIP_pending_length(self) -> int:
+        """
+        Returns the number of recieved bytes waiting to be read in the module, AT+CIPRXGET=4\n
+        """
+        # Response: +CIPRXGET: 4,<length>
+        response = self.send_AT_command(at.ATCommand("AT+CIPRXGET=4"))
+        for line in response:
+            if line.startswith("+CIPRXGET: 4,"):
+                self._CIPRXGET_pending_length = int(line.split(",")[1])
+                return self._CIPRXGET_pending_length
+        raise SIM800LError(f"Unexpected response: {response}")
+
+    def TCP_close(self, close_context: bool = True) -> None:
+        """
+        Closes the TCP connection, with 'close_context' the GPRS PDP context is closed too(AT+CIPSHUT)\n
+        """
         # Close the TCP connection
         (r1,) = self.send_AT_command(at.ATCommand("AT+CIPCLOSE", expected_end_str="CLOSE OK"))
+        self._TCP_connection_status = False
+        self._CIPRXGET_pending_length = 0
+        if not close_context:
+            if r1 != "CLOSE OK":
+                raise SIM800LError("Error occured when trying to close TCP connection.")
+            return
 
         # Close GPRS PDP context, because we only support single connection mode
-        (r2,) = self.send_AT_command(at.ATCommand("AT+CIPSHUT"))
-        if r1 == "CLOSE OK" and r2 == "SHUT OK":
-            self._TCP_connection_status = False
-        else:
+        (r2,) = self.send_AT_command(at.ATCommand("AT+CIPSHUT", expected_end_str="SHUT OK"))
+        if r1 != "CLOSE OK" or r2 != "SHUT OK":
             raise SIM800LError("Error occured when trying to close TCP connection.")
 
     def UDP_connect(self, remote_address: str, remote_port: int) -> None:
@@ -505,14 +1242,25 @@ class SIM800L:
         # Set module to store response from UDP server for mannual retrieval
         self.send_AT_command(at.ATCommand(f"AT+CIPRXGET=1"))
 
+        # URCs of an earlier connection
+        self._discard_URCs("CLOSED")
+        self._discard_URCs("+CIPRXGET: 1")
+
         self.send_AT_command(
             at.ATCommand(
                 f'AT+CIPSTART="UDP",{remote_address},{remote_port}',
                 expected_end_str="CONNECT OK",
+                error_end_strs=at.ERROR_END_STRS + ("CONNECT FAIL", "ALREADY CONNECT"),
             ),
             read_timeout_ms=3_000,
         )
         self._UDP_connection_status = True
+        self._CIPRXGET_pending_length = 0
+
+    def UDP_is_connected(self) -> bool:
+        """Returns the connection status known from responses and URCs(ex: CLOSED) without sending a command"""
+        self.process_URCs()
+        return self._UDP_connection_status == True
 
     def UDP_status(self) -> str:
         return self.send_AT_command(at.ATCommand("AT+CIPSTATUS", expected_end_str="STATE:"))[1]
@@ -524,69 +1272,161 @@ class SIM800L:
         self._UDP_connection_status = False
         return False
 
-    def UDP_send(self, data: str) -> None:
+    def UDP_send(self, data) -> None:
         """
-        Sends the string 'data' to the UDP server.\n
+        Sends 'data'(str, bytes, bytearray or memoryview) to the UDP server as a single datagram, binary safe.\n
         UDP connection remains open after the transmission.\n
         Connection can be automatically closed by the sever after some time or\n
         mannually by calling .UDP_close() method.\n
         """
-        if not self.UDP_is_connection_active:
+        if not self.UDP_is_connected():
             raise SIM800LError("Connection not active!")
 
-        # This command doesn't end with a normal line delimiter('\r\n') string
-        self.send_AT_command(at.ATCommand("AT+CIPSEND", expected_end_str=""), supress_warning=True)
-        # This hack clears the rx buffer and prevent any parse errors that may occurs
-        assert self._rx_buffer == b"> "
-        self._rx_buffer = b""
-
-        # Append CTRL + Z(0x1a) to terminate data and send it
-        self.send_AT_command(
-            at.ATCommand(data + b"\x1a".decode("ascii"), expected_end_str="SEND OK"),
-            read_timeout_ms=3_000,
-        )
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) > SIM800L.MAX_SEND_LENGTH:
+            raise ValueError(f"Datagram is longer than {SIM800L.MAX_SEND_LENGTH} bytes")
+        self._CIP_send(memoryview(data))
 
     def UDP_recieve(
         self,
         timeout_ms: int = 3_000,
     ) -> str:
-        rx_buffer = self._rx_buffer
+        """
+        Reads a recieved datagram and returns it decoded, see SIM800L.UDP_recieve_into\n
+        """
+        return self._CIP_recieve(timeout_ms, at.UDPError, at.UDPErrorTimeout, drain=False)
 
-        end_bytes = self._line_delimiter_bytes
+    def UDP_recieve_into(
+        self,
+        buffer: bytearray,
+        timeout_ms: int = 3_000,
+    ) -> int:
+        """
+        Reads recieved data into 'buffer' and returns the number of bytes read, binary safe\n
+        Reads one datagram per call with a single AT+CIPRXGET=2, datagrams are never merged. A datagram longer than 'buffer'\n
+        (or SIM800L.MAX_RECIEVE_LENGTH) is read in parts by the following calls.\n
+        Raises at.UDPErrorTimeout if no data is recieved within 'timeout_ms' and at.UDPError if the connection was closed.\n
+        """
+        return self._CIP_recieve_into(buffer, timeout_ms, at.UDPError, at.UDPErrorTimeout, drain=False)
 
-        start_time = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), start_time) < timeout_ms:
-            if self.UART.any():
-                rx_buffer += self.UART.read()
-
-            if len(rx_buffer) > 0:
-                lines_bytes = rx_buffer.split(end_bytes)
-                for line_bytes in lines_bytes:
-                    if line_bytes != b"":
-                        if line_bytes.startswith(b"+CIPRXGET: 1"):
-                            response = self.send_AT_command(at.ATCommand("AT+CIPRXGET=2,1460")) # Limited to 1460 bytes at a time
-                            if len(response) == 3:
-                                return response[1]
-                            return ""
-
-                        if line_bytes.startswith(b"CLOSED"):
-                            self._UDP_connection_status = False
-                            raise at.UDPError("UDP connection was closed!")
-
-        raise at.UDPErrorTimeout(f"Timeout reached! Received bytes: {rx_buffer}")
-
-    def UDP_close(self) -> None:
+    def UDP_close(self, close_context: bool = True) -> None:
+        """
+        Closes the UDP connection, with 'close_context' the GPRS PDP context is closed too(AT+CIPSHUT)\n
+        """
         # Close the UDP connection
         (r1,) = self.send_AT_command(at.ATCommand("AT+CIPCLOSE", expected_end_str="CLOSE OK"))
+        self._UDP_connection_status = False
+        self._CIPRXGET_pending_length = 0
+        if not close_context:
+            if r1 != "CLOSE OK":
+                raise SIM800LError("Error occured when trying to close UDP connection.")
+            return
 
         # Close GPRS PDP context, because we only support single connection mode
-        (r2,) = self.send_AT_command(at.ATCommand("AT+CIPSHUT"))
-        if r1 == "CLOSE OK" and r2 == "SHUT OK":
-            self._UDP_connection_status = False
-        else:
+        (r2,) = self.send_AT_command(at.ATCommand("AT+CIPSHUT", expected_end_str="SHUT OK"))
+        if r1 != "CLOSE OK" or r2 != "SHUT OK":
             raise SIM800LError("Error occured when trying to close UDP connection.")
 
 
+class SIM800LSocket:
+    """
+    Socket-like object for the TCP or UDP connection of a SIM800L module(single connection mode)
+
+    Data is sent with AT+CIPSEND=<length> and recieved with AT+CIPRXGET=2,<length>, both framed by their length,
+    so bytes, bytearray and memoryview payloads are sent and recieved as they are, without copying them into strings.
+    Methods follow the 'socket' module: '.send' can send part of the data, '.sendall' sends all of it and
+    '.recv_into' returns 0 when the connection was closed by the server.
+    TCP '.recv_into' reads all the data waiting in the module that fits, UDP '.recv_into' reads one datagram per call.
+    """
+
+    def __init__(self, sim_module: SIM800L, protocol: str = "TCP", timeout_ms: int = 3_000) -> None:
+        """
+        Args:
+            sim_module (SIM800L): SIM module with an open GPRS context, see SIM800L.GPRS_context_open
+            protocol (str, optional): "TCP" or "UDP". Defaults to "TCP".
+            timeout_ms (int, optional): Timeout of '.recv_into'. Defaults to 3_000.
+        """
+        if protocol not in ("TCP", "UDP"):
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        self.sim_module = sim_module
+        self.protocol = protocol
+        self.timeout_ms = timeout_ms
+
+    def settimeout(self, timeout_ms: int) -> None:
+        self.timeout_ms = timeout_ms
+
+    def connect(self, address: tuple[str, int], enable_ssl: bool = False) -> None:
+        """Opens the connection to 'address'(host, port), 'enable_ssl' is only supported by TCP"""
+        remote_address, remote_port = address
+        if self.protocol == "TCP":
+            self.sim_module.TCP_connect(remote_address, remote_port, enable_ssl)
+        else:
+            self.sim_module.UDP_connect(remote_address, remote_port)
+
+    def is_connected(self) -> bool:
+        if self.protocol == "TCP":
+            return self.sim_module.TCP_is_connected()
+        return self.sim_module.UDP_is_connected()
+
+    def send(self, data) -> int:
+        """
+        Sends at most SIM800L.MAX_SEND_LENGTH bytes of 'data' and returns the number of bytes sent\n
+        A UDP datagram is sent whole or not at all, raises ValueError if it is longer than SIM800L.MAX_SEND_LENGTH.\n
+        """
+        if self.protocol == "UDP":
+            self.sim_module.UDP_send(data)
+            return len(data)
+
+        if not self.is_connected():
+            raise SIM800LError("Connection not active!")
+        return self.sim_module._CIP_send(memoryview(data))
+
+    def sendall(self, data) -> None:
+        """Sends all of 'data', a UDP datagram must fit in a single '.send'"""
+        if self.protocol == "UDP":
+            self.sim_module.UDP_send(data)
+            return
+
+        self.sim_module.TCP_send(data)
+
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        """
+        Reads at most 'nbytes'(all of 'buffer' if 0) recieved bytes into 'buffer' and returns the number of bytes read\n
+        Returns 0 if the connection was closed, raises at.TCPErrorTimeout or at.UDPErrorTimeout if no data is recieved within the timeout.\n
+        """
+        buffer_mv = memoryview(buffer)
+        if nbytes != 0:
+            buffer_mv = buffer_mv[:nbytes]
+
+        try:
+            if self.protocol == "TCP":
+                return self.sim_module.TCP_recieve_into(buffer_mv, self.timeout_ms)
+            return self.sim_module.UDP_recieve_into(buffer_mv, self.timeout_ms)
+        except (at.TCPErrorTimeout, at.UDPErrorTimeout):
+            raise
+        except (at.TCPError, at.UDPError):
+            return 0
+
+    def recv(self, bufsize: int) -> bytes:
+        buffer = bytearray(bufsize)
+        return bytes(memoryview(buffer)[: self.recv_into(buffer)])
+
+    def close(self) -> None:
+        """Closes the connection, GPRS context is kept open"""
+        if not self.is_connected():
+            return
+        try:
+            if self.protocol == "TCP":
+                self.sim_module.TCP_close(close_context=False)
+            else:
+                self.sim_module.UDP_close(close_context=False)
+        except at.ATCommandError:
+            # Closed by the server in the meantime
+            pass
+
+
 if __name__ == "__main__":
     print("SIM800L: Running tests...")
 
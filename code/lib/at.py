@@ -44,6 +44,45 @@ class ATCommandErrorTimeout(ATCommandError):
         super().__init__(*args)
 
 
+class ATCommandErrorResponse(ATCommandError):
+    """
+    Error class to handle final result codes that report an error(ex: ERROR, +CME ERROR: <err>).
+    """
+
+    def __init__(self, response_str: str, response_lines: list[str] | None = None) -> None:
+        super().__init__(response_str)
+        self.response_str = response_str
+        self.response_lines = response_lines
+
+        # Numeric(AT+CMEE=1) or verbose(AT+CMEE=2) error of +CME ERROR/+CMS ERROR
+        self.error_code: int | None = None
+        self.description = ""
+        if response_str.startswith("+CME ERROR:") or response_str.startswith("+CMS ERROR:"):
+            error_str = response_str.split(":", 1)[1].strip()
+            if error_str.isdigit():
+                self.error_code = int(error_str)
+            else:
+                self.description = error_str
+
+    def __str__(self) -> str:
+        return f"AT command failed! Response: {self.response_str}"
+
+
+ERROR_END_STRS = (
+    "ERROR",
+    "+CME ERROR:",
+    "+CMS ERROR:",
+    "NO CARRIER",
+    "NO DIALTONE",
+    "BUSY",
+    "NO ANSWER",
+)
+"""Final result codes that end a response with an error, see Section 1.4 and 19 of mannual"""
+
+MAX_COMMAND_LINE_LENGTH = 556
+"""Maximum number of characters in a command line, including the 'AT' prefix"""
+
+
 class ATCommand:
     def __init__(
         self,
@@ -51,11 +90,14 @@ class ATCommand:
         *args: object,
         at_command_syntax: str = ATCommandSyntax.NO_SYNTAX,
         expected_end_str: str = "OK",
+        error_end_strs: tuple[str, ...] = ERROR_END_STRS,
     ) -> None:
 
         self.at_command_syntax = at_command_syntax
         self.at_command_str = at_command_str
         self.expected_end_str = expected_end_str
+        # Response ends at the expected end string or at any of the error end strings, whichever comes first
+        self.error_end_strs = error_end_strs
         self.args = args
         self.concatenated_args = ""
 
@@ -88,6 +130,40 @@ class ATCommand:
                     cmd=self.at_command_str, args=self.concatenated_args
                 )
 
+        # Information responses of extended commands start with the command name, ex: AT+CREG? -> +CREG: 0,1
+        self.response_prefix = ATCommand._response_prefix(self.formatted_command_str)
+        # Concatenated command lines have the prefixes of every command, see concatenate_AT_commands
+        self.response_prefixes: tuple[str, ...] = (self.response_prefix,) if self.response_prefix != "" else ()
+
+    @staticmethod
+    def _response_prefix(formatted_command_str: str) -> str:
+        if not formatted_command_str.startswith("AT+"):
+            return ""
+
+        name_end_index = 3
+        while (
+            name_end_index < len(formatted_command_str)
+            and formatted_command_str[name_end_index] not in "=?;"
+        ):
+            name_end_index += 1
+        return formatted_command_str[2:name_end_index] + ":"
+
+    def can_concatenate(self) -> bool:
+        """Returns True if the command can share a command line with other commands, see concatenate_AT_commands"""
+        return (
+            self.formatted_command_str.startswith("AT")
+            and not self.formatted_command_str.startswith("ATD")  # Dial must be the last command of a command line
+            and self.expected_end_str == "OK"
+            and self.error_end_strs is ERROR_END_STRS
+        )
+
+    def is_error_end(self, line: str) -> bool:
+        """Returns True if 'line' ends the response with an error"""
+        for error_end_str in self.error_end_strs:
+            if line.startswith(error_end_str):
+                return True
+        return False
+
     def __repr__(self) -> str:
         return f"ATCommand({repr(self.at_command_syntax)}, {repr(self.at_command_str)}, {repr(self.expected_end_str)}, {repr(self.args)})"
 
@@ -95,6 +171,214 @@ class ATCommand:
         return self.formatted_command_str
 
 
+def group_AT_commands(at_commands: list[ATCommand]) -> list[list[ATCommand]]:
+    """Groups consecutive commands that can be concatenated into a single command line
+
+    A group holds at most one command without a response prefix(ex: ATI), so unprefixed information responses
+    can be mapped back to their command.
+
+    Args:
+        at_commands (list[ATCommand]): Commands in the order they are sent
+
+    Returns:
+        list[list[ATCommand]]: Commands of each command line
+    """
+
+    groups = []
+    group = []
+    line_length = 0
+    has_unprefixed_command = False
+    for at_command in at_commands:
+        command_length = len(at_command.formatted_command_str) - 1  # 'AT' is replaced by ';'
+        if (
+            len(group) != 0
+            and group[-1].can_concatenate()
+            and at_command.can_concatenate()
+            and line_length + command_length <= MAX_COMMAND_LINE_LENGTH
+            and not (has_unprefixed_command and at_command.response_prefix == "")
+        ):
+            group.append(at_command)
+            line_length += command_length
+        else:
+            group = [at_command]
+            groups.append(group)
+            line_length = len(at_command.formatted_command_str)
+            has_unprefixed_command = False
+
+        if at_command.response_prefix == "":
+            has_unprefixed_command = True
+    return groups
+
+
+def concatenate_AT_commands(at_commands: list[ATCommand]) -> ATCommand:
+    """Concatenates commands into a single command line, ex: ATE0, AT+CMEE=2 -> ATE0;+CMEE=2
+
+    Module executes the commands in order and sends a single final result code,
+    execution stops at the first command that fails.
+
+    Args:
+        at_commands (list[ATCommand]): Commands of a group, see group_AT_commands
+
+    Returns:
+        ATCommand: Command line, the command itself if the group has a single command
+    """
+
+    if len(at_commands) == 1:
+        return at_commands[0]
+
+    command_line_str = at_commands[0].formatted_command_str
+    for at_command in at_commands[1:]:
+        command_line_str += ";" + at_command.formatted_command_str[2:]
+
+    command_line = ATCommand(command_line_str)
+    response_prefixes = []
+    for at_command in at_commands:
+        if at_command.response_prefix != "" and at_command.response_prefix not in response_prefixes:
+            response_prefixes.append(at_command.response_prefix)
+    command_line.response_prefixes = tuple(response_prefixes)
+    return command_line
+
+
+class ATResponseReader:
+    """
+    Incremental line reader for AT command responses
+
+    Bytes are read from a stream(machine.UART) with 'readinto' into a preallocated buffer. Only the newly arrived
+    bytes are scanned for the line delimiter('\\r\\n') and lines are handed out as memoryview slices of the buffer,
+    so no objects are allocated per line until the caller decodes it.
+
+    Consumed bytes are discarded by moving the unconsumed bytes(usually a partial line) to the start of the buffer
+    when the end of the buffer is reached. A line that doesn't fit in the buffer is handed out truncated.
+
+    A line returned by '.read_line' stays valid until the next call to '.fill'.
+    """
+
+    def __init__(self, buffer_size: int = 1536) -> None:
+        self._buffer = bytearray(buffer_size)
+        self._buffer_mv = memoryview(self._buffer)
+        # Unconsumed bytes are _buffer[_start_index:_end_index]
+        self._start_index = 0
+        self._end_index = 0
+        # Bytes before this index don't contain a line delimiter
+        self._scan_index = 0
+
+        # Diagnostic counter
+        self.truncated_lines = 0
+
+    def __len__(self) -> int:
+        return self._end_index - self._start_index
+
+    def clear(self) -> None:
+        """Discards all unconsumed bytes"""
+        self._start_index = 0
+        self._end_index = 0
+        self._scan_index = 0
+
+    def peek(self) -> memoryview:
+        """Returns the unconsumed bytes without consuming them"""
+        return self._buffer_mv[self._start_index : self._end_index]
+
+    def fill(self, stream) -> int:
+        """Reads the available bytes of 'stream' into the buffer
+
+        Args:
+            stream (machine.UART): Stream with 'any' and 'readinto' methods
+
+        Returns:
+            int: Number of bytes read
+        """
+
+        if self._start_index == self._end_index:
+            self.clear()
+        elif self._end_index == len(self._buffer) and self._start_index != 0:
+            # Byte by byte, source and destination overlap
+            buffer = self._buffer
+            start_index = self._start_index
+            length = self._end_index - start_index
+            for index in range(length):
+                buffer[index] = buffer[start_index + index]
+            self._scan_index -= start_index
+            self._start_index = 0
+            self._end_index = length
+
+        if self._end_index == len(self._buffer) or not stream.any():
+            return 0
+
+        bytes_read = stream.readinto(self._buffer_mv[self._end_index :])
+        if not bytes_read:
+            return 0
+        self._end_index += bytes_read
+        return bytes_read
+
+    def read_line(self) -> memoryview | None:
+        """Consumes the next complete line
+
+        Returns:
+            memoryview | None: Line without the line delimiter, None if no complete line has been recieved
+        """
+
+        buffer = self._buffer
+        start_index = self._start_index
+        end_index = self._end_index
+        index = max(self._scan_index, start_index + 1)
+        while index < end_index:
+            if buffer[index] == 0x0A and buffer[index - 1] == 0x0D:
+                self._start_index = index + 1
+                self._scan_index = index + 1
+                return self._buffer_mv[start_index : index - 1]
+            index += 1
+        self._scan_index = end_index
+
+        if start_index == 0 and end_index == len(buffer):
+            self.truncated_lines += 1
+            self.clear()
+            return self._buffer_mv[:end_index]
+        return None
+
+    def consume_prefix(self, prefix_bytes: bytes) -> bool:
+        """Consumes 'prefix_bytes' if the unconsumed bytes start with it, used for responses without a line delimiter(ex: prompts)
+
+        Returns:
+            bool: True if 'prefix_bytes' was consumed otherwise False
+        """
+
+        if len(self) < len(prefix_bytes):
+            return False
+        buffer = self._buffer
+        start_index = self._start_index
+        for index in range(len(prefix_bytes)):
+            if buffer[start_index + index] != prefix_bytes[index]:
+                return False
+        self._start_index += len(prefix_bytes)
+        return True
+
+    def read_into(self, stream, buffer) -> int:
+        """Reads raw bytes(ex: binary data of HTTPREAD) into 'buffer', line delimiters are not interpreted
+
+        Unconsumed bytes are copied first, remaining bytes are read from 'stream' directly into 'buffer'.
+
+        Args:
+            stream (machine.UART): Stream with 'any' and 'readinto' methods
+            buffer (bytearray | memoryview): Destination of at most len(buffer) bytes
+
+        Returns:
+            int: Number of bytes read, can be less than len(buffer)
+        """
+
+        bytes_read = min(len(self), len(buffer))
+        if bytes_read != 0:
+            buffer[:bytes_read] = self._buffer_mv[self._start_index : self._start_index + bytes_read]
+            self._start_index += bytes_read
+            if self._scan_index < self._start_index:
+                self._scan_index = self._start_index
+
+        if bytes_read < len(buffer) and stream.any():
+            stream_bytes_read = stream.readinto(memoryview(buffer)[bytes_read:])
+            if stream_bytes_read:
+                bytes_read += stream_bytes_read
+        return bytes_read
+
+
 HTTP_CODES = {
     "100": "Continue",
     "101": "Switching Protocols",
@@ -203,7 +487,7 @@ if __name__ == "__main__":
     ########
 
     print("Basic Syntax: ")
-    test_cmd11 = ATCommand(ATCommandSyntax.AT, "D", "+911234567890")
+    test_cmd11 = ATCommand("D", "+911234567890", at_command_syntax=ATCommandSyntax.AT)
     out_str = str(test_cmd11)
     print(f"Test Command: {out_str}")
     assert out_str == "ATD+911234567890"
@@ -211,7 +495,7 @@ if __name__ == "__main__":
     print(f"Repr: {out_str}")
     assert out_str == "ATCommand('AT{cmd}{args}', 'D', 'OK', ('+911234567890',))"
 
-    test_cmd12 = ATCommand(ATCommandSyntax.ATAND, "F", 0)
+    test_cmd12 = ATCommand("F", 0, at_command_syntax=ATCommandSyntax.ATAND)
     out_str = str(test_cmd12)
     print(f"Read Command: {out_str}")
     assert out_str == "AT&F0"
@@ -224,7 +508,7 @@ if __name__ == "__main__":
     ########
 
     print("S Parameter syntax: ")
-    test_cmd11 = ATCommand(ATCommandSyntax.ATS, "0", "0")
+    test_cmd11 = ATCommand("0", "0", at_command_syntax=ATCommandSyntax.ATS)
     out_str = str(test_cmd11)
     print(f"Test Command: {out_str}")
     assert out_str == "ATS0=0"
@@ -237,7 +521,7 @@ if __name__ == "__main__":
 
     print("Extended Syntax: ")
 
-    test_cmd31 = ATCommand(ATCommandSyntax.ATPLUS_TEST, "CIPSEND")
+    test_cmd31 = ATCommand("CIPSEND", at_command_syntax=ATCommandSyntax.ATPLUS_TEST)
     out_str = str(test_cmd31)
     print(f"Test Command: {out_str}")
     assert out_str == "AT+CIPSEND=?"
@@ -245,7 +529,7 @@ if __name__ == "__main__":
     print(f"Repr: {out_str}")
     assert out_str == "ATCommand('AT+{cmd}=?', 'CIPSEND', 'OK', ())"
 
-    test_cmd32 = ATCommand(ATCommandSyntax.ATPLUS_READ, "CIPSEND")
+    test_cmd32 = ATCommand("CIPSEND", at_command_syntax=ATCommandSyntax.ATPLUS_READ)
     out_str = str(test_cmd32)
     print(f"Read Command: {out_str}")
     assert out_str == "AT+CIPSEND?"
@@ -253,7 +537,7 @@ if __name__ == "__main__":
     print(f"Repr: {out_str}")
     assert out_str == "ATCommand('AT+{cmd}?', 'CIPSEND', 'OK', ())"
 
-    test_cmd33 = ATCommand(ATCommandSyntax.ATPLUS_WRITE, "CIPSEND", 16)
+    test_cmd33 = ATCommand("CIPSEND", 16, at_command_syntax=ATCommandSyntax.ATPLUS_WRITE)
     out_str = str(test_cmd33)
     print(f"Write Command: {out_str}")
     assert out_str == "AT+CIPSEND=16"
@@ -261,7 +545,7 @@ if __name__ == "__main__":
     print(f"Repr: {out_str}")
     assert out_str == "ATCommand('AT+{cmd}={args}', 'CIPSEND', 'OK', (16,))"
 
-    test_cmd34 = ATCommand(ATCommandSyntax.ATPLUS_EXECUTE, "CIPSEND")
+    test_cmd34 = ATCommand("CIPSEND", at_command_syntax=ATCommandSyntax.ATPLUS_EXECUTE)
     out_str = str(test_cmd34)
     print(f"Write Command: {out_str}")
     assert out_str == "AT+CIPSEND"
@@ -272,9 +556,92 @@ if __name__ == "__main__":
 
     ########
 
+    print("Response prefix: ")
+    assert test_cmd32.response_prefix == "+CIPSEND:"
+    assert test_cmd33.response_prefix == "+CIPSEND:"
+    assert ATCommand('AT+HTTPPARA="URL","x"').response_prefix == "+HTTPPARA:"
+    assert ATCommand("ATE0").response_prefix == ""
+    print()
+
+    ########
+
+    print("Error end strings: ")
+    test_cmd41 = ATCommand("AT+SAPBR=1,1")
+    assert test_cmd41.is_error_end("ERROR")
+    assert test_cmd41.is_error_end("+CME ERROR: 3")
+    assert not test_cmd41.is_error_end("OK")
+    error = ATCommandErrorResponse("+CME ERROR: 3")
+    assert error.error_code == 3
+    error = ATCommandErrorResponse("+CMS ERROR: SIM busy")
+    assert error.error_code is None and error.description == "SIM busy"
+    print()
+
+    ########
+
+    print("Response reader: ")
+
+    class TestStream:
+        def __init__(self, chunks: list[bytes]) -> None:
+            self.chunks = chunks
+
+        def any(self) -> int:
+            return len(self.chunks[0]) if self.chunks else 0
+
+        def readinto(self, buffer) -> int:
+            chunk = self.chunks[0]
+            bytes_read = min(len(buffer), len(chunk))
+            buffer[:bytes_read] = chunk[:bytes_read]
+            if bytes_read == len(chunk):
+                self.chunks.pop(0)
+            else:
+                self.chunks[0] = chunk[bytes_read:]
+            return bytes_read
+
+    # Line delimiter split across reads, buffer compacted after the first line
+    test_stream = TestStream([b"\r\n+CSQ: 20,0\r", b"\nOK\r\n> ", b"+HTTPREAD: 4\r\n\x00\r\n\xff\r\nOK\r\n"])
+    test_reader = ATResponseReader(24)
+    lines = []
+    while test_stream.chunks or len(test_reader):
+        test_reader.fill(test_stream)
+        line = test_reader.read_line()
+        while line is not None:
+            lines.append(bytes(line))
+            if bytes(line) == b"OK" and test_reader.consume_prefix(b"> "):
+                lines.append(b"> ")
+            if bytes(line).startswith(b"+HTTPREAD: "):
+                data = bytearray(4)
+                assert test_reader.read_into(test_stream, data) == 4
+                lines.append(bytes(data))
+            line = test_reader.read_line()
+    print(f"Lines: {lines}")
+    assert lines == [b"", b"+CSQ: 20,0", b"OK", b"> ", b"+HTTPREAD: 4", b"\x00\r\n\xff", b"", b"OK"]
+    assert test_reader.truncated_lines == 0
+    print()
+
+    ########
+
+    print("Concatenation: ")
+    test_commands = [
+        ATCommand("ATE0"),
+        ATCommand("AT+CMEE=2"),
+        ATCommand("ATI"),
+        ATCommand("AT+CSQ"),
+        ATCommand("AT+CIPSEND", expected_end_str="> "),
+        ATCommand("AT+CREG?"),
+    ]
+    test_groups = group_AT_commands(test_commands)
+    command_lines = [str(concatenate_AT_commands(group)) for group in test_groups]
+    print(f"Command lines: {command_lines}")
+    assert command_lines == ["ATE0;+CMEE=2", "ATI;+CSQ", "AT+CIPSEND", "AT+CREG?"]
+    assert concatenate_AT_commands(test_groups[1]).response_prefixes == ("+CSQ:",)
+    assert len(group_AT_commands([ATCommand(f'AT+HTTPPARA="URL","{100 * "x"}"')] * 10)) == 3
+    print()
+
+    ########
+
     print("Custom syntax: ")
 
-    test_cmd11 = ATCommand(ATCommandSyntax.NO_SYNTAX, "A/")
+    test_cmd11 = ATCommand("A/", at_command_syntax=ATCommandSyntax.NO_SYNTAX)
     out_str = str(test_cmd11)
     print(f"Test Command: {out_str}")
     assert out_str == "A/"
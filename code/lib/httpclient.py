@@ -0,0 +1,220 @@
+import at
+import SIM800L
+
+
+class HTTPClientError(Exception):
+    """
+    Custom Error Class
+    """
+
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+
+
+class HTTPClient:
+    """
+    HTTP/1.1 client that keeps the TCP connection to the server open across requests(keep-alive)
+
+    Requests are sent over a TCP connection of the SIM module(see SIM800L.TCP_connect) instead of its HTTP service,
+    so the TCP and TLS handshakes are made once per connection instead of once per request.
+    Responses are framed by their Content-Length header, responses without it are read until the server
+    closes the connection. Chunked transfer encoding isn't supported.
+
+    Connection is reopened when the server closes it(CLOSED URC) or when a request is made to another server.
+    A request that fails on a reused connection before any of its response was recieved(ex: the server closed the idle
+    connection) is sent once more on a new connection. Requests failing on a new connection aren't sent again.
+    """
+
+    DEFAULT_PORTS = {"http": 80, "https": 443}
+
+    RECIEVE_BUFFER_SIZE = 1460
+    """Maximum number of bytes read from the module at a time, see SIM800L.TCP_recieve_into"""
+
+    MAX_HEADER_LENGTH = 2048
+    """Maximum length of the status line and headers of a response"""
+
+    def __init__(
+        self,
+        sim_module: SIM800L.SIM800L,
+        connect_timeout_ms: int = 30_000,
+        response_timeout_ms: int = 30_000,
+    ) -> None:
+        """
+        Args:
+            sim_module (SIM800L.SIM800L): SIM module with an open GPRS context, see SIM800L.GPRS_context_open
+            connect_timeout_ms (int, optional): Timeout of the TCP and TLS handshakes. Defaults to 30_000.
+            response_timeout_ms (int, optional): Maximum time between two parts of a response. Defaults to 30_000.
+        """
+        self.sim_module = sim_module
+        self.connect_timeout_ms = connect_timeout_ms
+        self.response_timeout_ms = response_timeout_ms
+
+        # (host, port, enable_ssl) of the open connection
+        self._remote: tuple[str, int, bool] | None = None
+        self._recieve_buffer = bytearray(HTTPClient.RECIEVE_BUFFER_SIZE)
+        self._recieve_buffer_mv = memoryview(self._recieve_buffer)
+        self._response_started = False
+
+        # Diagnostic counter
+        self.number_of_connections = 0
+
+    @staticmethod
+    def parse_url(url: str) -> tuple[str, str, int, str]:
+        """Splits 'url' into scheme, host, port and path, ex: https://example.com/post -> https, example.com, 443, /post"""
+
+        scheme, separator, rest = url.partition("://")
+        if separator == "" or scheme not in HTTPClient.DEFAULT_PORTS:
+            raise HTTPClientError(f"Unsupported URL: {url}")
+
+        host, separator, path = rest.partition("/")
+        path = separator + path if separator != "" else "/"
+
+        port = HTTPClient.DEFAULT_PORTS[scheme]
+        if ":" in host:
+            host, port_str = host.split(":")
+            port = int(port_str)
+        return scheme, host, port, path
+
+    def connect(self, host: str, port: int, enable_ssl: bool) -> None:
+        """Opens a connection to the server, the open connection is closed first"""
+        self.close()
+        self.sim_module.TCP_connect(host, port, enable_ssl, read_timeout_ms=self.connect_timeout_ms)
+        self._remote = (host, port, enable_ssl)
+        self.number_of_connections += 1
+
+    def close(self) -> None:
+        """Closes the connection, GPRS context is kept open"""
+        if self._remote is None:
+            return
+
+        self._remote = None
+        if self.sim_module.TCP_is_connected():
+            try:
+                self.sim_module.TCP_close(close_context=False)
+            except at.ATCommandError:
+                # Closed by the server in the meantime
+                pass
+
+    def GET(self, url: str) -> tuple[str, str]:
+        """
+        Make a GET request to a given URL and return response code, response\n
+        """
+        return self.request("GET", url)
+
+    def POST(self, url: str, data: str, header_content_type: str = "text/plain") -> tuple[str, str]:
+        """
+        Make a POST request to a given URL and return response code, response\n
+        """
+        return self.request("POST", url, data, header_content_type)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: str = "",
+        header_content_type: str = "text/plain",
+    ) -> tuple[str, str]:
+        """
+        Make a request to a given URL and return response code, response\n
+        Raises at.HTTPError if the response code is 4XX or 5XX.\n
+        """
+
+        scheme, host, port, path = HTTPClient.parse_url(url)
+        remote = (host, port, scheme == "https")
+
+        request_str = f"{method} {path} HTTP/1.1\r\nHost: {host}"
+        if port != HTTPClient.DEFAULT_PORTS[scheme]:
+            request_str += f":{port}"
+        request_str += "\r\nConnection: keep-alive\r\n"
+        if data != "" or method == "POST":
+            request_str += f"Content-Type: {header_content_type}\r\nContent-Length: {len(data.encode())}\r\n"
+        request_str += "\r\n" + data
+
+        for _ in range(2):
+            is_reused = True
+            if self._remote != remote or not self.sim_module.TCP_is_connected():
+                self.connect(*remote)
+                is_reused = False
+
+            self._response_started = False
+            try:
+                self.sim_module.TCP_send(request_str)
+                http_response_code, http_response, keep_alive = self._read_response(method)
+            except (at.TCPError, at.ATCommandErrorResponse) as error:
+                # Connection may still be open in the module(ex: SEND FAIL), close it before reconnecting
+                self.close()
+                # Server closed the kept alive connection before the request was processed
+                if isinstance(error, at.TCPErrorTimeout) or self._response_started or not is_reused:
+                    raise
+                continue
+            except Exception:
+                # Rest of the response is left in the module, connection can't be reused
+                self.close()
+                raise
+
+            if not keep_alive:
+                self.close()
+
+            # Check response code
+            if http_response_code.startswith("4") or http_response_code.startswith("5"):
+                raise at.HTTPError(http_response_code, http_response)
+
+            return http_response_code, http_response
+
+    def _read_response(self, method: str) -> tuple[str, str, bool]:
+        """Reads a response and returns response code, response and whether the connection can be reused"""
+
+        header_bytes = b""
+        header_end_index = -1
+        while header_end_index == -1:
+            if len(header_bytes) > HTTPClient.MAX_HEADER_LENGTH:
+                raise HTTPClientError(f"Response header is longer than {HTTPClient.MAX_HEADER_LENGTH} bytes")
+            data_length = self.sim_module.TCP_recieve_into(self._recieve_buffer, self.response_timeout_ms)
+            self._response_started = True
+            header_bytes += bytes(self._recieve_buffer_mv[:data_length])
+            header_end_index = header_bytes.find(b"\r\n\r\n")
+
+        # Status line: HTTP/1.1 200 OK
+        header_lines = str(header_bytes[:header_end_index], "utf-8").split("\r\n")
+        http_version, http_response_code = header_lines[0].split(" ")[:2]
+        keep_alive = http_version == "HTTP/1.1"
+        content_length = None
+        for header_line in header_lines[1:]:
+            name, _, value = header_line.partition(":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == "content-length":
+                content_length = int(value)
+            elif name == "connection":
+                keep_alive = value == "keep-alive"
+            elif name == "transfer-encoding" and value != "identity":
+                raise HTTPClientError(f"Unsupported transfer encoding: {value}")
+
+        # Responses without a body, see RFC 9112 Section 6.3
+        if method == "HEAD" or http_response_code.startswith("1") or http_response_code in ("204", "304"):
+            content_length = 0
+
+        body_bytes = header_bytes[header_end_index + 4 :]
+        if content_length is None:
+            # Body ends when the server closes the connection
+            keep_alive = False
+            http_response = bytearray(body_bytes)
+            while True:
+                try:
+                    data_length = self.sim_module.TCP_recieve_into(self._recieve_buffer, self.response_timeout_ms)
+                except at.TCPErrorTimeout:
+                    raise
+                except at.TCPError:
+                    break
+                http_response += self._recieve_buffer_mv[:data_length]
+        else:
+            http_response = bytearray(content_length)
+            read_index = min(len(body_bytes), content_length)
+            http_response[:read_index] = body_bytes[:read_index]
+            while read_index < content_length:
+                data_length = self.sim_module.TCP_recieve_into(
+                    memoryview(http_response)[read_index:], self.response_timeout_ms
+                )
+                read_index += data_length
+
+        return http_response_code, str(http_response, "utf-8"), keep_alive
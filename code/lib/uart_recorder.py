@@ -0,0 +1,132 @@
+import time
+import struct
+
+
+class UARTLog:
+    """
+    Compact append-only log of UART traffic
+
+    Structure of the log file:
+    1. 8-bytes, b"UARTLOG1" Header bytes, written once when the file is created
+    2. Records, each one is:
+        1. 4-bytes, Milliseconds since the previous record in Little Endian
+        2. 1-byte, Record type: RX, TX or OPEN
+        3. 2-bytes, Length of data field in Little Endian
+        4. n-bytes, Data: bytes recieved(RX), bytes sent(TX) or baudrate as 4-byte Little Endian int(OPEN)
+
+    Time is stored as a delta, so the log is not affected by the wrap around of 'time.ticks_ms'.
+    """
+
+    HEADER_BYTES = b"UARTLOG1"
+    RECORD_HEADER_FMT_STR = "<LBH"
+    RECORD_HEADER_LENGTH = 7
+
+    RECORD_RX = 0
+    RECORD_TX = 1
+    RECORD_OPEN = 2
+
+    MAX_DATA_LENGTH = 0xFFFF
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Args:
+            file_path (str): Log file, new records are appended to existing logs
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(UARTLog.HEADER_BYTES)
+
+        self._record_header = bytearray(UARTLog.RECORD_HEADER_LENGTH)
+        self._last_ticks_ms = time.ticks_ms()
+
+    def write_record(self, record_type: int, data) -> None:
+        current_ticks_ms = time.ticks_ms()
+        delta_ms = time.ticks_diff(current_ticks_ms, self._last_ticks_ms)
+        self._last_ticks_ms = current_ticks_ms
+
+        data_mv = memoryview(data)
+        start_index = 0
+        # Long writes are split into multiple records
+        while True:
+            length = min(len(data_mv) - start_index, UARTLog.MAX_DATA_LENGTH)
+            struct.pack_into(
+                UARTLog.RECORD_HEADER_FMT_STR, self._record_header, 0, delta_ms, record_type, length
+            )
+            self._file.write(self._record_header)
+            self._file.write(data_mv[start_index : start_index + length])
+            start_index += length
+            delta_ms = 0
+            if start_index >= len(data_mv):
+                break
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class UARTRecorder:
+    """
+    Wraps a machine.UART and tees all bytes read from and written to it into a UARTLog
+
+    Can be used in place of the wrapped UART.
+    """
+
+    def __init__(self, uart, uart_log: UARTLog, baudrate: int) -> None:
+        self.uart = uart
+        self.uart_log = uart_log
+        self.uart_log.write_record(UARTLog.RECORD_OPEN, struct.pack("<L", baudrate))
+
+    def any(self) -> int:
+        return self.uart.any()
+
+    def read(self, nbytes: int | None = None) -> bytes | None:
+        data = self.uart.read() if nbytes is None else self.uart.read(nbytes)
+        if data:
+            self.uart_log.write_record(UARTLog.RECORD_RX, data)
+        return data
+
+    def readinto(self, buffer, nbytes: int | None = None) -> int | None:
+        bytes_read = self.uart.readinto(buffer) if nbytes is None else self.uart.readinto(buffer, nbytes)
+        if bytes_read:
+            self.uart_log.write_record(UARTLog.RECORD_RX, memoryview(buffer)[:bytes_read])
+        return bytes_read
+
+    def write(self, data) -> int | None:
+        bytes_written = self.uart.write(data)
+        self.uart_log.write_record(
+            UARTLog.RECORD_TX, data.encode() if isinstance(data, str) else data
+        )
+        return bytes_written
+
+    def flush(self) -> None:
+        self.uart.flush()
+        self.uart_log.flush()
+
+
+def read_records(file_path: str):
+    """Reads the records of a UARTLog file
+
+    Yields:
+        tuple[int, int, bytes]: Milliseconds since the first record, record type and data
+    """
+    with open(file_path, "rb") as log_file:
+        if log_file.read(len(UARTLog.HEADER_BYTES)) != UARTLog.HEADER_BYTES:
+            raise ValueError(f"Not a UART log file: {file_path}")
+
+        time_ms = None
+        while True:
+            record_header = log_file.read(UARTLog.RECORD_HEADER_LENGTH)
+            if len(record_header) < UARTLog.RECORD_HEADER_LENGTH:
+                # End of file or record truncated by a reset
+                return
+            delta_ms, record_type, length = struct.unpack(UARTLog.RECORD_HEADER_FMT_STR, record_header)
+            data = log_file.read(length)
+            if len(data) < length:
+                return
+
+            # Delta of the first record is relative to the creation of the UARTLog
+            time_ms = 0 if time_ms is None else time_ms + delta_ms
+            yield time_ms, record_type, data
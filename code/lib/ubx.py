@@ -1,6 +1,72 @@
 import struct
 import utils
 
+from collections import namedtuple, OrderedDict
+
+
+def _checksum_update_py(checksum: int, buffer, start: int, end: int) -> int:
+    """Updates the 8-Bit Fletcher checksum(CK_A | CK_B << 8) with buffer[start:end], see Section 25.4 of mannual
+
+    Sums are reduced once at the end, they can't overflow on ports with arbitrary precision ints.
+    """
+    ck_a = checksum & 0xFF
+    ck_b = checksum >> 8
+    for byte in memoryview(buffer)[start:end]:
+        ck_a += byte
+        ck_b += ck_a
+    return (ck_a & 0xFF) | ((ck_b & 0xFF) << 8)
+
+
+try:
+    # Viper emitted variant, see ubx_native.py
+    from ubx_native import checksum_update
+except (ImportError, SyntaxError):
+    checksum_update = _checksum_update_py
+
+
+def encode_frame(ubx_message_type: bytes, payload, frame: bytearray | None = None) -> memoryview:
+    """Builds a UBX frame around 'payload' and checksums it in place
+
+    Args:
+        ubx_message_type (bytes): Message class and message id
+        payload (bytes | bytearray | memoryview): Little endian payload
+        frame (bytearray | None, optional): Buffer to build the frame in, at least 8 bytes longer than 'payload'. Defaults to a new buffer.
+
+    Returns:
+        memoryview: Frame within 'frame'
+    """
+    payload_length = len(payload)
+    frame_length = 8 + payload_length
+    if frame is None:
+        frame = bytearray(frame_length)
+
+    frame[0] = 0xB5
+    frame[1] = 0x62
+    frame[2] = ubx_message_type[0]
+    frame[3] = ubx_message_type[1]
+    frame[4] = payload_length & 0xFF
+    frame[5] = payload_length >> 8
+    frame[6 : 6 + payload_length] = payload
+
+    # Checksum covers message class, message id, payload length and payload
+    checksum = checksum_update(0, frame, 2, 6 + payload_length)
+    frame[6 + payload_length] = checksum & 0xFF
+    frame[7 + payload_length] = checksum >> 8
+
+    return memoryview(frame)[:frame_length]
+
+
+def verify_frame(frame) -> bool:
+    """Returns True if the checksum of a complete UBX frame is valid otherwise False, without copying the frame"""
+    frame_length = len(frame)
+    if frame_length < 8:
+        return False
+    checksum = checksum_update(0, frame, 2, frame_length - 2)
+    return (
+        frame[frame_length - 2] == (checksum & 0xFF)
+        and frame[frame_length - 1] == (checksum >> 8)
+    )
+
 
 class UBXMessageTypes:
     """
@@ -8,7 +74,7 @@ class UBXMessageTypes:
     """
 
     ACK_ACK = b"\x05\x01"
-    ACK_NAK = b"\x05\x01"
+    ACK_NAK = b"\x05\x00"
 
     AID_ALM = b"\x0B\x30"
     AID_ALPSRV = b"\x0B\x32"
@@ -199,7 +265,8 @@ class UBXMessage:
         self.message_class_id_bytes = ubx_message_type
 
         self.payload_fmt_str = UBXDataTypes.LITTLE_ENDIAN + payload_fields_format_string
-        self.payload_length = struct.calcsize(self.payload_fmt_str)
+        payload_fmt = utils.compile_fmt(self.payload_fmt_str)
+        self.payload_length = payload_fmt.size
         self.payload_length_bytes = struct.pack(
             UBXMessage._payload_length_fmt_str, self.payload_length
         )
@@ -210,71 +277,29 @@ class UBXMessage:
                 f"Number of bytes in argument 'payload_fields'({len(concated_payload_fields)}) doesn't match size of argument 'payload_fmt_str'({self.payload_length})"
             )
 
-        payload_expanded_fmt_str = utils.expand_fmt_str(self.payload_fmt_str)
-        assert self.payload_length == struct.calcsize(payload_expanded_fmt_str)
-
-        # Array to hold ints which represent payload fields
-        payload_fields_array = []
-        BYTE_ORDER_CHARS = {"@", "<", ">", "!"}
-
-        # Ignore byte order char if any
-        start_index = 1 if payload_expanded_fmt_str[0] in BYTE_ORDER_CHARS else 0
-        # Index into concated_payload_field array
-        fields_index = 0
-        for current_char in payload_expanded_fmt_str[start_index:]:
-            # Extract each payload field
-            payload_field_size = struct.calcsize(current_char)
-            payload_field_bytes = concated_payload_fields[
-                fields_index : fields_index + payload_field_size
-            ]
-            fields_index += payload_field_size
-
-            (payload_field,) = struct.unpack(
-                UBXDataTypes.BIG_ENDIAN + current_char, payload_field_bytes
-            )
-            payload_fields_array.append(payload_field)
-
-        assert fields_index == self.payload_length
-
-        self.payload_bytes = struct.pack(
-            self.payload_fmt_str,
-            *payload_fields_array,
+        # Payload fields are big endian, UBX payload is little endian
+        # Unpacking with the big endian version of the format string swaps every field in one call
+        self.payload_bytes = payload_fmt.pack(
+            *utils.compile_fmt(
+                UBXDataTypes.BIG_ENDIAN + payload_fields_format_string
+            ).unpack_from(concated_payload_fields)
         )
 
-        # Bytes over which checksum is calculated
-        checksum_range = (
-            self.message_class_id_bytes + self.payload_length_bytes + self.payload_bytes
+        self.message_bytes = bytes(
+            encode_frame(self.message_class_id_bytes, self.payload_bytes)
         )
+        self.checksum_bytes = self.message_bytes[-2:]
 
-        self.checksum_bytes = struct.pack(
-            UBXMessage._checksum_fmt_str,
-            *list(UBXMessage.calc_checksum(checksum_range)),
-        )
-
-        self.message_bytes = (
-            UBXMessage._header_bytes
-            + self.message_class_id_bytes
-            + self.payload_length_bytes
-            + self.payload_bytes
-            + self.checksum_bytes
-        )
+    @staticmethod
+    def from_payload(ubx_message_type: bytes, payload: bytes) -> "UBXMessage":
+        """Creates a message from an already little endian payload"""
+        # Counted string is a single field without byte order
+        return UBXMessage(ubx_message_type, f"{len(payload)}s", payload)
 
     @staticmethod
     def calc_checksum(source_bytes: bytes) -> bytes:
-        CK_A = 0x00
-        CK_B = 0x00
-
-        # Bytes over which checksum is calculated
-        checksum_range = source_bytes
-
-        for message_byte in checksum_range:
-            CK_A = CK_A + message_byte
-            CK_A = CK_A & 0xFF
-            CK_B = CK_B + CK_A
-            CK_B = CK_B & 0xFF
-
-        CK = (CK_A << 8) + CK_B
-        return CK.to_bytes(2, "big")
+        checksum = checksum_update(0, source_bytes, 0, len(source_bytes))
+        return bytes((checksum & 0xFF, checksum >> 8))
 
     @staticmethod
     def split_message_bytes(
@@ -299,10 +324,10 @@ class UBXMessage:
             )
 
         checksum_bytes = ubx_message_bytes[-2:]
-        calculated_checksum_bytes = UBXMessage.calc_checksum(
-            message_class_id_bytes + payload_length_bytes + payload_bytes
-        )
-        if calculated_checksum_bytes != checksum_bytes:
+        if not verify_frame(ubx_message_bytes):
+            calculated_checksum_bytes = UBXMessage.calc_checksum(
+                message_class_id_bytes + payload_length_bytes + payload_bytes
+            )
             raise ValueError(
                 f"Malformed UBX message. Value of checksum({utils.bytes_to_hex_str(checksum_bytes)}) doesn't match calculated checksum({utils.bytes_to_hex_str(calculated_checksum_bytes)})."
             )
@@ -316,6 +341,590 @@ class UBXMessage:
         )
 
 
+class UBXFrameCache:
+    """
+    Bounded cache of constant messages, such as polls and config messages sent repeatedly
+
+    Messages are built once and evicted in least recently used order when the cache is full.
+    Cached messages are shared, they must not be modified.
+    """
+
+    def __init__(self, max_size: int = 32) -> None:
+        self.max_size = max_size
+        self._messages = OrderedDict()
+
+        # Diagnostic counters
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: tuple, build):
+        messages = self._messages
+        message = messages.pop(key, None)
+        if message is None:
+            self.misses += 1
+            message = build()
+            if len(messages) >= self.max_size:
+                # Least recently used message is the first one
+                del messages[next(iter(messages))]
+        else:
+            self.hits += 1
+        messages[key] = message
+        return message
+
+    def get(self, ubx_message_type: bytes, payload: bytes = b"") -> UBXMessage:
+        """Returns the message with little endian 'payload', an empty payload polls the message
+
+        Args:
+            ubx_message_type (bytes): Message class and message id
+            payload (bytes, optional): Little endian payload. Defaults to b"".
+
+        Returns:
+            UBXMessage: Cached message
+        """
+        return self._lookup(
+            (ubx_message_type, payload),
+            lambda: UBXMessage.from_payload(ubx_message_type, payload),
+        )
+
+    def get_polls(self, ubx_message_types: tuple[bytes, ...]) -> bytes:
+        """Returns the concatenated poll messages of 'ubx_message_types', to be written at once"""
+        return self._lookup(
+            (ubx_message_types, None),
+            lambda: b"".join(
+                [self.get(message_type).message_bytes for message_type in ubx_message_types]
+            ),
+        )
+
+    def clear(self) -> None:
+        self._messages = OrderedDict()
+
+
+class UBXParser:
+    """
+    Streaming UBX frame decoder
+
+    Bytes are read from a stream(machine.UART, file, etc.) with 'readinto' into a preallocated chunk buffer
+    and fed one at a time through a state machine. The frame is assembled in a preallocated frame buffer and
+    the checksum is updated as the bytes arrive, so no objects are allocated per byte.
+
+    When '.read' or '.feed' returns True, a complete and checksum verified frame is available through
+    '.message_class_id_bytes', '.payload', '.payload_length' and '.message_bytes'.
+    The frame stays valid until the next call to '.read' or '.feed'.
+    """
+
+    _STATE_SYNC_1 = 0
+    _STATE_SYNC_2 = 1
+    _STATE_CLASS = 2
+    _STATE_ID = 3
+    _STATE_LENGTH_1 = 4
+    _STATE_LENGTH_2 = 5
+    _STATE_PAYLOAD = 6
+    _STATE_CK_A = 7
+    _STATE_CK_B = 8
+
+    def __init__(self, max_payload_length: int = 512, chunk_size: int = 64) -> None:
+        self._max_payload_length = max_payload_length
+
+        # Header(2) + Class/Id(2) + Length(2) + Payload(n) + Checksum(2)
+        self._frame = bytearray(6 + max_payload_length + 2)
+        self._frame_mv = memoryview(self._frame)
+
+        self._chunk = bytearray(chunk_size)
+        self._chunk_mv = memoryview(self._chunk)
+        self._chunk_index = 0
+        self._chunk_length = 0
+
+        # Diagnostic counters
+        self.skipped_bytes = 0
+        self.checksum_errors = 0
+        self.oversized_frames = 0
+
+        self._state = UBXParser._STATE_SYNC_1
+        self._index = 0
+        self._payload_length = 0
+        self._ck_a = 0
+        self._ck_b = 0
+        self._frame_length = 0
+        self._frame_complete = False
+
+    def reset(self) -> None:
+        """Discards the partially assembled frame"""
+        self._state = UBXParser._STATE_SYNC_1
+        self._index = 0
+        self._frame_length = 0
+
+    def flush(self) -> None:
+        """Discards the partially assembled frame and any unparsed bytes in the chunk buffer"""
+        self._chunk_index = 0
+        self._chunk_length = 0
+        self.reset()
+
+    def feed(self, byte: int) -> bool:
+        """Feeds a single byte to the decoder
+
+        Args:
+            byte (int): Next byte of the stream
+
+        Returns:
+            bool: True if 'byte' completed a checksum verified frame otherwise False
+        """
+
+        state = self._state
+
+        if state == UBXParser._STATE_SYNC_1:
+            if byte == 0xB5:
+                self._frame_length = 0
+                self._state = UBXParser._STATE_SYNC_2
+            else:
+                self.skipped_bytes += 1
+            return False
+
+        if state == UBXParser._STATE_SYNC_2:
+            if byte == 0x62:
+                self._frame[0] = 0xB5
+                self._frame[1] = 0x62
+                self._index = 2
+                self._ck_a = 0
+                self._ck_b = 0
+                self._state = UBXParser._STATE_CLASS
+            elif byte == 0xB5:
+                self.skipped_bytes += 1
+            else:
+                self.skipped_bytes += 2
+                self._state = UBXParser._STATE_SYNC_1
+            return False
+
+        if state == UBXParser._STATE_CK_A:
+            if byte == self._ck_a:
+                self._frame[self._index] = byte
+                self._index += 1
+                self._state = UBXParser._STATE_CK_B
+            else:
+                self.checksum_errors += 1
+                self.reset()
+            return False
+
+        if state == UBXParser._STATE_CK_B:
+            if byte == self._ck_b:
+                self._frame[self._index] = byte
+                self._frame_length = self._index + 1
+                self._state = UBXParser._STATE_SYNC_1
+                return True
+            self.checksum_errors += 1
+            self.reset()
+            return False
+
+        # Message class, message id, payload length and payload bytes are covered by the checksum
+        self._frame[self._index] = byte
+        self._index += 1
+        ck_a = (self._ck_a + byte) & 0xFF
+        self._ck_a = ck_a
+        self._ck_b = (self._ck_b + ck_a) & 0xFF
+
+        if state == UBXParser._STATE_PAYLOAD:
+            if self._index == 6 + self._payload_length:
+                self._state = UBXParser._STATE_CK_A
+
+        elif state == UBXParser._STATE_LENGTH_2:
+            # Payload length is little endian
+            payload_length = self._frame[4] | (byte << 8)
+            if payload_length > self._max_payload_length:
+                self.oversized_frames += 1
+                self.reset()
+            else:
+                self._payload_length = payload_length
+                self._state = (
+                    UBXParser._STATE_PAYLOAD
+                    if payload_length
+                    else UBXParser._STATE_CK_A
+                )
+
+        else:
+            self._state = state + 1
+
+        return False
+
+    def read(self, stream) -> bool:
+        """Reads bytes from 'stream' and feeds them to the decoder until a frame is complete
+
+        Bytes following the complete frame are kept in the chunk buffer for the next call.
+
+        Args:
+            stream: Any object with a 'readinto' method, such as machine.UART or a file
+
+        Returns:
+            bool: True if a checksum verified frame is available, False if 'stream' ran out of bytes
+        """
+
+        while True:
+            if self._chunk_index >= self._chunk_length:
+                bytes_read = stream.readinto(self._chunk)
+                if not bytes_read:
+                    return False
+                self._chunk_index = 0
+                self._chunk_length = bytes_read
+
+            self._chunk_index = self._consume(
+                self._chunk_mv, self._chunk_index, self._chunk_length
+            )
+            if self._frame_complete:
+                return True
+
+    def frames(self, buffer):
+        """Feeds all bytes of 'buffer' to the decoder and yields after each complete frame
+
+        Frames can be split across buffers, the decoder keeps the partial frame for the next call.
+
+        Ex: for _ in parser.frames(chunk): uart.write(parser.message_view)
+
+        Args:
+            buffer (bytes | bytearray | memoryview): Next part of the stream
+        """
+        buffer = memoryview(buffer)
+        index = 0
+        end = len(buffer)
+        while index < end:
+            index = self._consume(buffer, index, end)
+            if self._frame_complete:
+                yield
+
+    def _consume(self, buffer: memoryview, index: int, end: int) -> int:
+        """Feeds buffer[index:end] to the decoder until a frame is complete and returns the index of the next unread byte
+
+        Payload bytes are copied to the frame buffer in bulk and checksummed over the copied range.
+        """
+        self._frame_complete = False
+        while index < end:
+            if self._state == UBXParser._STATE_PAYLOAD:
+                frame_index = self._index
+                payload_end = 6 + self._payload_length
+                count = min(end - index, payload_end - frame_index)
+                self._frame_mv[frame_index : frame_index + count] = buffer[index : index + count]
+                checksum = checksum_update(
+                    self._ck_a | (self._ck_b << 8),
+                    self._frame_mv,
+                    frame_index,
+                    frame_index + count,
+                )
+                self._ck_a = checksum & 0xFF
+                self._ck_b = checksum >> 8
+                self._index = frame_index + count
+                index += count
+                if self._index == payload_end:
+                    self._state = UBXParser._STATE_CK_A
+                continue
+
+            byte = buffer[index]
+            index += 1
+            if self.feed(byte):
+                self._frame_complete = True
+                return index
+
+        return index
+
+    @property
+    def message_class_id_bytes(self) -> bytes:
+        return bytes(self._frame_mv[2:4])
+
+    @property
+    def payload_length(self) -> int:
+        return self._payload_length
+
+    @property
+    def payload(self) -> memoryview:
+        """Payload of the last complete frame, without copying"""
+        return self._frame_mv[6 : 6 + self._payload_length]
+
+    @property
+    def message_bytes(self) -> bytes:
+        """Copy of the last complete frame"""
+        return bytes(self._frame_mv[: self._frame_length])
+
+    @property
+    def message_view(self) -> memoryview:
+        """Last complete frame, without copying"""
+        return self._frame_mv[: self._frame_length]
+
+    def is_message_type(self, ubx_message_type: bytes) -> bool:
+        """Compares message class and message id of the last complete frame without allocating"""
+        return (
+            self._frame_length != 0
+            and self._frame[2] == ubx_message_type[0]
+            and self._frame[3] == ubx_message_type[1]
+        )
+
+
+class UBXPayloadSchema:
+    """
+    Payload layout of a UBX message
+
+    Field list is compiled once into a little endian format string and a namedtuple record type,
+    so decoding a payload is a single 'struct.unpack_from' call. Messages with repeated blocks(ex: NAV-SVINFO)
+    list the fixed part in 'fields' and one block in 'block_fields', the decoded blocks are stored in field 'blocks'.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: tuple[tuple[str, str], ...],
+        block_fields: tuple[tuple[str, str], ...] = (),
+    ) -> None:
+        """
+        Args:
+            name (str): Name of the record type
+            fields (tuple[tuple[str, str], ...]): Pairs of field name and UBXDataTypes format, in payload order
+            block_fields (tuple[tuple[str, str], ...], optional): Fields of the repeated block, if any. Defaults to ().
+        """
+        self.name = name
+        self.fmt = utils.compile_fmt(
+            UBXDataTypes.LITTLE_ENDIAN
+            + "".join([field_fmt_str for _, field_fmt_str in fields])
+        )
+        self.fmt_str = self.fmt.fmt_str
+        self.size = self.fmt.size
+        field_names = [field_name for field_name, _ in fields]
+
+        self.block_fmt_str = None
+        self.block_size = 0
+        self.block_record = None
+        if block_fields:
+            self.block_fmt_str = UBXDataTypes.LITTLE_ENDIAN + "".join(
+                [field_fmt_str for _, field_fmt_str in block_fields]
+            )
+            self.block_size = utils.compile_fmt(self.block_fmt_str).size
+            self.block_record = namedtuple(
+                name + "_BLOCK", [field_name for field_name, _ in block_fields]
+            )
+            field_names.append("blocks")
+
+        self.record = namedtuple(name, field_names)
+
+    def decode(self, payload, offset: int = 0, payload_length: int | None = None) -> tuple:
+        """Decodes a payload into a record without copying it
+
+        Args:
+            payload (bytes | bytearray | memoryview): Buffer containing the payload
+            offset (int, optional): Index of the first payload byte in 'payload'. Defaults to 0.
+            payload_length (int | None, optional): Number of payload bytes. Defaults to the rest of 'payload'.
+
+        Raises:
+            UBXError: If payload length doesn't match the schema
+
+        Returns:
+            tuple: Record of type '.record'
+        """
+        if payload_length is None:
+            payload_length = len(payload) - offset
+
+        if self.block_fmt_str is None:
+            if payload_length != self.size:
+                raise UBXError(f"Payload length of {self.name}({payload_length}) doesn't match its schema({self.size})")
+            return self.record(*struct.unpack_from(self.fmt_str, payload, offset))
+
+        number_of_blocks, remaining_bytes = divmod(payload_length - self.size, self.block_size)
+        if number_of_blocks < 0 or remaining_bytes != 0:
+            raise UBXError(f"Payload length of {self.name}({payload_length}) doesn't match its schema({self.size} + n*{self.block_size})")
+
+        block_fmt_str = self.block_fmt_str
+        block_record = self.block_record
+        block_offset = offset + self.size
+        blocks = []
+        for _ in range(number_of_blocks):
+            blocks.append(block_record(*struct.unpack_from(block_fmt_str, payload, block_offset)))
+            block_offset += self.block_size
+
+        return self.record(*struct.unpack_from(self.fmt_str, payload, offset), tuple(blocks))
+
+
+PAYLOAD_SCHEMAS = {
+    # See Section 31.16.3 of mannual, UART port
+    UBXMessageTypes.CFG_PRT: UBXPayloadSchema(
+        "CFG_PRT",
+        (
+            ("portID", UBXDataTypes.U1),
+            ("reserved0", UBXDataTypes.U1),
+            ("txReady", UBXDataTypes.X2),
+            ("mode", UBXDataTypes.X4),
+            ("baudRate", UBXDataTypes.U4),
+            ("inProtoMask", UBXDataTypes.X2),
+            ("outProtoMask", UBXDataTypes.X2),
+            ("reserved4", UBXDataTypes.X2),
+            ("reserved5", UBXDataTypes.U2),
+        ),
+    ),
+    # See Section 31.17 of mannual
+    UBXMessageTypes.CFG_RATE: UBXPayloadSchema(
+        "CFG_RATE",
+        (
+            ("measRate", UBXDataTypes.U2),
+            ("navRate", UBXDataTypes.U2),
+            ("timeRef", UBXDataTypes.U2),
+        ),
+    ),
+    # See Section 33.4 of mannual
+    UBXMessageTypes.MON_HW: UBXPayloadSchema(
+        "MON_HW",
+        (
+            ("pinSel", UBXDataTypes.X4),
+            ("pinBank", UBXDataTypes.X4),
+            ("pinDir", UBXDataTypes.X4),
+            ("pinVal", UBXDataTypes.X4),
+            ("noisePerMS", UBXDataTypes.U2),
+            ("agcCnt", UBXDataTypes.U2),
+            ("aStatus", UBXDataTypes.U1),
+            ("aPower", UBXDataTypes.U1),
+            ("flags", UBXDataTypes.X1),
+            ("reserved1", UBXDataTypes.U1),
+            ("usedMask", UBXDataTypes.X4),
+            ("VP", "25" + UBXDataTypes.CH),
+            ("jamInd", UBXDataTypes.U1),
+            ("reserved3", UBXDataTypes.U2),
+            ("pinIrq", UBXDataTypes.X4),
+            ("pullH", UBXDataTypes.X4),
+            ("pullL", UBXDataTypes.X4),
+        ),
+    ),
+    # See Section 35.4 of mannual
+    UBXMessageTypes.NAV_DOP: UBXPayloadSchema(
+        "NAV_DOP",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("gDOP", UBXDataTypes.U2),
+            ("pDOP", UBXDataTypes.U2),
+            ("tDOP", UBXDataTypes.U2),
+            ("vDOP", UBXDataTypes.U2),
+            ("hDOP", UBXDataTypes.U2),
+            ("nDOP", UBXDataTypes.U2),
+            ("eDOP", UBXDataTypes.U2),
+        ),
+    ),
+    # See Section 35.6 of mannual
+    UBXMessageTypes.NAV_POSLLH: UBXPayloadSchema(
+        "NAV_POSLLH",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("lon", UBXDataTypes.I4),
+            ("lat", UBXDataTypes.I4),
+            ("height", UBXDataTypes.I4),
+            ("hMSL", UBXDataTypes.I4),
+            ("hAcc", UBXDataTypes.U4),
+            ("vAcc", UBXDataTypes.U4),
+        ),
+    ),
+    # See Section 35.8 of mannual
+    UBXMessageTypes.NAV_SOL: UBXPayloadSchema(
+        "NAV_SOL",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("fTOW", UBXDataTypes.I4),
+            ("week", UBXDataTypes.I2),
+            ("gpsFix", UBXDataTypes.U1),
+            ("flags", UBXDataTypes.X1),
+            ("ecefX", UBXDataTypes.I4),
+            ("ecefY", UBXDataTypes.I4),
+            ("ecefZ", UBXDataTypes.I4),
+            ("pAcc", UBXDataTypes.U4),
+            ("ecefVX", UBXDataTypes.I4),
+            ("ecefVY", UBXDataTypes.I4),
+            ("ecefVZ", UBXDataTypes.I4),
+            ("sAcc", UBXDataTypes.U4),
+            ("pDOP", UBXDataTypes.U2),
+            ("reserved1", UBXDataTypes.U1),
+            ("numSV", UBXDataTypes.U1),
+            ("reserved2", UBXDataTypes.U4),
+        ),
+    ),
+    # See Section 35.9 of mannual
+    UBXMessageTypes.NAV_STATUS: UBXPayloadSchema(
+        "NAV_STATUS",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("gpsFix", UBXDataTypes.U1),
+            ("flags", UBXDataTypes.X1),
+            ("fixStat", UBXDataTypes.X1),
+            ("flags2", UBXDataTypes.X1),
+            ("ttff", UBXDataTypes.U4),
+            ("msss", UBXDataTypes.U4),
+        ),
+    ),
+    # See Section 35.10 of mannual
+    UBXMessageTypes.NAV_SVINFO: UBXPayloadSchema(
+        "NAV_SVINFO",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("numCh", UBXDataTypes.U1),
+            ("globalFlags", UBXDataTypes.X1),
+            ("reserved2", UBXDataTypes.U2),
+        ),
+        block_fields=(
+            ("chn", UBXDataTypes.U1),
+            ("svid", UBXDataTypes.U1),
+            ("flags", UBXDataTypes.X1),
+            ("quality", UBXDataTypes.X1),
+            ("cno", UBXDataTypes.U1),
+            ("elev", UBXDataTypes.I1),
+            ("azim", UBXDataTypes.I2),
+            ("prRes", UBXDataTypes.I4),
+        ),
+    ),
+    # See Section 35.12 of mannual
+    UBXMessageTypes.NAV_TIMEUTC: UBXPayloadSchema(
+        "NAV_TIMEUTC",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("tAcc", UBXDataTypes.U4),
+            ("nano", UBXDataTypes.I4),
+            ("year", UBXDataTypes.U2),
+            ("month", UBXDataTypes.U1),
+            ("day", UBXDataTypes.U1),
+            ("hour", UBXDataTypes.U1),
+            ("min", UBXDataTypes.U1),
+            ("sec", UBXDataTypes.U1),
+            ("valid", UBXDataTypes.X1),
+        ),
+    ),
+    # See Section 35.15 of mannual
+    UBXMessageTypes.NAV_VELNED: UBXPayloadSchema(
+        "NAV_VELNED",
+        (
+            ("iTOW", UBXDataTypes.U4),
+            ("velN", UBXDataTypes.I4),
+            ("velE", UBXDataTypes.I4),
+            ("velD", UBXDataTypes.I4),
+            ("speed", UBXDataTypes.U4),
+            ("gSpeed", UBXDataTypes.U4),
+            ("heading", UBXDataTypes.I4),
+            ("sAcc", UBXDataTypes.U4),
+            ("cAcc", UBXDataTypes.U4),
+        ),
+    ),
+}
+"""Payload schemas of messages that can be decoded, add a schema here to support a new message"""
+
+
+def decode_payload(
+    message_type: bytes, payload, offset: int = 0, payload_length: int | None = None
+) -> tuple:
+    """Decodes the payload of a message with the schema registered in 'PAYLOAD_SCHEMAS'
+
+    Args:
+        message_type (bytes): Message class and message id
+        payload (bytes | bytearray | memoryview): Buffer containing the payload
+        offset (int, optional): Index of the first payload byte in 'payload'. Defaults to 0.
+        payload_length (int | None, optional): Number of payload bytes. Defaults to the rest of 'payload'.
+
+    Raises:
+        UBXError: If no schema is registered for 'message_type' or payload length doesn't match the schema
+
+    Returns:
+        tuple: Named record of the payload fields
+    """
+    schema = PAYLOAD_SCHEMAS.get(bytes(message_type))
+    if schema is None:
+        raise UBXError(f"No payload schema for message: {utils.bytes_to_hex_str(bytes(message_type))}")
+    return schema.decode(payload, offset, payload_length)
+
+
 if __name__ == "__main__":
     print("ubx.py: Running tests...")
     test_message = UBXMessage(
@@ -338,3 +947,89 @@ if __name__ == "__main__":
     output_str = utils.bytes_to_hex_str(test_message.message_bytes)
     print(f"Message Bytes: {output_str}")
     assert output_str == "0xb5 0x62 0x06 0x04 0x04 0x00 0x01 0x00 0x02 0x00 0x11 0x6c"
+
+    print("Testing payload schemas...")
+    for schema in PAYLOAD_SCHEMAS.values():
+        assert schema.size == struct.calcsize(schema.fmt_str)
+    assert PAYLOAD_SCHEMAS[UBXMessageTypes.NAV_SOL].size == 52
+    assert PAYLOAD_SCHEMAS[UBXMessageTypes.MON_HW].size == 68
+    assert PAYLOAD_SCHEMAS[UBXMessageTypes.CFG_PRT].size == 20
+
+    test_payload = struct.pack("<LBBBBLL", 1, 3, 0x0D, 0, 0, 1234, 5000)
+    test_frame = UBXMessage(
+        UBXMessageTypes.NAV_STATUS, len(test_payload) * UBXDataTypes.U1, test_payload
+    ).message_bytes
+    nav_status = decode_payload(UBXMessageTypes.NAV_STATUS, memoryview(test_frame), 6, len(test_frame) - 8)
+    print(f"NAV-STATUS: {nav_status}")
+    assert nav_status == (1, 3, 0x0D, 0, 0, 1234, 5000)
+    assert nav_status.gpsFix == 3 and nav_status.ttff == 1234
+
+    test_payload = bytes(8) + b"\x00\x05\x0D\x07\x2A\x2D\x10\x00\xFF\xFF\xFF\xFF"
+    nav_svinfo = decode_payload(UBXMessageTypes.NAV_SVINFO, test_payload)
+    assert len(nav_svinfo.blocks) == 1
+    assert nav_svinfo.blocks[0].svid == 5 and nav_svinfo.blocks[0].cno == 42
+    assert nav_svinfo.blocks[0].azim == 16 and nav_svinfo.blocks[0].prRes == -1
+
+    try:
+        decode_payload(UBXMessageTypes.NAV_STATUS, test_payload)
+        assert False
+    except UBXError:
+        pass
+
+    print("Testing streaming parser...")
+    import io
+
+    ack_message_bytes = b"\xB5\x62\x05\x01\x02\x00\x06\x01\x0F\x38"
+    corrupted_message_bytes = test_message.message_bytes[:-1] + b"\x00"
+    test_stream = io.BytesIO(
+        b"\x00\xB5\x24"
+        + test_message.message_bytes
+        + corrupted_message_bytes
+        + ack_message_bytes
+    )
+    parser = UBXParser(chunk_size=4)
+    assert parser.read(test_stream)
+    assert parser.message_bytes == test_message.message_bytes
+    assert parser.is_message_type(UBXMessageTypes.CFG_RST)
+    assert bytes(parser.payload) == test_message.payload_bytes
+    assert parser.read(test_stream)
+    assert parser.message_class_id_bytes == UBXMessageTypes.ACK_ACK
+    assert bytes(parser.payload) == UBXMessageTypes.CFG_MSG
+    assert not parser.read(test_stream)
+    print(f"Skipped bytes: {parser.skipped_bytes}, Checksum errors: {parser.checksum_errors}")
+    assert parser.skipped_bytes == 3
+    assert parser.checksum_errors == 1
+
+    print("Testing checksum and frame encoder...")
+    test_bytes = bytes(range(256)) * 3
+    assert checksum_update(0, test_bytes, 0, len(test_bytes)) == _checksum_update_py(0, test_bytes, 0, len(test_bytes))
+    # Incremental checksum matches the checksum over the whole range
+    checksum = checksum_update(0, test_bytes, 0, 100)
+    assert checksum_update(checksum, test_bytes, 100, len(test_bytes)) == checksum_update(0, test_bytes, 0, len(test_bytes))
+
+    test_frame = encode_frame(UBXMessageTypes.CFG_MSG, b"\xF0\x0A\x00")
+    assert utils.bytes_to_hex_str(bytes(test_frame)) == "0xb5 0x62 0x06 0x01 0x03 0x00 0xf0 0x0a 0x00 0x04 0x23"
+    assert verify_frame(test_frame)
+    assert not verify_frame(corrupted_message_bytes)
+
+    # Frames split across buffers
+    parser = UBXParser()
+    test_stream_bytes = b"\x00" + ack_message_bytes + test_message.message_bytes + ack_message_bytes
+    number_of_frames = 0
+    for index in range(0, len(test_stream_bytes), 5):
+        for _ in parser.frames(test_stream_bytes[index : index + 5]):
+            number_of_frames += 1
+    assert number_of_frames == 3
+    assert parser.message_bytes == ack_message_bytes
+
+    print("Testing frame cache...")
+    frame_cache = UBXFrameCache(max_size=2)
+    poll_message = frame_cache.get(UBXMessageTypes.NAV_POSLLH)
+    assert poll_message.message_bytes == UBXMessage(UBXMessageTypes.NAV_POSLLH, "").message_bytes
+    assert frame_cache.get(UBXMessageTypes.NAV_POSLLH) is poll_message
+    assert frame_cache.get(UBXMessageTypes.CFG_MSG, b"\xF0\x0A\x00").message_bytes == bytes(test_frame)
+    # NAV-POSLLH is the least recently used message
+    frame_cache.get(UBXMessageTypes.NAV_STATUS)
+    assert frame_cache.get(UBXMessageTypes.NAV_POSLLH) is not poll_message
+    print(f"Hits: {frame_cache.hits}, Misses: {frame_cache.misses}")
+    assert frame_cache.hits == 1 and frame_cache.misses == 4
@@ -0,0 +1,18 @@
+# Native code variants of hot loops in ubx.py
+# Only importable on MicroPython ports with the viper code emitter, ubx.py falls back to pure Python otherwise
+
+import micropython
+
+
+@micropython.viper
+def checksum_update(checksum: int, buffer, start: int, end: int) -> int:
+    """Updates the 8-Bit Fletcher checksum(CK_A | CK_B << 8) with buffer[start:end], see Section 25.4 of mannual"""
+    data = ptr8(buffer)
+    ck_a = checksum & 0xFF
+    ck_b = (checksum >> 8) & 0xFF
+    index = start
+    while index < end:
+        ck_a = (ck_a + data[index]) & 0xFF
+        ck_b = (ck_b + ck_a) & 0xFF
+        index += 1
+    return ck_a | (ck_b << 8)
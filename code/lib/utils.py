@@ -1,5 +1,7 @@
 import struct
 
+from collections import OrderedDict
+
 VALID_CHARS = {
     "b",
     "B",
@@ -50,20 +52,20 @@ def expand_fmt_str(source_fmt_str: str) -> str:
     if source_fmt_str[-1].isdigit():
         raise ValueError(f"Invalid format string!")
 
-    expanded_str = ""
+    expanded_strs = []
     num_str = ""
 
     for current_index, current_char in enumerate(source_fmt_str):
 
         if current_index == 0 and current_char in BYTE_ORDER_CHARS:
-            expanded_str += current_char
+            expanded_strs.append(current_char)
 
         elif current_char.isdigit():
             num_str += current_char
 
         elif current_char in VALID_CHARS:
             str_multiplier = 1 if num_str == "" else int(num_str)
-            expanded_str += str_multiplier * current_char
+            expanded_strs.append(str_multiplier * current_char)
             num_str = ""
 
         else:
@@ -71,7 +73,115 @@ def expand_fmt_str(source_fmt_str: str) -> str:
                 f"Invalid format string! Invalid/Unkown char at index {current_index}"
             )
 
-    return expanded_str
+    return "".join(expanded_strs)
+
+
+class CompiledFormat:
+    """
+    Format string compiled into field offsets and sizes, use 'compile_fmt' to get a cached instance
+
+    Field sizes are standard sizes(as on the Pico), format strings without byte order character are little endian.
+    Fields are numbered as in 'struct.unpack', a counted string(ex: "25s") is a single field.
+    """
+
+    def __init__(self, source_fmt_str: str) -> None:
+        self.source_fmt_str = source_fmt_str
+
+        if source_fmt_str != "" and source_fmt_str[0] in BYTE_ORDER_CHARS:
+            self.byte_order = source_fmt_str[0]
+            fields_fmt_str = source_fmt_str[1:]
+        else:
+            self.byte_order = "<"
+            fields_fmt_str = source_fmt_str
+
+        self.fmt_str = self.byte_order + fields_fmt_str
+        self.size = struct.calcsize(self.fmt_str)
+
+        # Format string of each field, ex: "<B25sH" -> ("B", "25s", "H")
+        field_fmt_strs = []
+        count_str = ""
+        for current_index, current_char in enumerate(fields_fmt_str):
+            if current_char.isdigit():
+                count_str += current_char
+            elif current_char in VALID_CHARS:
+                count = 1 if count_str == "" else int(count_str)
+                if current_char == "s":
+                    field_fmt_strs.append(f"{count}s")
+                else:
+                    field_fmt_strs.extend(count * [current_char])
+                count_str = ""
+            else:
+                raise ValueError(
+                    f"Invalid format string! Invalid/Unkown char at index {current_index}"
+                )
+
+        offsets = []
+        sizes = []
+        offset = 0
+        for field_fmt_str in field_fmt_strs:
+            field_size = struct.calcsize(self.byte_order + field_fmt_str)
+            offsets.append(offset)
+            sizes.append(field_size)
+            offset += field_size
+        assert offset == self.size
+
+        self.field_fmt_strs = tuple(field_fmt_strs)
+        self.offsets = tuple(offsets)
+        self.sizes = tuple(sizes)
+
+    def split(self, source_bytes, offset: int = 0) -> tuple[memoryview, ...]:
+        """Splits 'source_bytes', starting at 'offset', into one memoryview per field without copying"""
+        source_mv = memoryview(source_bytes)
+        return tuple(
+            [
+                source_mv[offset + field_offset : offset + field_offset + field_size]
+                for field_offset, field_size in zip(self.offsets, self.sizes)
+            ]
+        )
+
+    def unpack_from(self, source_bytes, offset: int = 0) -> tuple:
+        return struct.unpack_from(self.fmt_str, source_bytes, offset)
+
+    def unpack_field_from(self, source_bytes, field_index: int, offset: int = 0):
+        """Unpacks a single field without unpacking the whole format"""
+        (value,) = struct.unpack_from(
+            self.byte_order + self.field_fmt_strs[field_index],
+            source_bytes,
+            offset + self.offsets[field_index],
+        )
+        return value
+
+    def pack(self, *values) -> bytes:
+        return struct.pack(self.fmt_str, *values)
+
+    def pack_into(self, buffer: bytearray, offset: int, *values) -> None:
+        struct.pack_into(self.fmt_str, buffer, offset, *values)
+
+
+MAX_COMPILED_FMTS = 64
+"""Number of compiled formats kept by 'compile_fmt', oldest format is evicted first"""
+
+_compiled_fmts: OrderedDict = OrderedDict()
+
+
+def compile_fmt(source_fmt_str: str) -> CompiledFormat:
+    """Returns the compiled format of a format string, each format string is compiled only once
+
+    Ex: compile_fmt(">2bh").offsets -> (0, 1, 2)
+
+    Args:
+        source_fmt_str (str): Compressed or expanded format string
+
+    Returns:
+        CompiledFormat: Cached compiled format
+    """
+    compiled_fmt = _compiled_fmts.get(source_fmt_str)
+    if compiled_fmt is None:
+        compiled_fmt = CompiledFormat(source_fmt_str)
+        if len(_compiled_fmts) >= MAX_COMPILED_FMTS:
+            del _compiled_fmts[next(iter(_compiled_fmts))]
+        _compiled_fmts[source_fmt_str] = compiled_fmt
+    return compiled_fmt
 
 
 def bytes_to_hex_str(source_bytes: bytes) -> str:
@@ -122,26 +232,7 @@ def split_bytes_fmt(source_fmt_str: str, source_bytes: bytes) -> tuple[bytes, ..
             f"Expected object of class 'bytes', recieved argument of type {type(source_bytes)}"
         )
 
-    expanded_fmt_str = expand_fmt_str(source_fmt_str)
-
-    bytes_index = 0
-    bytes_array = []
-
-    for current_char in expanded_fmt_str:
-        if current_char == expanded_fmt_str[0] and current_char in BYTE_ORDER_CHARS:
-            continue
-
-        elif current_char in VALID_CHARS:
-            bytes_size = struct.calcsize(current_char)
-            bytes_array.append(source_bytes[bytes_index : bytes_index + bytes_size])
-            bytes_index += bytes_size
-
-        else:
-            raise ValueError(
-                f"Invalid format string! Invalid/Unkown char at index {bytes_index}"
-            )
-
-    return tuple(bytes_array)
+    return tuple([bytes(field) for field in compile_fmt(source_fmt_str).split(source_bytes)])
 
 
 def reverse_byte_order(source_bytes: bytes) -> bytes:
@@ -160,15 +251,12 @@ def reverse_byte_order(source_bytes: bytes) -> bytes:
             f"Expected object of class 'bytes', recieved argument of type {type(source_bytes)}"
         )
 
-    reversed_bytes = b""
-
-    current_index = len(source_bytes)
-    while current_index >= 0:
-        reversed_bytes += source_bytes[current_index : current_index + 1]
-        current_index -= 1
+    last_index = len(source_bytes) - 1
+    reversed_bytes = bytearray(last_index + 1)
+    for current_index, source_byte in enumerate(source_bytes):
+        reversed_bytes[last_index - current_index] = source_byte
 
-    assert len(source_bytes) == len(reversed_bytes)
-    return reversed_bytes
+    return bytes(reversed_bytes)
 
 
 if __name__ == "__main__":
@@ -190,3 +278,24 @@ if __name__ == "__main__":
     print(f"Orignial bytes: {bytes_to_hex_str(original_bytes)}")
     print(f"Reversed bytes: {bytes_to_hex_str(reversed_bytes)}")
     assert reversed_bytes == b"\xAA\x55"
+    assert reverse_byte_order(b"") == b""
+
+    compiled_fmt = compile_fmt(compressed_fmt_str)
+    print(f"Field offsets: {compiled_fmt.offsets}")
+    assert compile_fmt(compressed_fmt_str) is compiled_fmt
+    assert compiled_fmt.size == 22
+    assert compiled_fmt.offsets[:4] == (0, 1, 2, 4)
+    assert split_bytes_fmt(">2bh", b"\x23\x32\x55\xAA") == (b"\x23", b"\x32", b"\x55\xAA")
+    assert compile_fmt("<HL").unpack_from(b"\x00\x01\x00\x02\x00\x00\x00", 1) == (1, 2)
+    assert compile_fmt("<HL").unpack_field_from(b"\x01\x00\x02\x00\x00\x00", 1) == 2
+
+    # Counted string is a single field, as in struct
+    test_bytes = bytes(range(28))
+    compiled_fmt = compile_fmt("<B25sH")
+    assert compiled_fmt.sizes == (1, 25, 2)
+    assert compiled_fmt.unpack_field_from(test_bytes, 2) == struct.unpack("<B25sH", test_bytes)[2]
+    assert bytes(compiled_fmt.split(test_bytes)[1]) == test_bytes[1:26]
+
+    for payload_length in range(2 * MAX_COMPILED_FMTS):
+        compile_fmt(f"<{payload_length}s")
+    assert len(_compiled_fmts) == MAX_COMPILED_FMTS
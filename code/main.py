@@ -7,6 +7,7 @@ import NEO6M
 
 import at
 import SIM800L
+import httpclient
 
 import os
 import sys
@@ -14,22 +15,46 @@ import json
 import time
 import machine
 
+GPS_AIDING_FILE_PATH = "./GPS_AIDING.ubx"
+GPS_AIDING_SAVE_INTERVAL_MS = 30 * 60 * 1000
+# UBX AID stream, e.g AssistNow Online: "http://online-live1.services.u-blox.com/GetOnlineData.ashx?token=<TOKEN>;gnss=gps;datatype=eph,alm,aux;format=aid"
+# Disabled if empty
+GPS_ASSISTANCE_URL = ""
+# Post reports over a kept alive TCP connection(see ./lib/httpclient.py) instead of the HTTP service of the SIM module,
+# saves the TCP and TLS handshakes of every report
+POST_KEEP_ALIVE = True
+
+
 def setup_gps_module(gps_module: NEO6M.NEO6M, logger: logger.Logger):
     logger.info("Disabling all NMEA messages for Serial1...", end="")
-    for msg_type in NEO6M.NEO6M.NMEA_MSG_CLSID:
-        msg = ubx.UBXMessage(
-            ubx.UBXMessageTypes.CFG_MSG,
-            2 * ubx.UBXDataTypes.U1 + 1 * ubx.UBXDataTypes.U1,
-            msg_type,
-            b"\x00",
-        )
-
-        response_status, _ = gps_module.send_UBX_message(msg)
-        if not response_status:
-            logger.warning(f"[WARNING] Unable to disable NEMA '{msg_type}' message")
+    # Skipped if the module is still running the config applied by the last boot
+    gps_module.apply_config(
+        [(msg_type, 0) for msg_type in NEO6M.NEO6M.NMEA_MSG_CLSID],
+        save_to_module=True,
+    )
     logger.info("Done.")
 
 
+def assist_gps_module(gps_module: NEO6M.NEO6M, sim_module: SIM800L.SIM800L, logger: logger.Logger):
+    if GPS_ASSISTANCE_URL == "" or gps_module.has_fix():
+        return
+
+    logger.info("Downloading GPS assistance data...", end="")
+    number_of_messages = 0
+    try:
+        # Each chunk is written to the GPS module while the SIM module sends the next one
+        chunks = sim_module.HTTP_GET_chunks(GPS_ASSISTANCE_URL)
+        try:
+            for chunk in chunks:
+                number_of_messages += gps_module.inject_aiding_data(chunk)
+        finally:
+            # Reads the pending chunk if injecting failed
+            chunks.close()
+    except (at.HTTPError, at.ATCommandError, SIM800L.SIM800LError) as error:
+        logger.warning(f"GPS assistance data download failed! {error}")
+    logger.info(f"Done. Aiding messages: {number_of_messages}")
+
+
 def setup_sim_module(sim_module: SIM800L.SIM800L, logger: logger.Logger):
 
     logger.info("Resetting SIM Module...", end="")
@@ -54,8 +79,10 @@ if __name__ == "__main__":
             logger = logger.Logger(logger.Logger.LOG_ALL)
 
         config =  device_config.DeviceConfig("./config.json")
-        gps_module = NEO6M.NEO6M(config.GPS_module_config, logger)
+        gps_module = NEO6M.NEO6M(config.GPS_module_config, logger, state_file_path="./GPS_STATE.json")
         logger.info(f"GPS Module Config: {gps_module.module_UART_config}")
+        # Hot start with the aiding data saved before the last power loss
+        logger.info(f"Restored GPS aiding messages: {gps_module.restore_aiding_data(GPS_AIDING_FILE_PATH)}")
         sim_module = SIM800L.SIM800L(config.SIM_module_config, logger)
         logger.info(f"SIM Module Config: {sim_module.module_UART_config}")
 
@@ -75,21 +102,22 @@ if __name__ == "__main__":
         logger.info(f"SIM Operator: {sim_module.get_sim_operator()}")
         logger.info(f"RSSI, BER: {sim_module.get_signal_quality()}")
 
-        logger.info("Waiting for GPS fix....", end="")
-        while True:
-            _, gps_fix, _, _, _, ttff, msss = gps_module.poll_nav_status()
-            if gps_fix == 2 or gps_fix == 3 or gps_fix == 4:
-                logger.info(f"GPS fix type: {NEO6M.NEO6M.GPS_FIX_TYPES[gps_fix]}")
-                logger.info(f"Time to first fix: {ttff} ms")
-                logger.info(f"Time since startup/reset: {msss} ms")
-                break
-            time.sleep_ms(100)
-        logger.info("Done.")
-        
         logger.info("Opening HTTP session...", end="")
         sim_module.HTTP_session_open(enable_redirects=False)
         logger.info("Done.")
 
+        # Cold starts can take minutes without assistance data
+        assist_gps_module(gps_module, sim_module, logger)
+
+        logger.info("Waiting for GPS fix....", end="")
+        _, gps_fix, _, _, _, ttff, msss = gps_module.wait_for_fix()
+        logger.info(f"GPS fix type: {NEO6M.NEO6M.GPS_FIX_TYPES[gps_fix]}")
+        logger.info(f"Time since startup/reset: {msss} ms")
+        logger.info("Done.")
+
+        # Let the GPS module push position updates instead of polling it for every report
+        gps_module.start_streaming([ubx.UBXMessageTypes.NAV_SOL, ubx.UBXMessageTypes.NAV_POSLLH])
+
         # Main Loop
         
         # Example: HTTP POST request json data example
@@ -97,39 +125,59 @@ if __name__ == "__main__":
         NPOST = 0
         TEST_URL_POST = "https://httpbin.org/post"
         POST_total_time_taken_ms = 0
+        last_aiding_save_ms = time.ticks_ms()
+        http_client = httpclient.HTTPClient(sim_module) if POST_KEEP_ALIVE else None
         try:
             while True:
-                # Poll GPS module
-                _, long, lat, height, hMSL, hAcc, vAcc = gps_module.poll_nav_posllh()
-                lat = lat*(10**-7)
-                long = long*(10**-7)
-                height = height/1000
-                hMSL = hMSL/1000
-                hAcc = hAcc/1000
-                vAcc = vAcc/1000
+                # Keep the saved aiding data fresh, ephemeris is valid for a few hours only
+                if time.ticks_diff(time.ticks_ms(), last_aiding_save_ms) >= GPS_AIDING_SAVE_INTERVAL_MS:
+                    logger.info(f"Saved GPS aiding messages: {gps_module.save_aiding_data(GPS_AIDING_FILE_PATH)}")
+                    last_aiding_save_ms = time.ticks_ms()
+
+                # Newest fix recieved from GPS module
+                fix = gps_module.get_latest_fix()
+                if fix is None:
+                    time.sleep_ms(100)
+                    continue
+                lat = fix.lat*(10**-7)
+                long = fix.lon*(10**-7)
+                height = fix.height/1000
+                hMSL = fix.hMSL/1000
+                hAcc = fix.hAcc/1000
+                vAcc = fix.vAcc/1000
+                speed = fix.gSpeed/100
                 
                 logger.info(f"Latitude, Longitude: {lat}, {long}")
                 print(f"Height above Ellipsoid: {height} m")
                 print(f"Height above mean sea level: {hMSL} m")
                 print(f"Accuracy: {hAcc} m, {vAcc} m")
+                print(f"Ground speed: {speed} m/s")
+                print(f"GPS time: week {fix.week}, {fix.iTOW} ms")
 
-                POST_DATA = {"lat": lat, "long": long, "height": height, "hMSL": hMSL, "hAcc": hAcc, "vAcc": vAcc}
+                POST_DATA = {"lat": lat, "long": long, "height": height, "hMSL": hMSL, "hAcc": hAcc, "vAcc": vAcc, "speed": speed, "week": fix.week, "iTOW": fix.iTOW}
                 POST_CONTENT_TYPE = "application/json"
                 POST_JSON = json.dumps(POST_DATA)
                 
                 start_time = time.ticks_ms()
                 logger.info(f"[POST] {TEST_URL_POST} ", end="")
-                response_code, response = sim_module.HTTP_POST(TEST_URL_POST, POST_JSON, header_content_type=POST_CONTENT_TYPE)
+                if http_client is not None:
+                    response_code, _ = http_client.POST(TEST_URL_POST, POST_JSON, header_content_type=POST_CONTENT_TYPE)
+                else:
+                    # Only the response code is needed, response isn't read
+                    response_code, _ = sim_module.HTTP_POST(TEST_URL_POST, POST_JSON, header_content_type=POST_CONTENT_TYPE, read_response=False)
                 time_taken_ms = time.ticks_diff(time.ticks_ms(), start_time)
                 POST_total_time_taken_ms += time_taken_ms
                 logger.info(f"|{response_code}, {at.HTTP_CODES.get(response_code, '')}, {time_taken_ms} ms")
-                print(f"Response: \n{response}")
                 NPOST += 1
                 pass
 
         except KeyboardInterrupt:
             print(f"Average time taken to make {NPOST} HTTP POST requests: {POST_total_time_taken_ms/NPOST} ms")
             print()
+            gps_module.stop_streaming()
+            gps_module.save_aiding_data(GPS_AIDING_FILE_PATH)
+            if http_client is not None:
+                http_client.close()
             print("Closing HTTP session...", end="")
             sim_module.HTTP_session_close()
             print("Done.")
@@ -137,6 +185,11 @@ if __name__ == "__main__":
 
     except Exception as error:
         sys.print_exception(error)
+        # Save aiding data before the reset, if the GPS module is still responding
+        try:
+            gps_module.save_aiding_data(GPS_AIDING_FILE_PATH)
+        except Exception:
+            pass
         time.sleep(3)
         with open("./CRASH.txt", "w") as f:
             f.write(f"[CRASH] {error}")
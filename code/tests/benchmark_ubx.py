@@ -0,0 +1,86 @@
+# Benchmark UBX checksum, frame encoding and frame parsing
+#
+# CPython:                PYTHONPATH=code/lib python3 code/tests/benchmark_ubx.py
+# MicroPython unix port:  MICROPYPATH=code/lib micropython code/tests/benchmark_ubx.py
+# Pico:                   copy to the board and run it, ubx.py and utils.py have to be in /lib
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter_ns
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(end, start):
+        return end - start
+
+import ubx
+
+NUMBER_OF_ITERATIONS = 1_000
+
+
+def reference_checksum(ubx_msg: bytes) -> bytes:
+    # Per-byte checksum loop used by UBXMessage.calc_checksum before the optimization
+    CK_A = 0x00
+    CK_B = 0x00
+
+    for byte in ubx_msg:
+        CK_A = CK_A + byte
+        CK_A = CK_A & 0xFF
+        CK_B = CK_B + CK_A
+        CK_B = CK_B & 0xFF
+
+    CK = (CK_A << 8) + CK_B
+    return CK.to_bytes(2, "big")
+
+
+def benchmark(name: str, function, number_of_frames: int = 1) -> None:
+    start_time = ticks_us()
+    for _ in range(NUMBER_OF_ITERATIONS):
+        function()
+    time_taken_us = ticks_diff(ticks_us(), start_time)
+    print(f"{name}: {time_taken_us / (NUMBER_OF_ITERATIONS * number_of_frames):.2f} us/frame")
+
+
+# NAV-SOL(52 bytes) and AID-EPH(104 bytes) sized payloads
+nav_sol_frame = bytes(ubx.encode_frame(ubx.UBXMessageTypes.NAV_SOL, bytes(range(52))))
+aid_eph_frame = bytes(ubx.encode_frame(ubx.UBXMessageTypes.AID_EPH, bytes(range(104))))
+frame_buffer = bytearray(len(aid_eph_frame))
+
+native = ubx.checksum_update is not ubx._checksum_update_py
+print(f"Checksum implementation: {'viper' if native else 'pure Python'}")
+
+for frame_name, frame in (("NAV-SOL", nav_sol_frame), ("AID-EPH", aid_eph_frame)):
+    frame_length = len(frame)
+    print(f"{frame_name}, {frame_length} bytes:")
+    benchmark("  Reference checksum", lambda: reference_checksum(frame[2:-2]))
+    benchmark("  Pure Python checksum", lambda: ubx._checksum_update_py(0, frame, 2, frame_length - 2))
+    if native:
+        benchmark("  Viper checksum", lambda: ubx.checksum_update(0, frame, 2, frame_length - 2))
+    benchmark("  verify_frame", lambda: ubx.verify_frame(frame))
+    benchmark("  split_message_bytes", lambda: ubx.UBXMessage.split_message_bytes(frame))
+    payload = frame[6:-2]
+    benchmark("  encode_frame(in place)", lambda: ubx.encode_frame(frame[2:4], payload, frame_buffer))
+
+benchmark(
+    "UBXMessage(CFG-MSG)",
+    lambda: ubx.UBXMessage(
+        ubx.UBXMessageTypes.CFG_MSG,
+        3 * ubx.UBXDataTypes.U1,
+        b"\xF0\x0A",
+        b"\x00",
+    ),
+)
+
+# Parse a stream of 16 frames
+stream = (nav_sol_frame + aid_eph_frame) * 8
+parser = ubx.UBXParser()
+
+
+def parse_stream():
+    for _ in parser.frames(stream):
+        pass
+
+
+benchmark("UBXParser.frames(NAV-SOL + AID-EPH)", parse_stream, 16)